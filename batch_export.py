@@ -0,0 +1,240 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import urlparse
+
+from export_engine import ExportEngine
+from exporters import OUTPUT_FORMATS
+
+
+def read_job_file(path):
+    """Read repository URLs from a job file, one per line; '#' starts a comment"""
+    urls = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line and line not in urls:
+                urls.append(line)
+    return urls
+
+
+def url_label(url):
+    """Return a short readable name for a repository URL"""
+    parsed = urlparse(url.rstrip('/'))
+    parts = [part for part in parsed.path.split('/') if part]
+    return '_'.join(parts[-2:]) or parsed.hostname or 'repository'
+
+
+def output_paths_for(urls, directory, output_format):
+    """Assign each URL a unique output file path inside directory"""
+    extension = next(ext for ext, known_format in OUTPUT_FORMATS.items() if known_format == output_format)
+    paths = {}
+    used = set()
+    for url in urls:
+        name = re.sub(r'[^\w.-]+', '_', url_label(url)).strip('_') or 'repository'
+        candidate = name
+        number = 2
+        while candidate.lower() in used:
+            candidate = f"{name}_{number}"
+            number += 1
+        used.add(candidate.lower())
+        paths[url] = os.path.join(directory, candidate + extension)
+    return paths
+
+
+class BatchExport:
+    """Export several repositories with bounded concurrency
+
+    At most `concurrency` exports run at once, and at most `per_host` of them
+    talk to the same server. Each repository is written to its own file of
+    `output_format` in `output` (a directory), or, with combined=True, to its
+    own sheet of the single workbook `output`. A summary of timings and failures is
+    written next to the output as JSON. cancel() stops the running exports
+    and skips those that have not started.
+    """
+
+    def __init__(self, urls, username, password, output, filter_patterns=None, combined=False,
+                 concurrency=4, per_host=2, output_format='xlsx', engine_options=None, emit_logs=None,
+                 translations=None):
+        self.urls = list(urls)
+        self.username = username
+        self.password = password
+        self.output = output
+        self.filter_patterns = filter_patterns or []
+        self.combined = combined
+        self.output_format = 'xlsx' if combined else output_format
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.engine_options = engine_options or {}
+        self.emit_logs = emit_logs or (lambda text: None)
+        self.translations = translations or {}
+        self.log_lock = threading.Lock()
+        self.results = []
+        self.sheets = {}  # url -> sheets written to the combined workbook
+        self.cancelled = threading.Event()
+        self.engines = set()  # Engines of the running exports
+        self.engines_lock = threading.RLock()
+
+    def tr(self, key, **kwargs):
+        text = self.translations.get(key, key)
+        return text.format(**kwargs) if kwargs else text
+
+    def log(self, message):
+        self.emit_logs(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+
+    def output_paths(self):
+        """Assign each URL a unique output file path inside the output directory"""
+        return output_paths_for(self.urls, self.output, self.output_format)
+
+    def summary_path(self):
+        if self.combined:
+            return os.path.splitext(self.output)[0] + '_summary.json'
+        return os.path.join(self.output, 'batch_summary.json')
+
+    def export_one(self, url, path, shared_workbook):
+        prefix = f"[{url_label(url)}] "
+
+        def emit_logs(text):
+            with self.log_lock:
+                self.emit_logs('\n'.join(prefix + line for line in text.split('\n')))
+
+        if shared_workbook is not None:
+            from excel_writer import ExcelWriter
+            # Sheet titles may not contain []:*?/\
+            title = re.sub(r'[\[\]:*?/\\]+', '_', url_label(url))
+
+            def write_sheet(headers):
+                writer = ExcelWriter(self.output, headers, sheet_title=title, shared_workbook=shared_workbook)
+                self.sheets[url] = writer.sheets
+                return writer
+            writer_factory = write_sheet
+        else:
+            writer_factory = None
+
+        options = dict(self.engine_options)
+        if shared_workbook is not None:
+            # Every repository shares one output path, so keep the metrics in the summary only
+            options['write_metrics'] = False
+            options['checkpoint'] = False
+        engine = ExportEngine(url, self.username, self.password, path, self.filter_patterns,
+                              emit_logs=emit_logs, writer_factory=writer_factory,
+                              output_format=self.output_format, **options)
+        engine.set_translations(self.translations)
+        with self.engines_lock:
+            self.engines.add(engine)
+        if self.cancelled.is_set():
+            engine.cancel()
+        start = time.perf_counter()
+        try:
+            success, message = engine.run()
+        finally:
+            with self.engines_lock:
+                self.engines.discard(engine)
+        return {
+            'url': url,
+            'output': path,
+            'success': success,
+            'message': message,
+            'files': engine.files_exported,
+            'seconds': round(time.perf_counter() - start, 3),
+            'metrics': engine.metrics_report
+        }
+
+    def run(self):
+        """Run all exports and return (success, summary message)"""
+        start = time.perf_counter()
+        started = datetime.now().isoformat(timespec='seconds')
+        shared_workbook = None
+        if self.combined:
+            from excel_writer import SharedWorkbook
+            shared_workbook = SharedWorkbook(self.output)
+            paths = {url: self.output for url in self.urls}
+        else:
+            os.makedirs(self.output, exist_ok=True)
+            paths = self.output_paths()
+
+        self.log(self.tr('log_batch_start', count=len(self.urls), concurrency=self.concurrency,
+                         per_host=self.per_host))
+        pending = deque(self.urls)
+        running = {}
+        hosts = Counter()
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while pending or running:
+                if self.cancelled.is_set():
+                    for url in pending:
+                        results[url] = {'url': url, 'output': paths[url], 'success': False,
+                                        'message': self.tr('export_cancelled'), 'files': 0, 'seconds': 0.0}
+                    pending.clear()
+                    if not running:
+                        break
+                # Start the first waiting jobs whose server is below its connection cap
+                for url in list(pending):
+                    if len(running) >= self.concurrency:
+                        break
+                    host = (urlparse(url).hostname or '').lower()
+                    if hosts[host] >= self.per_host:
+                        continue
+                    pending.remove(url)
+                    hosts[host] += 1
+                    running[pool.submit(self.export_one, url, paths[url], shared_workbook)] = (url, host)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, host = running.pop(future)
+                    hosts[host] -= 1
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'url': url, 'output': paths[url], 'success': False,
+                                  'message': str(e), 'files': 0, 'seconds': 0.0}
+                    results[url] = result
+                    self.log(self.tr('log_batch_job_done', url=url, seconds=f"{result['seconds']:.1f}",
+                                     message=result['message']))
+
+        self.results = [results[url] for url in self.urls]
+        succeeded = sum(1 for result in self.results if result['success'])
+        elapsed = time.perf_counter() - start
+
+        if shared_workbook is not None:
+            summary_sheet = self.write_summary_sheet(shared_workbook)
+            # Sheets were created as exports started; keep them in job order instead
+            shared_workbook.order_sheets(
+                [sheet for url in self.urls for sheet in self.sheets.get(url, [])] + [summary_sheet])
+            shared_workbook.save()
+        summary = {
+            'started': started,
+            'seconds': round(elapsed, 3),
+            'serial_seconds': round(sum(result['seconds'] for result in self.results), 3),
+            'succeeded': succeeded,
+            'failed': len(self.results) - succeeded,
+            'repositories': self.results
+        }
+        with open(self.summary_path(), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        message = self.tr('log_batch_summary', succeeded=succeeded, failed=len(self.results) - succeeded,
+                          seconds=f"{elapsed:.1f}", path=self.summary_path())
+        self.log(message)
+        return succeeded == len(self.results), message
+
+    def cancel(self):
+        """Cancel the running exports and skip the waiting ones; safe to call from any thread"""
+        self.cancelled.set()
+        with self.engines_lock:
+            engines = list(self.engines)
+        for engine in engines:
+            engine.cancel()
+
+    def write_summary_sheet(self, shared_workbook):
+        sheet = shared_workbook.create_sheet("Batch Summary")
+        sheet.append(['Repository', 'Status', 'Files', 'Seconds', 'Message'])
+        for result in self.results:
+            sheet.append([result['url'], 'OK' if result['success'] else 'FAILED',
+                          result['files'], result['seconds'], result['message']])
+        return sheet
@@ -0,0 +1,42 @@
+"""Measure command line cold start and check that the export core does not load Qt
+
+Usage: python benchmarks/bench_cli_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_CHECK = (
+    "import sys, cli, export_engine; "
+    "print(','.join(sorted({m.split('.')[0] for m in sys.modules} & {'PySide6', 'openpyxl'})))"
+)
+
+
+def measure(name, command, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    print(f"{name:<22} median {statistics.median(timings) * 1000:7.1f} ms  "
+          f"min {min(timings) * 1000:7.1f} ms over {runs} runs")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    measure('python (baseline)', [sys.executable, '-c', 'pass'], runs)
+    measure('cli.py --help', [sys.executable, 'cli.py', '--help'], runs)
+    measure('import export_engine', [sys.executable, '-c', 'import export_engine'], runs)
+
+    loaded = subprocess.run([sys.executable, '-c', IMPORT_CHECK], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout.strip()
+    print(f"heavy modules loaded before an export starts: {loaded or 'none'}")
+    return 1 if 'PySide6' in loaded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
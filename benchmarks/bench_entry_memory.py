@@ -0,0 +1,95 @@
+"""Compare memory and shaping time of dict entries with ListingEntry and DirectoryTable
+
+Usage: python benchmarks/bench_entry_memory.py [entry_count]
+
+Memory is the tracemalloc peak while a parsed listing is held in a list, as
+the incremental update and the parallel listing do. Shaping time covers
+turning parsed entries into export rows.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from listing_entry import DirectoryTable, ListingEntry
+
+BASE_URL = 'https://svn.example.com/repo/trunk'
+
+
+def make_fields(count):
+    # Build each string separately, as a parser does for every line
+    for i in range(count):
+        yield (f"design/dir{i % 2000}/sub{i % 7}/file{i}.dwg", str(100000 + i), ''.join(['author', str(i % 40)]),
+               str(i * 37), ''.join(['Jan 05 ', str(10 + i % 12), ':34']))
+
+
+def legacy_entries(count):
+    return [
+        {'revision': revision, 'author': author, 'size': size, 'date': date, 'time': '', 'path': path}
+        for path, revision, author, size, date in make_fields(count)
+    ]
+
+
+def compact_entries(count):
+    return [ListingEntry(path, revision, author, size, date) for path, revision, author, size, date in make_fields(count)]
+
+
+def legacy_rows(entries):
+    rows = []
+    for parsed in entries:
+        file_name = os.path.basename(parsed['path'])
+        dir_path = os.path.dirname(parsed['path'])
+        full_svn_path = f"{BASE_URL}/{dir_path}" if dir_path else BASE_URL
+        protocol, path = full_svn_path.split('://', 1)
+        full_svn_path = f"{protocol}://{path.replace('//', '/')}"
+        entry = {
+            'file_name': file_name,
+            'dir_path': full_svn_path,
+            'revision': parsed['revision'],
+            'author': parsed['author'],
+            'date': f"{parsed['date']} {parsed['time']}"
+        }
+        rows.append([entry['file_name'], entry['dir_path'], entry['revision'], entry['author'], entry['date']])
+    return rows
+
+
+def compact_rows(entries):
+    directories = DirectoryTable(BASE_URL)
+    rows = []
+    for parsed in entries:
+        dir_path, _, file_name = parsed.path.rpartition('/')
+        rows.append([file_name, directories.url_for(dir_path), parsed.revision, parsed.author,
+                     f"{parsed.date} {parsed.time}"])
+    return rows
+
+
+def measure_memory(name, build, count):
+    tracemalloc.start()
+    entries = build(count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<8} held {len(entries)} entries, peak {peak / (1024 * 1024):,.1f} MB "
+          f"({peak / len(entries):,.0f} bytes/entry)")
+    return entries
+
+
+def measure_rows(name, shape, entries):
+    start = time.perf_counter()
+    rows = shape(entries)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<8} shaped {len(rows)} rows in {elapsed:.3f}s ({elapsed / len(rows) * 1e9:,.0f} ns/row)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    entries = measure_memory('dict', legacy_entries, count)
+    measure_rows('dict', legacy_rows, entries)
+    del entries
+    entries = measure_memory('compact', compact_entries, count)
+    measure_rows('compact', compact_rows, entries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compare write speed and output size of the export formats
+
+Usage: python benchmarks/bench_exporters.py [row_count]
+
+Formats whose optional dependency is missing are skipped.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exporters import OUTPUT_FORMATS, create_writer
+
+HEADERS = ['File Name', 'Directory', 'Revision', 'Author', 'Commit Date']
+
+
+def make_rows(count):
+    return [[f"file{i}.dwg", f"https://svn.example.com/repo/trunk/design/dir{i % 300}",
+             str(100000 + i), f"user{i % 40}", "Jan 05 12:34 "] for i in range(count)]
+
+
+def measure(output_format, path, rows):
+    start = time.perf_counter()
+    try:
+        writer = create_writer(path, HEADERS, output_format)
+    except ImportError as e:
+        print(f"{output_format:<8} skipped, {e.name} is not installed")
+        return
+    for row in rows:
+        writer.write(row)
+    writer.save()
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    print(f"{output_format:<8} {len(rows)} rows in {elapsed:.3f}s ({len(rows) / elapsed:,.0f} rows/s), "
+          f"{size / (1024 * 1024):,.1f} MB")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rows = make_rows(count)
+    with tempfile.TemporaryDirectory() as directory:
+        for extension, output_format in OUTPUT_FORMATS.items():
+            measure(output_format, os.path.join(directory, 'listing' + extension), rows)
+
+
+if __name__ == '__main__':
+    main()
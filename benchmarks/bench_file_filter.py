@@ -0,0 +1,42 @@
+"""Compare the per-call regex filter with the precompiled FileFilter
+
+Usage: python benchmarks/bench_file_filter.py [path_count]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_filter import FileFilter
+
+PATTERNS = ['*.dwg', '*.dxf', '*.xlsx', '*.pdf', 'report_*.docx', 'trunk/design/**/*.step']
+EXTENSIONS = ['dwg', 'dxf', 'xlsx', 'pdf', 'docx', 'step', 'txt', 'png', 'cpp', 'h']
+
+
+def legacy_is_file_matched(file_path):
+    for pattern in PATTERNS:
+        regex_pattern = pattern.replace('.', '\\.').replace('*', '.*')
+        if re.search(regex_pattern, file_path, re.IGNORECASE):
+            return True
+    return False
+
+
+def measure(name, matcher, paths):
+    start = time.perf_counter()
+    matched = sum(1 for path in paths if matcher(path))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<8} matched {matched} of {len(paths)} paths in {elapsed:.3f}s "
+          f"({len(paths) / elapsed:,.0f} paths/s)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    paths = [f"trunk/design/dir{i % 300}/file{i}.{EXTENSIONS[i % len(EXTENSIONS)]}" for i in range(count)]
+    measure('legacy', legacy_is_file_matched, paths)
+    measure('compiled', FileFilter(PATTERNS).matches, paths)
+
+
+if __name__ == '__main__':
+    main()
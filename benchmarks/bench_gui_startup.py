@@ -0,0 +1,78 @@
+"""Measure the time until the main window is shown and check what the GUI loads at startup
+
+Usage: python benchmarks/bench_gui_startup.py [runs]
+
+Each run starts a fresh process that imports main.py, creates the window
+and reports once the event loop has shown it. Without a display, Qt's
+offscreen platform is used. On Linux, settings are written to a
+temporary directory, so every run starts from the same state.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only an export needs; none of them should be loaded before one starts
+EXPORT_MODULES = ('export_engine', 'batch_export', 'openpyxl', 'pyarrow', 'sqlite3', 'http.client')
+
+CHILD = """
+import sys, time
+start = time.perf_counter()
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+import main
+imported = time.perf_counter()
+window = main.MainWindow()
+window.show()
+def shown():
+    loaded = [name for name in {modules!r} if name in sys.modules]
+    print(f"{{imported - start:.4f}} {{time.perf_counter() - start:.4f}} {{','.join(loaded)}}", flush=True)
+    if hasattr(window, 'svn_probe'):
+        window.svn_probe.wait()
+    app.quit()
+QTimer.singleShot(0, shown)
+app.exec()
+"""
+
+
+def run_once(environ):
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', CHILD.format(modules=EXPORT_MODULES)], cwd=ROOT, env=environ,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    line = process.stdout.readline()
+    first_window = time.perf_counter() - start
+    process.wait()
+    if not line:
+        raise RuntimeError("the window was not shown")
+    imported, shown, loaded = (line.split() + [''])[:3]
+    return first_window, float(imported), float(shown), loaded
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    environ = dict(os.environ)
+    if not environ.get('DISPLAY') and not environ.get('WAYLAND_DISPLAY') and sys.platform.startswith('linux'):
+        environ['QT_QPA_PLATFORM'] = 'offscreen'
+    with tempfile.TemporaryDirectory() as config:
+        environ['XDG_CONFIG_HOME'] = config
+        results = [run_once(environ) for _ in range(runs)]
+
+    def report(name, values):
+        print(f"{name:<28} median {statistics.median(values) * 1000:7.1f} ms  "
+              f"min {min(values) * 1000:7.1f} ms over {runs} runs")
+
+    report('process start to window', [result[0] for result in results])
+    report('  import main (with Qt)', [result[1] for result in results])
+    report('  in-process to window', [result[2] for result in results])
+    loaded = results[-1][3]
+    print(f"export modules loaded before an export starts: {loaded or 'none'}")
+    return 1 if loaded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Compare the `svn list --verbose` regex parser with the `--xml` parser
+
+Usage: python benchmarks/bench_list_parsers.py [entry_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export_engine import ExportEngine
+
+
+def make_text_lines(count):
+    for i in range(count):
+        yield f"  {1000 + i:>6} author{i % 40:<8} {i * 37:>10} Jan 05 12:34 trunk/dir{i % 500}/file{i}.dwg"
+
+
+def make_xml_lines(count):
+    yield '<?xml version="1.0" encoding="UTF-8"?>'
+    yield '<lists>'
+    yield '<list path="svn://example/repo">'
+    for i in range(count):
+        yield '<entry'
+        yield '   kind="file">'
+        yield f'<name>trunk/dir{i % 500}/file{i}.dwg</name>'
+        yield f'<size>{i * 37}</size>'
+        yield '<commit'
+        yield f'   revision="{1000 + i}">'
+        yield f'<author>author{i % 40}</author>'
+        yield '<date>2024-01-05T12:34:56.789012Z</date>'
+        yield '</commit>'
+        yield '</entry>'
+    yield '</list>'
+    yield '</lists>'
+
+
+def measure(name, parsed_entries, count):
+    start = time.perf_counter()
+    parsed = sum(1 for _ in parsed_entries)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<6} parsed {parsed} of {count} entries in {elapsed:.3f}s "
+          f"({parsed / elapsed:,.0f} entries/s)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    engine = ExportEngine('svn://example/repo', 'user', 'password', os.devnull)
+    measure('text', engine.parse_svn_lines(make_text_lines(count)), count)
+    measure('xml', engine.parse_svn_xml(make_xml_lines(count)), count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Local stand-in for an Apache mod_dav_svn server
+
+Serves the synthetic repository of fake_svn.py over HTTP/1.1 with
+keep-alive, answering the requests the built-in HTTP client sends:
+OPTIONS with the HTTPv2 headers, PROPFIND with Depth 0 or 1 on public and
+revision root (!svn/rvr) paths, and the log-report and get-locks-report
+REPORTs. The repository lives at /repo and is shaped by the same
+FAKE_SVN_* environment variables as fake_svn.py.
+
+Usage:
+    python benchmarks/fake_dav_server.py [--port 8080] [--latency 0.005]
+
+--latency delays every response, to model a server across a network.
+"""
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_svn import XML_DATE, Repository, file_properties, log_changes
+
+REPOSITORY_PATH = '/repo'
+REVISION_ROOT_STUB = REPOSITORY_PATH + '/!svn/rvr'
+NAMESPACES = ('xmlns:D="DAV:" xmlns:S="http://subversion.tigris.org/xmlns/svn/" '
+              'xmlns:C="http://subversion.tigris.org/xmlns/custom/"')
+
+
+class DavHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes, which Nagle's algorithm would hold back
+    disable_nagle_algorithm = True
+    repository = None
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0) or 0)).decode('utf-8')
+
+    def send(self, status, body='', headers=None):
+        if self.latency:
+            time.sleep(self.latency)
+        data = body.encode('utf-8')
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'text/xml; charset="utf-8"')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def repository_path(self):
+        """Map the request path to (path inside the repository, prefix the server path was served under)"""
+        path = unquote(urlsplit(self.path).path)
+        match = re.match(re.escape(REVISION_ROOT_STUB) + r'/(\d+)(/.*)?$', path)
+        if match:
+            return (match.group(2) or '/').rstrip('/'), f"{REVISION_ROOT_STUB}/{match.group(1)}"
+        if path == REPOSITORY_PATH or path.startswith(REPOSITORY_PATH + '/'):
+            return path[len(REPOSITORY_PATH):].rstrip('/'), REPOSITORY_PATH
+        return None, None
+
+    def do_OPTIONS(self):
+        self.read_body()
+        self.send(200, headers={
+            'DAV': 'version-control,checkout,working-resource',
+            'SVN-Youngest-Rev': str(self.repository.head),
+            'SVN-Repository-Root': REPOSITORY_PATH,
+            'SVN-Rev-Root-Stub': REVISION_ROOT_STUB
+        })
+
+    def do_PROPFIND(self):
+        all_properties = 'allprop' in self.read_body()
+        path, prefix = self.repository_path()
+        digits = None if path is None else self.repository.resolve(self.repository.root + path)
+        if digits is None:
+            self.send(404)
+            return
+        repository = self.repository
+        responses = [propfind_response(prefix + path + '/', 'dir', repository.head, repository.authors[0], None, {})]
+        if self.headers.get('Depth', 'infinity') == '1':
+            for child, kind, revision, author, size, number in repository.walk(digits, '', False):
+                properties = file_properties(child, number) if kind == 'file' and all_properties else {}
+                responses.append(propfind_response(f"{prefix}{path}/{child}", kind, revision, author, size, properties))
+        self.send(207, f'<?xml version="1.0" encoding="utf-8"?>\n<D:multistatus {NAMESPACES}>\n'
+                       f'{"".join(responses)}</D:multistatus>\n')
+
+    def do_REPORT(self):
+        body = self.read_body()
+        path, _ = self.repository_path()
+        digits = None if path is None else self.repository.resolve(self.repository.root + path)
+        if digits is None:
+            self.send(404)
+            return
+        if 'get-locks-report' in body:
+            locks = []
+            for child, kind, revision, author, size, number in self.repository.walk(digits, '', True):
+                if kind == 'file' and number % 13 == 0:
+                    locks.append(f"<S:lock>\n<S:path>{escape(path + '/' + child)}</S:path>\n"
+                                 f"<S:token>opaquelocktoken:{number}</S:token>\n<S:owner>{escape(author)}</S:owner>\n"
+                                 f"<S:creationdate>{XML_DATE}</S:creationdate>\n</S:lock>\n")
+            self.send(200, f'<?xml version="1.0" encoding="utf-8"?>\n<S:get-locks-report xmlns:S="svn:" '
+                           f'xmlns:D="DAV:">\n{"".join(locks)}</S:get-locks-report>\n')
+        elif 'log-report' in body:
+            first = int(re.search(r'<S:start-revision>(\d+)<', body).group(1))
+            last = int(re.search(r'<S:end-revision>(\d+)<', body).group(1))
+            items = [
+                f"<S:log-item>\n<D:version-name>{revision}</D:version-name>\n"
+                f"<D:creator-displayname>{escape(author)}</D:creator-displayname>\n<S:date>{XML_DATE}</S:date>\n"
+                f"<S:modified-path node-kind=\"file\" text-mods=\"true\" prop-mods=\"false\">{escape(changed_path)}"
+                f"</S:modified-path>\n</S:log-item>\n"
+                for revision, author, changed_path in log_changes(self.repository, digits, first, last)
+            ]
+            self.send(200, f'<?xml version="1.0" encoding="utf-8"?>\n<S:log-report xmlns:S="svn:" xmlns:D="DAV:">\n'
+                           f'{"".join(items)}</S:log-report>\n')
+        else:
+            self.send(501)
+
+
+def propfind_response(href, kind, revision, author, size, properties):
+    resource_type = '<D:resourcetype><D:collection/></D:resourcetype>' if kind == 'dir' else '<D:resourcetype/>'
+    length = '' if size is None else f"<D:getcontentlength>{size}</D:getcontentlength>"
+    extra = ''.join(
+        f"<S:{name[4:]}>{escape(value)}</S:{name[4:]}>" if name.startswith('svn:') else f"<C:{name}>{escape(value)}</C:{name}>"
+        for name, value in properties.items()
+    )
+    return (f"<D:response>\n<D:href>{quote(href, safe='/!')}</D:href>\n<D:propstat>\n<D:prop>\n{resource_type}{length}"
+            f"<D:version-name>{revision}</D:version-name><D:creator-displayname>{escape(author)}</D:creator-displayname>"
+            f"<D:creationdate>{XML_DATE}</D:creationdate>{extra}\n</D:prop>\n<D:status>HTTP/1.1 200 OK</D:status>\n"
+            f"</D:propstat>\n</D:response>\n")
+
+
+def start_server(port=0, latency=0.0, environ=None):
+    """Start the server on a background thread and return it; its repository URL is server.url"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), DavHandler)
+    server.daemon_threads = True
+    url = f"http://127.0.0.1:{server.server_address[1]}{REPOSITORY_PATH}"
+    repository = Repository(dict(environ or os.environ, FAKE_SVN_ROOT=url))
+    server.RequestHandlerClass = type('BoundDavHandler', (DavHandler,), {'repository': repository, 'latency': latency})
+    server.url = url
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the synthetic repository over WebDAV.")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args(argv)
+    server = start_server(args.port, args.latency)
+    print(f"Serving {server.url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""Deterministic stand-in for the `svn` command line client
+
+Serves a synthetic repository so that exports can be measured without a
+Subversion server. The repository shape is read from environment
+variables:
+
+    FAKE_SVN_ROOT           repository root URL (default https://svn.example.com/repo)
+    FAKE_SVN_FILES          number of files (default 10000)
+    FAKE_SVN_DEPTH          directory levels above the files (default 3)
+    FAKE_SVN_FILES_PER_DIR  files in each leaf directory (default 50)
+    FAKE_SVN_AUTHORS        number of distinct authors (default 20)
+    FAKE_SVN_NON_ASCII      1 to use Chinese directory, file and author names
+    FAKE_SVN_HEAD           head revision (default 100000)
+    FAKE_SVN_ENCODING       encoding of plain text output (default gbk, as on a
+                            Chinese Windows console; XML is always UTF-8)
+    FAKE_SVN_STALL_AFTER    stop printing after this many entries of a recursive
+                            listing and hang, like a connection that went quiet
+    FAKE_SVN_STALL_MARKER   with FAKE_SVN_STALL_AFTER, a file created on stalling;
+                            while it exists, listings no longer stall
+
+Supported commands: --version, info --xml, list [-R | --depth immediates]
+[--verbose | --xml], log -v --xml -r A:B and proplist -R -v --xml. Every
+13th file is locked, binary files have svn:mime-type set and every third
+file has a drawing:status property. A URL pegged with @REV is served as
+if REV were the head revision. Other options such as --username and
+--password are accepted and ignored. The same environment always
+produces the same output.
+"""
+import math
+import os
+import re
+import sys
+import time
+from itertools import islice
+from urllib.parse import quote
+from xml.sax.saxutils import escape, quoteattr
+
+EXTENSIONS = ['dwg', 'dxf', 'pdf', 'xlsx', 'txt']
+BINARY_EXTENSIONS = {'dwg', 'pdf', 'xlsx'}
+TEXT_DATE = 'Jan 05 12:34'
+XML_DATE = '2024-01-05T12:34:56.123456Z'
+
+
+class Repository:
+    """A balanced tree of directories with files in the deepest level"""
+
+    def __init__(self, environ):
+        self.root = environ.get('FAKE_SVN_ROOT', 'https://svn.example.com/repo').rstrip('/')
+        self.files = int(environ.get('FAKE_SVN_FILES', '10000'))
+        self.depth = int(environ.get('FAKE_SVN_DEPTH', '3'))
+        self.files_per_dir = max(1, int(environ.get('FAKE_SVN_FILES_PER_DIR', '50')))
+        self.non_ascii = environ.get('FAKE_SVN_NON_ASCII', '0') == '1'
+        self.head = int(environ.get('FAKE_SVN_HEAD', '100000'))
+        if not self.depth:
+            self.files_per_dir = max(1, self.files)
+        self.leaves = max(1, math.ceil(self.files / self.files_per_dir))
+        # Smallest number of subdirectories per directory that holds every leaf
+        self.fanout = max(1, round(self.leaves ** (1 / self.depth))) if self.depth else 1
+        while self.depth and self.fanout ** self.depth < self.leaves:
+            self.fanout += 1
+        author_count = max(1, int(environ.get('FAKE_SVN_AUTHORS', '20')))
+        name = '设计师{}' if self.non_ascii else 'user{}'
+        self.authors = [name.format(number) for number in range(author_count)]
+
+    def dir_name(self, digit):
+        return f"项目{digit}" if self.non_ascii else f"dir{digit}"
+
+    def file_name(self, number):
+        stem = f"图纸_{number}" if self.non_ascii else f"file{number}"
+        return f"{stem}.{EXTENSIONS[number % len(EXTENSIONS)]}"
+
+    def leaf_range(self, digits):
+        """Return the leaf directories below a node as a range of leaf numbers"""
+        span = self.fanout ** (self.depth - len(digits))
+        first = 0
+        for digit in digits:
+            first = first * self.fanout + digit
+        first *= span
+        return range(first, min(first + span, self.leaves))
+
+    def leaf_path(self, leaf):
+        """Return the directory path of a leaf number, with a trailing '/'"""
+        names = []
+        for _ in range(self.depth):
+            leaf, digit = divmod(leaf, self.fanout)
+            names.append(self.dir_name(digit) + '/')
+        return ''.join(reversed(names))
+
+    def resolve(self, url):
+        """Map a URL to the digits of its directory, or None when it does not exist"""
+        url = url.split('@', 1)[0].rstrip('/')
+        if url != self.root and not url.startswith(self.root + '/'):
+            return None
+        digits = []
+        for part in filter(None, url[len(self.root):].split('/')):
+            match = re.search(r'(\d+)$', part)
+            if not match or part != self.dir_name(int(match.group(1))) or len(digits) >= self.depth:
+                return None
+            digits.append(int(match.group(1)))
+        return digits if self.leaf_range(digits) else None
+
+    def entry(self, path, number, kind):
+        """Return (path, kind, revision, author, size, number) for a file number or a leaf number"""
+        revision = 1 + (number * 7919) % self.head
+        author = self.authors[(number * 31) % len(self.authors)]
+        size = (number * 997) % 10000000 if kind == 'file' else None
+        return path, kind, revision, author, size, number
+
+    def walk(self, digits, prefix, recursive):
+        """Yield the entries below a directory in `svn list -R` order"""
+        children = []
+        if len(digits) < self.depth:
+            for digit in range(self.fanout):
+                child = digits + [digit]
+                leaves = self.leaf_range(child)
+                if leaves:
+                    children.append((self.dir_name(digit), child, leaves.start))
+        else:
+            leaf = self.leaf_range(digits).start
+            start = leaf * self.files_per_dir
+            for number in range(start, min(start + self.files_per_dir, self.files)):
+                children.append((self.file_name(number), None, number))
+
+        # svn sorts the entries of each directory by name
+        for name, child, number in sorted(children):
+            if child is None:
+                yield self.entry(prefix + name, number, 'file')
+            else:
+                yield self.entry(prefix + name + '/', number, 'dir')
+                if recursive:
+                    yield from self.walk(child, prefix + name + '/', recursive)
+
+
+def text_line(path, kind, revision, author, size, number=0):
+    size_text = '' if size is None else str(size)
+    return f"{revision:>7} {author:<8.8} {size_text:>10} {TEXT_DATE} {path}\n"
+
+
+def xml_entry(path, kind, revision, author, size, number):
+    size_line = '' if size is None else f"<size>{size}</size>\n"
+    lock = ''
+    if kind == 'file' and number % 13 == 0:
+        lock = (f"<lock>\n<token>opaquelocktoken:{number}</token>\n<owner>{escape(author)}</owner>\n"
+                f"<created>{XML_DATE}</created>\n</lock>\n")
+    return (f"<entry\n   kind=\"{kind}\">\n<name>{escape(path.rstrip('/'))}</name>\n{size_line}"
+            f"<commit\n   revision=\"{revision}\">\n<author>{escape(author)}</author>\n"
+            f"<date>{XML_DATE}</date>\n</commit>\n{lock}</entry>\n")
+
+
+def file_properties(path, number):
+    """Return the versioned properties of a file"""
+    properties = {}
+    if path.rsplit('.', 1)[-1] in BINARY_EXTENSIONS:
+        properties['svn:mime-type'] = 'application/octet-stream'
+    if number % 3 == 0:
+        properties['drawing:status'] = ('approved', 'draft', '审核中')[number % 9 // 3]
+    return properties
+
+
+def write_chunks(stream, lines, encoding, chunk_lines=2000):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            stream.write(''.join(chunk).encode(encoding))
+            chunk = []
+    stream.write(''.join(chunk).encode(encoding))
+
+
+def svn_list(repository, args, stream):
+    url = next(arg for arg in args if '://' in arg)
+    digits = repository.resolve(url)
+    if digits is None:
+        sys.stderr.write("svn: E200009: Could not list all targets because some targets don't exist\n")
+        return 1
+    recursive = '-R' in args or '--recursive' in args
+    entries = repository.walk(digits, '', recursive)
+    stall_after = os.environ.get('FAKE_SVN_STALL_AFTER')
+    marker = os.environ.get('FAKE_SVN_STALL_MARKER')
+    stall = recursive and stall_after is not None and not (marker and os.path.exists(marker))
+    if stall:
+        entries = islice(entries, int(stall_after))
+    if '--xml' in args:
+        target = url.split('@', 1)[0]
+        lines = [f'<?xml version="1.0" encoding="UTF-8"?>\n<lists>\n<list\n   path={quoteattr(target)}>\n']
+        write_chunks(stream, lines, 'utf-8')
+        write_chunks(stream, (xml_entry(*entry) for entry in entries), 'utf-8')
+        write_chunks(stream, ['</list>\n</lists>\n'], 'utf-8')
+    else:
+        encoding = os.environ.get('FAKE_SVN_ENCODING', 'gbk')
+        # `svn list -v` prints the target itself first as "./"
+        head = text_line('./', 'dir', repository.head, repository.authors[0], None)
+        write_chunks(stream, [head], encoding)
+        write_chunks(stream, (text_line(*entry) for entry in entries), encoding)
+    if stall:
+        stream.flush()
+        if marker:
+            open(marker, 'w').close()
+        time.sleep(3600)
+        return 1
+    return 0
+
+
+def svn_proplist(repository, args, stream):
+    """Only the recursive, verbose XML form used for extended metadata"""
+    url = next(arg for arg in args if '://' in arg)
+    digits = repository.resolve(url)
+    if digits is None:
+        sys.stderr.write("svn: E200009: Could not display properties of all targets\n")
+        return 1
+    base = url.split('@', 1)[0].rstrip('/')
+
+    def targets():
+        for path, kind, revision, author, size, number in repository.walk(digits, '', True):
+            properties = file_properties(path, number) if kind == 'file' else {}
+            if properties:
+                lines = ''.join(f"<property\n   name={quoteattr(name)}>{escape(value)}</property>\n"
+                                for name, value in properties.items())
+                yield f"<target\n   path={quoteattr(base + '/' + quote(path.rstrip('/')))}>\n{lines}</target>\n"
+
+    write_chunks(stream, ['<?xml version="1.0" encoding="UTF-8"?>\n<properties>\n'], 'utf-8')
+    write_chunks(stream, targets(), 'utf-8')
+    write_chunks(stream, ['</properties>\n'], 'utf-8')
+    return 0
+
+
+def svn_info(repository, args, stream):
+    url = next(arg for arg in args if '://' in arg)
+    if repository.resolve(url) is None:
+        sys.stderr.write(f"svn: E170000: URL '{url}' non-existent in revision {repository.head}\n")
+        return 1
+    path = url.split('@', 1)[0].rstrip('/')[len(repository.root):] or '/'
+    output = (f'<?xml version="1.0" encoding="UTF-8"?>\n<info>\n<entry\n   kind="dir"\n   path="repo"\n'
+              f'   revision="{repository.head}">\n<url>{escape(url.split("@", 1)[0])}</url>\n'
+              f'<relative-url>{escape("^" + path)}</relative-url>\n'
+              f'<repository>\n<root>{escape(repository.root)}</root>\n</repository>\n'
+              f'<commit\n   revision="{repository.head}">\n<author>{escape(repository.authors[0])}</author>\n'
+              f'<date>{XML_DATE}</date>\n</commit>\n</entry>\n</info>\n')
+    stream.write(output.encode('utf-8'))
+    return 0
+
+
+def log_changes(repository, digits, first, last):
+    """Yield (revision, author, changed path) for revisions first..last; each modifies one existing file"""
+    leaves = repository.leaf_range(digits)
+    for revision in range(first, last + 1):
+        leaf = leaves[revision % len(leaves)]
+        number = min(leaf * repository.files_per_dir + revision % repository.files_per_dir, repository.files - 1)
+        # Changed paths are relative to the repository root
+        changed_path = f"/{repository.leaf_path(leaf)}{repository.file_name(number)}"
+        yield revision, repository.authors[revision % len(repository.authors)], changed_path
+
+
+def svn_log(repository, args, stream):
+    url = next(arg for arg in args if '://' in arg)
+    digits = repository.resolve(url)
+    if digits is None:
+        sys.stderr.write(f"svn: E160013: '{url}' path not found\n")
+        return 1
+    first, last = args[args.index('-r') + 1].split(':')
+    first = int(first)
+    last = repository.head if last.upper() == 'HEAD' else int(last)
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>\n<log>\n']
+    for revision, author, changed_path in log_changes(repository, digits, first, last):
+        lines.append(f"<logentry\n   revision=\"{revision}\">\n"
+                     f"<author>{escape(author)}</author>\n"
+                     f"<date>{XML_DATE}</date>\n<paths>\n<path\n   kind=\"file\"\n   action=\"M\">"
+                     f"{escape(changed_path)}</path>\n</paths>\n<msg>Synthetic change {revision}</msg>\n"
+                     f"</logentry>\n")
+    lines.append('</log>\n')
+    write_chunks(stream, lines, 'utf-8')
+    return 0
+
+
+def main(argv):
+    stream = sys.stdout.buffer
+    if not argv or argv[0] == '--version':
+        stream.write(b"svn, version 1.14.2 (fake)\n")
+        return 0
+    repository = Repository(os.environ)
+    for arg in argv[1:]:
+        peg = re.search(r'://.*@(\d+)$', arg)
+        if peg and int(peg.group(1)) <= repository.head:
+            repository.head = int(peg.group(1))
+    commands = {'list': svn_list, 'ls': svn_list, 'info': svn_info, 'log': svn_log,
+                'proplist': svn_proplist, 'pl': svn_proplist}
+    if argv[0] not in commands:
+        sys.stderr.write(f"svn: E205000: Unknown subcommand: '{argv[0]}'\n")
+        return 1
+    try:
+        return commands[argv[0]](repository, argv[1:], stream)
+    except BrokenPipeError:
+        # The consumer stopped reading, like a cancelled export
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,237 @@
+"""Run end-to-end exports against the fake svn and write a machine-readable report
+
+Usage:
+    python benchmarks/run_benchmarks.py [--files 10000 100000] [--depth 3] [--authors 20]
+        [--non-ascii] [--list-formats text xml] [--output-formats xlsx csv] [--filter "*.dwg"]
+        [--backends svn dav] [--latency 0.005] [--repeat 3] [--report report.json] [--baseline old_report.json] [--tolerance 0.2]
+
+Each scenario runs in its own process with benchmarks/fake_svn.py first on
+PATH as `svn`, so no Subversion client or server is needed. Scenarios of
+the dav backend list the same repository from benchmarks/fake_dav_server.py
+instead, started in another process; --latency delays each of its
+responses. Stage times
+come from the export's own metrics (see export_metrics.py):
+
+    spawn   starting svn until its first line of output
+    svn     waiting for and decoding svn output
+    parse   parsing lines into entries
+    filter  filtering entries and shaping them into rows
+    write   handing rows to the output writer
+    save    finishing and saving the output file
+
+The report holds, per scenario, the stage times, total time, rows per
+second and peak RSS of the best run. With --baseline, scenarios whose
+throughput or peak RSS got worse by more than --tolerance are listed and
+the exit code is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from exporters import OUTPUT_FORMATS
+
+FAKE_SVN = os.path.join(ROOT, 'benchmarks', 'fake_svn.py')
+FAKE_DAV_SERVER = os.path.join(ROOT, 'benchmarks', 'fake_dav_server.py')
+REPOSITORY_ROOT = 'https://svn.example.com/repo'
+STAGES = ('spawn', 'svn', 'parse', 'filter', 'write', 'save')
+
+
+def run_child(scenario):
+    """Run one export in this process and return its measurements"""
+    from export_engine import ExportEngine
+    from translations import en_US
+
+    engine = ExportEngine(
+        scenario.get('url', REPOSITORY_ROOT), 'bench', 'bench', scenario['output'],
+        [scenario['filter']] if scenario['filter'] else [],
+        list_format=scenario['list_format'],
+        output_format=scenario['output_format'],
+        backend=scenario['backend']
+    )
+    engine.set_translations(en_US.translations)
+    success, message = engine.run()
+    metrics = engine.metrics_report
+    return {
+        'success': success,
+        'message': message,
+        'rows': engine.files_exported,
+        'seconds': metrics['seconds'],
+        'rows_per_second': metrics['rows_per_second'],
+        'peak_rss_bytes': metrics['peak_memory_bytes'],
+        'output_bytes': os.path.getsize(scenario['output']) if success else 0,
+        'stages': dict(metrics['stages'], spawn=metrics['time_to_first_byte_seconds'] or 0.0),
+        'counts': metrics['counts']
+    }
+
+
+def install_fake_svn(directory):
+    """Put an `svn` launcher for fake_svn.py into directory"""
+    if os.name == 'nt':
+        with open(os.path.join(directory, 'svn.bat'), 'w') as f:
+            f.write(f'@"{sys.executable}" "{FAKE_SVN}" %*\n')
+    else:
+        path = os.path.join(directory, 'svn')
+        with open(path, 'w') as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_SVN}" "$@"\n')
+        os.chmod(path, 0o755)
+
+
+def start_dav_server(env, latency):
+    """Start fake_dav_server.py on a free port and return (process, repository URL)"""
+    process = subprocess.Popen([sys.executable, FAKE_DAV_SERVER, '--port', '0', '--latency', str(latency)],
+                               env=env, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith('Serving '):
+        process.kill()
+        raise RuntimeError("fake_dav_server.py did not start")
+    return process, line.split(' ', 1)[1].strip()
+
+
+def scenario_name(scenario):
+    charset = 'non_ascii' if scenario['non_ascii'] else 'ascii'
+    # Scenarios of the svn client keep their names, so older reports stay comparable
+    listing = scenario['list_format'] if scenario['backend'] == 'svn' else scenario['backend']
+    name = (f"{listing}-{scenario['output_format']}-{scenario['files']}files-"
+            f"depth{scenario['depth']}-{scenario['authors']}authors-{charset}")
+    return f"{name}-filter:{scenario['filter']}" if scenario['filter'] else name
+
+
+def run_scenario(scenario, bin_dir, work_dir, repeat, latency=0.0):
+    extension = next(ext for ext, output_format in OUTPUT_FORMATS.items() if output_format == scenario['output_format'])
+    scenario = dict(scenario, output=os.path.join(work_dir, 'export' + extension))
+    env = os.environ.copy()
+    env['PATH'] = bin_dir + os.pathsep + env.get('PATH', '')
+    env.update({
+        'FAKE_SVN_ROOT': REPOSITORY_ROOT,
+        'FAKE_SVN_FILES': str(scenario['files']),
+        'FAKE_SVN_DEPTH': str(scenario['depth']),
+        'FAKE_SVN_AUTHORS': str(scenario['authors']),
+        'FAKE_SVN_NON_ASCII': '1' if scenario['non_ascii'] else '0'
+    })
+
+    server = None
+    if scenario['backend'] == 'dav':
+        server, scenario['url'] = start_dav_server(env, latency)
+    runs = []
+    try:
+        for _ in range(repeat):
+            completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', json.dumps(scenario)],
+                                       env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise RuntimeError(f"{scenario_name(scenario)} failed:\n{completed.stderr}")
+            runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+            if os.path.exists(scenario['output']):
+                os.remove(scenario['output'])
+    finally:
+        if server is not None:
+            server.kill()
+            server.wait()
+
+    best = min(runs, key=lambda run: run['seconds'])
+    result = {key: value for key, value in scenario.items() if key not in ('output', 'url')}
+    result['name'] = scenario_name(scenario)
+    result.update(best)
+    result['run_seconds'] = [run['seconds'] for run in runs]
+    return result
+
+
+def compare(report, baseline, tolerance):
+    """Return the scenarios that regressed against a baseline report"""
+    previous = {scenario['name']: scenario for scenario in baseline['scenarios']}
+    regressions = []
+    for scenario in report['scenarios']:
+        old = previous.get(scenario['name'])
+        if old is None:
+            continue
+        if scenario['rows_per_second'] < old['rows_per_second'] * (1 - tolerance):
+            regressions.append(f"{scenario['name']}: {old['rows_per_second']:,.0f} -> "
+                               f"{scenario['rows_per_second']:,.0f} rows/s")
+        if scenario['peak_rss_bytes'] > old['peak_rss_bytes'] * (1 + tolerance):
+            regressions.append(f"{scenario['name']}: peak RSS {old['peak_rss_bytes'] / 2 ** 20:,.1f} -> "
+                               f"{scenario['peak_rss_bytes'] / 2 ** 20:,.1f} MB")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark exports against a synthetic svn repository.")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--files', type=int, nargs='+', default=[10000, 100000], help="repository sizes")
+    parser.add_argument('--depth', type=int, default=3, help="directory levels above the files")
+    parser.add_argument('--authors', type=int, default=20, help="number of distinct authors")
+    parser.add_argument('--non-ascii', action='store_true', help="use Chinese directory, file and author names")
+    parser.add_argument('--list-formats', nargs='+', choices=['text', 'xml'], default=['text', 'xml'])
+    parser.add_argument('--output-formats', nargs='+', choices=sorted(set(OUTPUT_FORMATS.values())),
+                        default=['xlsx', 'csv'])
+    parser.add_argument('--backends', nargs='+', choices=['svn', 'dav'], default=['svn'],
+                        help="listing backends; dav scenarios ignore --list-formats")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="seconds the fake DAV server waits before each response")
+    parser.add_argument('--filter', default='', help="file pattern applied during the export, e.g. *.dwg")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per scenario; the fastest is reported")
+    parser.add_argument('--report', default='benchmark_report.json', help="JSON report path")
+    parser.add_argument('--baseline', help="earlier report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed relative slowdown or memory growth (default: 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(run_child(json.loads(args.child))))
+        return 0
+
+    scenarios = [
+        {'files': files, 'depth': args.depth, 'authors': args.authors, 'non_ascii': args.non_ascii,
+         'backend': backend, 'list_format': list_format, 'output_format': output_format, 'filter': args.filter}
+        for files in args.files
+        for backend in args.backends
+        for list_format in (args.list_formats if backend == 'svn' else ['xml'])
+        for output_format in args.output_formats
+    ]
+    bin_dir = tempfile.mkdtemp(prefix='fake_svn_')
+    work_dir = tempfile.mkdtemp(prefix='export_bench_')
+    try:
+        install_fake_svn(bin_dir)
+        results = []
+        for scenario in scenarios:
+            result = run_scenario(scenario, bin_dir, work_dir, max(1, args.repeat), args.latency)
+            stages = ' '.join(f"{stage} {result['stages'][stage]:.2f}s" for stage in STAGES)
+            print(f"{result['name']:<52} {result['seconds']:7.2f}s {result['rows_per_second']:>10,.0f} rows/s "
+                  f"{result['peak_rss_bytes'] / 2 ** 20:7.1f} MB  [{stages}]")
+            results.append(result)
+    finally:
+        shutil.rmtree(bin_dir, ignore_errors=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'scenarios': results
+    }
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Report written to {args.report}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
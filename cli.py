@@ -0,0 +1,274 @@
+"""Headless command line entry point for the SVN file information export
+
+Runs the same export as the GUI without importing Qt, for use from cron
+jobs and CI runners. The password is read from an environment variable
+so that it stays out of the shell history and of the cli.py command line.
+svn itself still receives it as a --password argument, which other users
+of the machine can see in the process list while svn runs.
+
+Examples:
+    SVN_PASSWORD=secret python cli.py https://svn.example.com/repo/trunk \\
+        --username alice --filter "*.dwg;*.dxf" --output files.xlsx
+
+    SVN_PASSWORD=secret python cli.py https://svn.example.com/repo/trunk \\
+        --username alice --output files.parquet
+
+    SVN_PASSWORD=secret python cli.py --batch repositories.txt \\
+        --username alice --output exports/ --concurrency 8 --per-host 2
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+
+from exporters import OUTPUT_FORMATS
+
+VERSION = "v1.1"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export SVN file information without starting the GUI.")
+    parser.add_argument('url', nargs='?', help="SVN repository URL")
+    parser.add_argument('--batch', metavar='JOB_FILE',
+                        help="export every URL listed in JOB_FILE (one per line) instead of a single URL")
+    parser.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'),
+                        help="write the files added, removed and modified between two URLs or revisions "
+                             "(URL@REV) instead of a file list")
+    parser.add_argument('-u', '--username', default=os.environ.get('SVN_USERNAME', ''),
+                        help="SVN username (default: $SVN_USERNAME)")
+    parser.add_argument('--password-env', default='SVN_PASSWORD', metavar='NAME',
+                        help="environment variable holding the SVN password (default: SVN_PASSWORD)")
+    parser.add_argument('-o', '--output', required=True,
+                        help="output file path; with --batch, a directory (or a workbook with --combined)")
+    parser.add_argument('--format', choices=sorted(set(OUTPUT_FORMATS.values())),
+                        help="output format; parquet needs pyarrow (default: from the output file extension)")
+    parser.add_argument('-f', '--filter', action='append', default=[], metavar='PATTERNS',
+                        help="semicolon separated file patterns, e.g. \"*.dwg;!tags/\" (repeatable)")
+    parser.add_argument('--list-format', choices=['text', 'xml'], default='text',
+                        help="svn list output to parse (default: text)")
+    parser.add_argument('--backend', choices=['svn', 'dav'], default='svn',
+                        help="svn runs the svn client; dav lists http(s) URLs over WebDAV without it (default: svn)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="number of top-level directories listed in parallel (default: 1)")
+    parser.add_argument('--index', metavar='PATH',
+                        help="listing cache database (default: the per-user cache)")
+    parser.add_argument('--no-index', action='store_true', help="always list the repository")
+    parser.add_argument('--verify-incremental', action='store_true',
+                        help="check incremental cache updates against a full listing")
+    parser.add_argument('--metrics', action='store_true',
+                        help="append per-stage timings and counters of the run to <output>_metrics.jsonl")
+    parser.add_argument('--extended', action='store_true',
+                        help="add size, lock owner and MIME type columns (uses the XML listing, bypasses the index)")
+    parser.add_argument('--property', action='append', default=[], metavar='NAME',
+                        help="add a column for a custom svn property, implies --extended; may be repeated")
+    parser.add_argument('--timeout', type=float, default=300, metavar='SECONDS',
+                        help="stop an svn command that prints nothing for this long, 0 to wait forever (default: 300)")
+    parser.add_argument('--resume', action='store_true',
+                        help="record the listing in <output>_checkpoint.jsonl while it runs, and continue an "
+                             "interrupted or failed export from it instead of listing again from the start")
+    parser.add_argument('--sort', choices=['path', 'revision', 'author', 'date'],
+                        help="order the rows by directory and name, revision, author or commit date "
+                             "(default: listing order)")
+    parser.add_argument('--sort-memory', type=int, default=256, metavar='MB',
+                        help="with --sort, memory for rows before sorted runs spill to temporary files (default: 256)")
+    parser.add_argument('--summary', action='store_true',
+                        help="add files and sizes per author, top-level directory and extension and the most recently "
+                             "changed directories, as extra sheets or <output>_by_author etc. files")
+    parser.add_argument('--combined', action='store_true',
+                        help="with --batch, write one workbook with a sheet per repository")
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help="with --batch, number of repositories exported at once (default: 4)")
+    parser.add_argument('--per-host', type=int, default=2,
+                        help="with --batch, maximum concurrent exports per server (default: 2)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and export again whenever the URL (or a --batch URL) gets a new revision")
+    parser.add_argument('--interval', type=float, default=300,
+                        help="with --watch, seconds between revision checks (default: 300)")
+    parser.add_argument('--max-interval', type=float, default=3600,
+                        help="with --watch, longest delay between retries after failures (default: 3600)")
+    parser.add_argument('--lang', choices=['en_US', 'zh_CN'], default='en_US',
+                        help="language of log messages (default: en_US)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every parsed entry")
+    parser.add_argument('-q', '--quiet', action='store_true', help="only report errors")
+    parser.add_argument('--version', action='version', version=VERSION)
+    args = parser.parse_args(argv)
+
+    if sum(map(bool, (args.url, args.batch, args.diff))) != 1:
+        parser.error("give either a URL, --batch JOB_FILE or --diff OLD NEW")
+    if args.batch and not args.combined:
+        # Batch output is a directory with one file per repository, xlsx unless --format is given
+        args.format = args.format or 'xlsx'
+    if args.format is None:
+        extension = os.path.splitext(args.output)[1].lower()
+        if extension not in OUTPUT_FORMATS:
+            parser.error(f"cannot infer the output format from '{args.output}', use --format")
+        args.format = OUTPUT_FORMATS[extension]
+    if args.combined and args.format != 'xlsx':
+        parser.error("--combined writes one sheet per repository and needs the xlsx format")
+    if args.watch and (args.diff or args.combined):
+        parser.error("--watch works with a URL or --batch without --combined")
+    return args
+
+
+class StderrReporter:
+    """Prints batched log lines and progress to stderr"""
+
+    def __init__(self, quiet):
+        self.quiet = quiet
+        self.interactive = sys.stderr.isatty()
+        self.progress_shown = False
+
+    def logs(self, text):
+        if self.quiet:
+            return
+        self.clear_progress()
+        sys.stderr.write(text + '\n')
+        sys.stderr.flush()
+
+    def progress(self, count):
+        # Progress is redrawn in place on a terminal and omitted from redirected output
+        if self.quiet or not self.interactive:
+            return
+        sys.stderr.write(f"\rFiles processed: {count}")
+        sys.stderr.flush()
+        self.progress_shown = True
+
+    def clear_progress(self):
+        if self.progress_shown:
+            sys.stderr.write('\n')
+            self.progress_shown = False
+
+
+def cancel_on_interrupt(cancel):
+    """Make Ctrl+C call cancel(), which stops the svn processes too; a second Ctrl+C interrupts as usual"""
+    def interrupted(signum, frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        cancel()
+    signal.signal(signal.SIGINT, interrupted)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Imported after argument parsing so that --help and usage errors stay fast
+    from export_engine import ExportEngine
+    from listing_index import default_index_path
+    from translations import en_US, zh_CN
+    translations = {'en_US': en_US, 'zh_CN': zh_CN}[args.lang].translations
+
+    filter_patterns = [
+        pattern.strip()
+        for patterns in args.filter
+        for pattern in patterns.split(';')
+        if pattern.strip()
+    ]
+
+    reporter = StderrReporter(args.quiet)
+    engine_options = {
+        'list_format': args.list_format,
+        'backend': args.backend,
+        'parallel_workers': args.workers,
+        'index_path': None if args.no_index else (args.index or default_index_path()),
+        'verify_incremental': args.verify_incremental,
+        'write_metrics': args.metrics,
+        'extended_metadata': args.extended or bool(args.property),
+        'properties': args.property,
+        'summary_sheets': args.summary,
+        'sort_by': args.sort,
+        'sort_memory_mb': args.sort_memory,
+        'command_timeout': args.timeout or None,
+        'checkpoint': args.resume,
+        'log_level': logging.DEBUG if args.verbose else logging.INFO
+    }
+
+    if args.diff:
+        from inventory_diff import InventoryDiff
+        diff = InventoryDiff(
+            args.diff[0],
+            args.diff[1],
+            args.username,
+            os.environ.get(args.password_env, ''),
+            args.output,
+            filter_patterns,
+            output_format=args.format,
+            engine_options=engine_options,
+            emit_logs=reporter.logs,
+            emit_progress=reporter.progress,
+            translations=translations
+        )
+        cancel_on_interrupt(diff.cancel)
+        success, message = diff.run()
+        reporter.clear_progress()
+        sys.stderr.write(message + '\n')
+        return 0 if success else 1
+
+    if args.watch:
+        from batch_export import output_paths_for, read_job_file
+        from watch_export import WatchExport, watch_state_path
+        if args.batch:
+            os.makedirs(args.output, exist_ok=True)
+            outputs = output_paths_for(read_job_file(args.batch), args.output, args.format)
+        else:
+            outputs = {args.url: args.output}
+        watch = WatchExport(
+            outputs,
+            args.username,
+            os.environ.get(args.password_env, ''),
+            watch_state_path(args.output, bool(args.batch)),
+            filter_patterns,
+            interval=args.interval,
+            max_interval=args.max_interval,
+            output_format=args.format,
+            engine_options=engine_options,
+            emit_logs=reporter.logs,
+            translations=translations
+        )
+        cancel_on_interrupt(watch.stop)
+        watch.run()
+        return 0
+
+    if args.batch:
+        from batch_export import BatchExport, read_job_file
+        batch = BatchExport(
+            read_job_file(args.batch),
+            args.username,
+            os.environ.get(args.password_env, ''),
+            args.output,
+            filter_patterns,
+            combined=args.combined,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            output_format=args.format,
+            engine_options=engine_options,
+            emit_logs=reporter.logs,
+            translations=translations
+        )
+        cancel_on_interrupt(batch.cancel)
+        success, message = batch.run()
+        sys.stderr.write(message + '\n')
+        return 0 if success else 1
+
+    engine = ExportEngine(
+        args.url,
+        args.username,
+        os.environ.get(args.password_env, ''),
+        args.output,
+        filter_patterns,
+        emit_logs=reporter.logs,
+        emit_progress=reporter.progress,
+        output_format=args.format,
+        **engine_options
+    )
+    engine.set_translations(translations)
+    cancel_on_interrupt(engine.cancel)
+
+    success, message = engine.run()
+    reporter.clear_progress()
+    sys.stderr.write(message + '\n')
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,430 @@
+import base64
+import collections
+import http.client
+import queue
+import socket
+import ssl
+import threading
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import quote, unquote, urlsplit
+
+from listing_entry import ListingEntry
+
+# Concurrent requests when the caller does not ask for a number
+DEFAULT_CONNECTIONS = 4
+# Directories per connection requested before the walk reaches them
+DIRECTORIES_AHEAD = 8
+
+DAV = '{DAV:}'
+SVN = '{svn:}'
+SVN_PROPERTY_NS = '{http://subversion.tigris.org/xmlns/svn/}'
+CUSTOM_PROPERTY_NS = '{http://subversion.tigris.org/xmlns/custom/}'
+SVN_DAV_NS = '{http://subversion.tigris.org/xmlns/dav/}'
+
+LISTING_PROPFIND = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<D:propfind xmlns:D="DAV:"><D:prop>'
+    '<D:resourcetype/><D:getcontentlength/><D:version-name/><D:creator-displayname/><D:creationdate/>'
+    '</D:prop></D:propfind>'
+)
+# Every property of each node comes back with its listing, so no extra request per file is needed
+PROPERTIES_PROPFIND = '<?xml version="1.0" encoding="utf-8"?><D:propfind xmlns:D="DAV:"><D:allprop/></D:propfind>'
+OPTIONS_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<D:options xmlns:D="DAV:"><D:activity-collection-set/></D:options>'
+)
+LOCKS_REPORT = '<?xml version="1.0" encoding="utf-8"?><S:get-locks-report xmlns:S="svn:" depth="infinity"/>'
+LOG_REPORT = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<S:log-report xmlns:S="svn:"><S:start-revision>{start}</S:start-revision>'
+    '<S:end-revision>{end}</S:end-revision><S:discover-changed-paths/><S:path></S:path></S:log-report>'
+)
+LOG_ACTIONS = {'added-path': 'A', 'modified-path': 'M', 'deleted-path': 'D', 'replaced-path': 'R'}
+
+
+class DavError(Exception):
+    """A request the server answered with an unexpected status"""
+
+    def __init__(self, method, path, status, reason):
+        super().__init__(f"{method} {unquote(path)}: HTTP {status} {reason}")
+        self.status = status
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one server, shared by worker threads
+
+    At most `size` connections are open at once. A connection goes back to
+    the pool after its response has been read completely, so the next
+    request reuses it without a new TCP and TLS handshake. A request on a
+    reused connection that the server has closed in the meantime is sent
+    again once on a fresh connection. abort() cuts every request short.
+    """
+
+    def __init__(self, url, size=DEFAULT_CONNECTIONS, timeout=60):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context() if self.scheme == 'https' else None
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(max(1, size))
+        self.lock = threading.Lock()
+        self.active = set()  # Connections with a request in progress
+        self.aborted = threading.Event()
+        self.opened = 0
+        self.requests = 0
+
+    def connect(self):
+        with self.lock:
+            self.opened += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self):
+        with self.slots:
+            try:
+                connection, reused = self.idle.get_nowait(), True
+            except queue.Empty:
+                connection, reused = self.connect(), False
+            with self.lock:
+                self.active.add(connection)
+            try:
+                yield connection, reused
+            except BaseException:
+                connection.close()
+                raise
+            finally:
+                with self.lock:
+                    self.active.discard(connection)
+            self.idle.put(connection)
+
+    def request(self, method, path, body=None, headers=None):
+        """Send a request and return the response, already read, with its body"""
+        with self.lock:
+            self.requests += 1
+        with self.connection() as (connection, reused):
+            for attempt in (1, 2):
+                if self.aborted.is_set():
+                    raise ConnectionAbortedError('Request cancelled')
+                try:
+                    connection.request(method, path, body=body, headers=headers or {})
+                    response = connection.getresponse()
+                    return response, response.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if not reused or attempt == 2:
+                        raise
+                    connection.close()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+            
+    def abort(self):
+        """Fail every request in progress and any later one; safe to call from any thread"""
+        self.aborted.set()
+        with self.lock:
+            connections = list(self.active)
+        for connection in connections:
+            # Unlike close(), shutdown() also wakes a thread blocked reading the response
+            sock = connection.sock
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+class DavClient:
+    """List a Subversion repository over HTTP(S) without the svn client
+
+    Talks to mod_dav_svn (or VisualSVN Server) the way svn itself does: an
+    OPTIONS request for the youngest revision and repository root, then one
+    Depth: 1 PROPFIND per directory against the revision root, so a listing
+    stays consistent while it runs. Directories are requested concurrently
+    over a pool of keep-alive connections, and entries are still yielded in
+    `svn list -R` order. Servers without HTTPv2 support (Subversion older
+    than 1.7) are listed at their public URLs instead.
+    """
+
+    def __init__(self, url, username='', password='', connections=DEFAULT_CONNECTIONS, retries=2, timeout=60):
+        self.url = url.rstrip('/')
+        self.connections = max(1, connections)
+        self.retries = retries
+        self.pool = ConnectionPool(self.url, self.connections, timeout)
+        self.url_path = unquote(urlsplit(self.url).path).rstrip('/')
+        self.headers = {'Content-Type': 'text/xml; charset="utf-8"'}
+        if username or password:
+            token = base64.b64encode(f"{username}:{password}".encode('utf-8')).decode('ascii')
+            self.headers['Authorization'] = f"Basic {token}"
+        self.opened = False
+        self.youngest = None
+        self.repository_root = None  # Server path of the repository root, e.g. /svn/repo
+        self.revision_root_stub = None  # e.g. /svn/repo/!svn/rvr, None without HTTPv2
+
+    def request(self, method, path, body, headers=None, expected=(200, 207)):
+        """Send a request for an unquoted server path and return the parsed XML response"""
+        response, data = self.send(method, path, body, headers, expected)
+        return parse_xml(data) if data.strip() else None
+
+    def send(self, method, path, body, headers=None, expected=(200, 207)):
+        quoted = quote(path, safe='/!~')
+        response, data = self.pool.request(method, quoted, body.encode('utf-8'), dict(self.headers, **(headers or {})))
+        if response.status not in expected:
+            raise DavError(method, quoted, response.status, response.reason)
+        return response, data
+
+    def open(self):
+        """Read the youngest revision and the repository layout with one OPTIONS request"""
+        response, _ = self.send('OPTIONS', self.url_path + '/', OPTIONS_BODY, expected=(200,))
+        youngest = response.getheader('SVN-Youngest-Rev')
+        self.youngest = int(youngest) if youngest and youngest.isdigit() else None
+        root = response.getheader('SVN-Repository-Root')
+        self.repository_root = unquote(root).rstrip('/') if root else None
+        stub = response.getheader('SVN-Rev-Root-Stub')
+        self.revision_root_stub = unquote(stub).rstrip('/') if stub and self.youngest is not None else None
+        self.opened = True
+        return self.youngest
+
+    def relative_path(self):
+        """Return the path of the URL inside the repository, '/' for the root, or None if unknown"""
+        if self.repository_root is None or not self.url_path.startswith(self.repository_root):
+            return None
+        return self.url_path[len(self.repository_root):] or '/'
+
+    def server_path(self, path='', revision=None):
+        """Return the server path of a path below the URL, pinned to revision where the server allows it"""
+        relative = self.relative_path()
+        if self.revision_root_stub is None or relative is None:
+            base = self.url_path
+        else:
+            base = f"{self.revision_root_stub}/{revision or self.youngest}{relative.rstrip('/')}"
+        return f"{base}/{path}" if path else base
+
+    def info(self, revision=None):
+        """Return the last changed revision and repository path of the URL, like parse_info()"""
+        if not self.opened:
+            self.open()
+        root = self.request('PROPFIND', self.server_path('', revision) + '/', LISTING_PROPFIND, {'Depth': '0'})
+        revision = root.findtext(f'{DAV}response/{DAV}propstat/{DAV}prop/{DAV}version-name') if root is not None else None
+        if not revision or not revision.strip().isdigit():
+            raise ValueError('PROPFIND response has no version-name')
+        return {'revision': int(revision), 'path': self.relative_path()}
+
+    def list_directory(self, path, revision=None, properties=None, names=None):
+        """Return the entries of one directory with a Depth: 1 PROPFIND, sorted like `svn list`
+
+        Paths of the directory and of its entries are relative to the URL. When properties is a dict, the node
+        properties of every entry are read in the same request and stored in
+        it by path, limited to `names` when given.
+        """
+        request_path = self.server_path(path, revision).rstrip('/') + '/'
+        body = PROPERTIES_PROPFIND if properties is not None else LISTING_PROPFIND
+        for attempt in range(1, self.retries + 2):
+            try:
+                root = self.request('PROPFIND', request_path, body, {'Depth': '1'})
+                break
+            except (DavError, OSError, expat.ExpatError):
+                if attempt > self.retries:
+                    raise
+        prefix = self.server_path('', revision).rstrip('/') + '/'
+        entries = []
+        for response in root.iterfind(f'{DAV}response') if root is not None else ():
+            href = unquote(urlsplit(response.findtext(f'{DAV}href', '')).path)
+            if not href.startswith(prefix) or href.rstrip('/') == request_path.rstrip('/'):
+                continue
+            prop = {}
+            for propstat in response.iterfind(f'{DAV}propstat'):
+                found = propstat.find(f'{DAV}prop')
+                if found is not None and propstat.findtext(f'{DAV}status', '').split(' ')[1:2] == ['200']:
+                    prop.update((child.tag, child) for child in found)
+            is_dir = prop.get(f'{DAV}resourcetype') is not None and \
+                prop[f'{DAV}resourcetype'].find(f'{DAV}collection') is not None
+            relative = href[len(prefix):].rstrip('/') + ('/' if is_dir else '')
+
+            def text(name):
+                element = prop.get(name)
+                return (element.text or '').strip() if element is not None else ''
+
+            entries.append(ListingEntry(relative, text(f'{DAV}version-name'), text(f'{DAV}creator-displayname'),
+                                        '' if is_dir else text(f'{DAV}getcontentlength'),
+                                        text(f'{DAV}creationdate'), kind='dir' if is_dir else 'file'))
+            if properties is not None:
+                values = node_properties(prop.values(), names)
+                if values:
+                    properties[relative] = values
+        # svn sorts the entries of each directory by name
+        entries.sort(key=lambda entry: entry.path.rstrip('/'))
+        return entries
+
+    def iter_listing(self, path='', recursive=True, revision=None, properties=None, names=None, locks=None,
+                     descend=None):
+        """Yield the entries below path in `svn list -R` order, listing directories concurrently
+
+        Paths of the yielded entries are relative to path. Directories are
+        requested on up to `connections` connections in the order the walk
+        reaches them, at most DIRECTORIES_AHEAD per connection ahead of it;
+        a directory's subtree is yielded right after the directory itself.
+        properties and names are passed on to
+        list_directory(), and locks maps paths below the URL to lock owners.
+        When given, descend(directory path below the URL) decides whether a
+        directory's contents are listed at all.
+        """
+        if not self.opened:
+            self.open()
+        base = path.rstrip('/') + '/' if path else ''
+        executor = ThreadPoolExecutor(max_workers=self.connections)
+        futures = {}
+        # Directories found but not requested yet, in the order the walk reaches them
+        waiting = collections.deque()
+        ahead = self.connections * DIRECTORIES_AHEAD
+
+        def submit(directory):
+            futures[directory] = executor.submit(self.list_directory, directory, revision, properties, names)
+
+        def walk(directory):
+            if directory not in futures:
+                waiting.remove(directory)
+                submit(directory)
+            children = futures.pop(directory).result()
+            subtrees = []
+            if recursive:
+                subtrees = [child.path.rstrip('/') for child in children
+                            if child.path.endswith('/') and (descend is None or descend(child.path.rstrip('/')))]
+                # The walk reaches these before anything already waiting
+                waiting.extendleft(reversed(subtrees))
+            while waiting and len(futures) < ahead:
+                submit(waiting.popleft())
+            subtrees = set(subtrees)
+            for child in children:
+                subtree = child.path.rstrip('/')
+                if locks:
+                    child.lock_owner = locks.get(child.path, '')
+                child.path = child.path[len(base):]
+                yield child
+                if subtree in subtrees:
+                    yield from walk(subtree)
+
+        try:
+            submit(path.rstrip('/'))
+            yield from walk(path.rstrip('/'))
+        finally:
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def fetch_locks(self):
+        """Return {path below the URL: lock owner} for every lock with one get-locks REPORT"""
+        if not self.opened:
+            self.open()
+        root = self.request('REPORT', self.url_path + '/', LOCKS_REPORT)
+        relative = self.relative_path()
+        prefix = '/' if relative in (None, '/') else relative + '/'
+        locks = {}
+        for lock in root.iterfind(f'{SVN}lock') if root is not None else ():
+            path = unquote(lock.findtext(f'{SVN}path', ''))
+            if path.startswith(prefix):
+                locks[path[len(prefix):]] = lock.findtext(f'{SVN}owner', '')
+        return locks
+
+    def iter_log(self, start, end):
+        """Yield the revisions start..end with their changed paths, like iter_log_xml()"""
+        if not self.opened:
+            self.open()
+        body = LOG_REPORT.format(start=start, end=end)
+        root = self.request('REPORT', self.server_path('', end) + '/', body)
+        for item in root.iterfind(f'{SVN}log-item') if root is not None else ():
+            paths = []
+            for change in item:
+                action = LOG_ACTIONS.get(change.tag[len(SVN):]) if change.tag.startswith(SVN) else None
+                if action is None:
+                    continue
+                paths.append({
+                    'action': action,
+                    'kind': change.get('node-kind', ''),
+                    'path': change.text or '',
+                    'copyfrom_path': change.get('copyfrom-path'),
+                    'copyfrom_rev': change.get('copyfrom-rev')
+                })
+            yield {
+                'revision': item.findtext(f'{DAV}version-name', ''),
+                'author': item.findtext(f'{DAV}creator-displayname', ''),
+                'date': item.findtext(f'{SVN}date', ''),
+                'paths': paths
+            }
+
+    def abort(self):
+        """Cut the listing short: requests in progress fail right away instead of waiting for the server"""
+        self.pool.abort()
+        
+    def close(self):
+        self.pool.close()
+
+
+def parse_xml(data):
+    """Parse a DAV response into an element tree with '{namespace}name' tags
+
+    mod_dav_svn sends a custom property such as drawing:status as the
+    element C:drawing:status, which a namespace-aware XML parser rejects.
+    Prefixes are therefore resolved here at the first ':', as the svn
+    client itself does.
+    """
+    builder = ET.TreeBuilder()
+    scopes = [{}]
+
+    def resolve(name, scope, default=None):
+        prefix, colon, local = name.partition(':')
+        if not colon:
+            return f"{{{default}}}{name}" if default else name
+        namespace = scope.get(prefix)
+        return name if namespace is None else f"{{{namespace}}}{local}"
+
+    def start(name, attributes):
+        scope = dict(scopes[-1])
+        for key, value in attributes.items():
+            if key == 'xmlns' or key.startswith('xmlns:'):
+                scope[key[6:]] = value
+        scopes.append(scope)
+        builder.start(resolve(name, scope, scope.get('')), {
+            resolve(key, scope): value for key, value in attributes.items()
+            if key != 'xmlns' and not key.startswith('xmlns:')
+        })
+
+    def end(name):
+        scope = scopes.pop()
+        builder.end(resolve(name, scope, scope.get('')))
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = builder.data
+    parser.Parse(data, True)
+    return builder.close()
+
+
+def node_properties(elements, names=None):
+    """Map the property elements of a PROPFIND response to {svn property name: value}, keeping only names"""
+    values = {}
+    for element in elements:
+        if element.tag.startswith(SVN_PROPERTY_NS):
+            name = 'svn:' + element.tag[len(SVN_PROPERTY_NS):]
+        elif element.tag.startswith(CUSTOM_PROPERTY_NS):
+            name = element.tag[len(CUSTOM_PROPERTY_NS):]
+        else:
+            continue
+        if names is not None and name not in names:
+            continue
+        value = element.text or ''
+        if element.get(f'{SVN_DAV_NS}encoding') == 'base64':
+            value = base64.b64decode(value).decode('utf-8', errors='replace')
+        values[name] = value
+    return values
@@ -0,0 +1,145 @@
+import os
+import threading
+import openpyxl
+
+from exporters import StreamWriter
+
+# Excel's hard limit of rows per worksheet, including the header row
+EXCEL_MAX_ROWS = 1048576
+# openpyxl 3.1 streams each write-only sheet to a temp file of its own, removed only when the
+# workbook is saved or the interpreter exits. WorksheetWriter.cleanup() removes it earlier, but it
+# is not public API, so discard() only calls it on the versions known to work this way.
+SHEET_CLEANUP = openpyxl.__version__.split('.')[:2] == ['3', '1']
+
+
+def save_workbook(workbook, path):
+    """Save to a temporary file next to path that replaces it only once complete"""
+    temp_path = path + '.part'
+    try:
+        workbook.save(temp_path)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class ExcelWriter(StreamWriter):
+    """Streaming xlsx writer that appends rows to write-only worksheets
+    
+    Rows are serialized as they are appended instead of being kept as Cell
+    objects, and a new worksheet is started whenever the current one reaches
+    the row limit. Several writers can share one SharedWorkbook, each adding
+    its own sheets; the workbook is then saved by its owner.
+    """
+    
+    def __init__(self, path, headers, sheet_title="SVN File Information", max_rows=EXCEL_MAX_ROWS,
+                 shared_workbook=None):
+        super().__init__(path, headers)
+        self.sheet_title = sheet_title
+        self.max_rows = max_rows
+        self.shared_workbook = shared_workbook
+        self.workbook = shared_workbook.workbook if shared_workbook else openpyxl.Workbook(write_only=True)
+        self.sheets = []
+        self.sheet = None
+        self.sheet_count = 0
+        self.sheet_rows = 0
+        self.new_sheet()
+        
+    def new_sheet(self):
+        self.sheet_count += 1
+        suffix = '' if self.sheet_count == 1 else f" {self.sheet_count}"
+        # Worksheet titles are limited to 31 characters
+        title = self.sheet_title[:31 - len(suffix)] + suffix
+        if self.shared_workbook:
+            self.sheet = self.shared_workbook.create_sheet(title)
+        else:
+            self.sheet = self.workbook.create_sheet(title=title)
+        self.sheets.append(self.sheet)
+        self.sheet.append(self.headers)
+        self.sheet_rows = 1
+        
+    def write(self, row):
+        if self.sheet_rows >= self.max_rows:
+            self.new_sheet()
+        self.sheet.append(row)
+        self.sheet_rows += 1
+        self.rows += 1
+        
+    def add_sheet(self, title, headers, rows):
+        """Add a sheet holding the given rows after the listing sheets and return its title"""
+        title = title[:31]
+        if self.shared_workbook:
+            # Prefixed with this writer's title, shortened to keep the end of the title
+            prefix = self.sheet_title[:30 - len(title)]
+            sheet = self.shared_workbook.create_sheet(f"{prefix} {title}" if prefix else title)
+        else:
+            sheet = self.workbook.create_sheet(title=title)
+        self.sheets.append(sheet)
+        sheet.append(list(headers))
+        for row in rows:
+            sheet.append(row)
+        return sheet.title
+        
+    def close(self):
+        """Write the workbook to the temporary file"""
+        self.workbook.save(self.temp_path)
+        
+    def save(self):
+        # A shared workbook is saved once by its owner after all writers finish
+        if not self.shared_workbook:
+            super().save()
+        
+    def discard(self):
+        """Close the sheets of an export that will not be saved and remove their temp files"""
+        for sheet in self.sheets:
+            if not sheet.closed:
+                sheet.close()
+            if SHEET_CLEANUP and sheet._writer is not None:
+                try:
+                    sheet._writer.cleanup()
+                except (OSError, ValueError):
+                    # Already removed
+                    pass
+        if self.shared_workbook:
+            self.shared_workbook.remove_sheets(self.sheets)
+        else:
+            # Left behind when saving the workbook failed
+            self.remove_temp_file()
+        self.sheets.clear()
+
+
+class SharedWorkbook:
+    """A write-only workbook that several ExcelWriters fill from different threads"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.lock = threading.Lock()
+        
+    def create_sheet(self, title):
+        with self.lock:
+            titles = {sheet.title for sheet in self.workbook.worksheets}
+            unique = title
+            number = 2
+            while unique in titles:
+                suffix = f" ({number})"
+                unique = title[:31 - len(suffix)] + suffix
+                number += 1
+            return self.workbook.create_sheet(title=unique)
+        
+    def remove_sheets(self, sheets):
+        with self.lock:
+            for sheet in sheets:
+                if sheet in self.workbook.worksheets:
+                    self.workbook.remove(sheet)
+        
+    def order_sheets(self, sheets):
+        """Move the given sheets to the front of the workbook in this order"""
+        with self.lock:
+            sheets = [sheet for sheet in sheets if sheet in self.workbook.worksheets]
+            for position, sheet in enumerate(sheets):
+                self.workbook.move_sheet(sheet.title, position - self.workbook.index(sheet))
+        
+    def save(self):
+        save_workbook(self.workbook, self.path)
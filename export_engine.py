@@ -0,0 +1,1075 @@
+import logging
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from urllib.parse import unquote
+from dav_client import DEFAULT_CONNECTIONS, DavClient
+from export_metrics import ExportMetrics, metrics_path_for
+from exporters import FORMAT_NAMES, create_writer, format_for_path
+from external_sort import ExternalSorter
+from file_filter import FileFilter
+from line_decoder import LineDecoder, output_chain, svn_environment
+from listing_checkpoint import ListingCheckpoint, checkpoint_path_for, read_checkpoint_key
+from listing_delta import FullRelistRequired, ListingDelta
+from listing_entry import DirectoryTable, ListingEntry, human_size
+from listing_index import ListingIndex
+from listing_summary import ListingSummary
+from log_batcher import LogBatcher
+from process_tree import kill_process_tree, new_group_options
+from resource_usage import peak_memory_bytes
+from svn_xml import iter_list_xml, iter_log_xml, iter_properties_xml, parse_info
+
+EXPORT_HEADERS = ['File Name', 'Directory', 'Revision', 'Author', 'Commit Date']
+EXTENDED_HEADERS = ['Size', 'Size (readable)', 'Lock Owner', 'MIME Type']
+
+def revision_key(row):
+    return (int(row[2]) if row[2].isdigit() else 0, row[1], row[0])
+
+# Row orderings of the sort option; revisions are committed in date order, so 'date' sorts like 'revision'
+SORT_KEYS = {
+    'path': lambda row: (row[1], row[0]),
+    'revision': revision_key,
+    'author': lambda row: (row[3].casefold(), row[1], row[0]),
+    'date': revision_key
+}
+DEFAULT_SORT_MEMORY_MB = 256
+# Seconds an svn command may go without printing a line before it is stopped
+DEFAULT_COMMAND_TIMEOUT = 300
+# Ends the entries a worker hands over in list_ahead()
+LISTING_DONE = object()
+# Entries a subtree listed ahead of its turn may hold before its svn waits for the walk
+LISTING_AHEAD_ENTRIES = 1000
+
+class ExportCancelled(Exception):
+    """Raised inside a run once cancel() has been called"""
+
+class ExportEngine:
+    """Lists an SVN URL and writes the matching files to a spreadsheet or data file, without any Qt dependency
+    
+    Log lines and progress are delivered through the emit_logs(text) and
+    emit_progress(count) callbacks; the GUI connects them to Qt signals and
+    the command line prints them to stderr. cancel() may be called from any
+    thread and stops a run, and the svn processes it started, right away.
+    """
+    
+    def __init__(self, url, username, password, excel_path, filter_patterns=None, list_format='text',
+                 parallel_workers=1, subtree_retries=2, index_path=None, incremental=True,
+                 verify_incremental=False, incremental_max_calls=200, log_level=logging.INFO,
+                 emit_logs=None, emit_progress=None, writer_factory=None, output_format=None,
+                 write_metrics=False, extended_metadata=False, properties=None, backend='svn', revision=None,
+                 summary_sheets=False, result_store=None, sort_by=None, sort_memory_mb=DEFAULT_SORT_MEMORY_MB,
+                 command_timeout=DEFAULT_COMMAND_TIMEOUT, checkpoint=False):
+        self.url = url.rstrip('/')  # Remove trailing slash from URL
+        self.revision = revision  # Peg revision to list instead of HEAD
+        self.username = username
+        self.password = password
+        self.excel_path = excel_path
+        self.filter_patterns = filter_patterns or []
+        self.file_filter = FileFilter(self.filter_patterns)
+        # Extended metadata adds size, lock owner, MIME type and custom property columns
+        self.extended_metadata = extended_metadata
+        self.properties = [name for name in properties or [] if name != 'svn:mime-type']
+        # 'text' (--verbose) or 'xml' (--xml); only the XML listing carries lock owners
+        self.list_format = 'xml' if extended_metadata else list_format
+        self.parallel_workers = max(1, parallel_workers)  # 1 lists the whole tree in one call
+        self.subtree_retries = subtree_retries
+        self.index_path = index_path  # Listing cache database, None disables it
+        self.incremental = incremental  # Update an older cached listing from svn log
+        self.verify_incremental = verify_incremental  # Diff incremental results against a full listing
+        self.incremental_max_calls = incremental_max_calls
+        self.log_level = log_level  # logging.DEBUG adds a line per parsed entry
+        self.writer_factory = writer_factory  # Callable(headers) returning a writer, default create_writer
+        # 'xlsx', 'csv', 'jsonl' or 'parquet'; None picks it from the output file extension
+        self.output_format = output_format or format_for_path(excel_path, 'xlsx')
+        self.write_metrics = write_metrics  # Append each run's metrics to a JSON Lines file next to the output
+        # Add rollups by author, top-level directory, extension and recently changed directory
+        self.summary_sheets = summary_sheets
+        self.result_store = result_store  # Receives every written row, e.g. a ResultStore for the GUI
+        self.sort_by = sort_by  # A SORT_KEYS name, None keeps the listing order
+        self.sort_memory_mb = sort_memory_mb  # Rows beyond this are sorted in runs on disk
+        self.command_timeout = command_timeout  # Seconds without output before svn is stopped, None waits forever
+        # Journal the listing next to the output, so a failed or interrupted listing resumes where it stopped
+        self.checkpoint = checkpoint
+        self.listing_checkpoint = None  # The ListingCheckpoint of the current run
+        self.listing_revision = revision  # The revision listed: the peg revision, or the one a checkpoint is for
+        self.cancelled = threading.Event()
+        self.processes = set()  # svn processes that are running, killed by cancel()
+        self.process_lock = threading.RLock()  # cancel() may run in a signal handler on a thread holding it
+        # 'svn' runs the svn client; 'dav' lists http(s) URLs over WebDAV without it
+        self.backend = backend
+        self.dav = None  # DavClient while a 'dav' export runs
+        self.dav_properties = None  # Filled by the DAV listing as it streams, for extended metadata
+        self.dav_locks = None
+        self.metrics = ExportMetrics()
+        self.metrics_report = None  # Set when run() finishes
+        self.files_exported = 0
+        self.translations = {}  # Will be set by set_translations
+        # Log lines and progress are delivered in batches at most every 100 ms
+        self.batcher = LogBatcher(emit_logs or (lambda text: None), emit_progress or (lambda count: None))
+        
+    def set_translations(self, translations):
+        """Set the translations dictionary for the current language"""
+        self.translations = translations
+        
+    def tr(self, key, **kwargs):
+        """Translate the given key with format arguments"""
+        text = self.translations.get(key, key)
+        return text.format(**kwargs) if kwargs else text
+        
+    def log(self, message, level=logging.INFO):
+        if level >= self.log_level:
+            self.batcher.log(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+        
+    def finish(self, success, message):
+        """Report the run's metrics, deliver pending log lines and progress, then return the result"""
+        if self.dav is not None:
+            self.metrics.count('http_requests', self.dav.pool.requests)
+            self.metrics.count('http_connections', self.dav.pool.opened)
+            self.log(self.tr('log_dav_stats', requests=self.dav.pool.requests, connections=self.dav.pool.opened))
+            self.dav.close()
+            self.dav = None
+        self.metrics_report = self.metrics.report(
+            url=self.url,
+            output=self.excel_path,
+            format=self.output_format,
+            list_format=self.list_format,
+            backend=self.backend,
+            parallel_workers=self.parallel_workers,
+            extended_metadata=self.extended_metadata,
+            sort_by=self.sort_by,
+            success=success,
+            message=message
+        )
+        self.log_metrics(self.metrics_report)
+        if self.listing_checkpoint is not None:
+            if success:
+                self.listing_checkpoint.remove()
+            self.listing_checkpoint = None
+        if self.write_metrics:
+            path = metrics_path_for(self.excel_path)
+            try:
+                self.metrics.append_to(path, self.metrics_report)
+                self.log(self.tr('log_metrics_written', path=path))
+            except OSError as e:
+                self.log(self.tr('log_metrics_write_failed', error=str(e)))
+        self.batcher.stop()
+        return success, message
+        
+    def log_metrics(self, report):
+        stages = report['stages']
+        counts = report['counts']
+        first_byte = report['time_to_first_byte_seconds']
+        self.log(self.tr('log_metrics_stages',
+            first_byte='-' if first_byte is None else f"{first_byte:.2f}",
+            svn=f"{stages['svn']:.2f}",
+            parse=f"{stages['parse']:.2f}",
+            filter=f"{stages['filter']:.2f}",
+            write=f"{stages['write']:.2f}",
+            save=f"{stages['save']:.2f}",
+            total=f"{report['seconds']:.2f}"
+        ))
+        self.log(self.tr('log_metrics_counts',
+            lines=counts.get('lines_read', 0),
+            lines_rate=f"{report['lines_per_second']:,.0f}",
+            entries=counts.get('entries_parsed', 0),
+            filtered=counts.get('filtered_out', 0),
+            rows=counts.get('rows_written', 0),
+            memory=f"{report['peak_memory_bytes'] / (1024 * 1024):,.1f}"
+        ))
+        if counts.get('pruned_directories'):
+            self.log(self.tr('log_pruned_directories', count=counts['pruned_directories']))
+        
+    def cancel(self):
+        """Stop the run: kill its svn processes, abort its DAV requests and make it return as cancelled
+        
+        Safe to call from any thread.
+        """
+        self.cancelled.set()
+        with self.process_lock:
+            processes = list(self.processes)
+        for process in processes:
+            kill_process_tree(process)
+        dav = self.dav
+        if dav is not None:
+            dav.abort()
+            
+    def check_cancelled(self):
+        """Raise ExportCancelled once cancel() has been called"""
+        if self.cancelled.is_set():
+            raise ExportCancelled(self.tr('export_cancelled'))
+        
+    def command_text(self, command):
+        """Return an argument list as one command line for logging, with the password masked"""
+        return subprocess.list2cmdline(['******' if index and command[index - 1] == '--password' else arg
+                                        for index, arg in enumerate(command)])
+        
+    def is_file_matched(self, file_path):
+        return self.file_filter.matches(file_path)
+        
+    def parse_svn_line(self, line):
+        """Parse a single line of SVN output"""
+        try:
+            pattern = r'^\s*(\d+)\s+(\S+)\s+(?:(\d+)\s+)?([^\s]+ \d+(?:\s+\d+|\s+\d+:\d+))\s+(.+)$'
+            match = re.match(pattern, line.strip())
+            
+            if match:
+                groups = match.groups()
+                revision = groups[0]
+                author = groups[1]
+                size = groups[2] if groups[2] else ''
+                date_time = groups[3]
+                path = groups[4].strip()
+                
+                if self.log_level <= logging.DEBUG:
+                    self.log(self.tr('log_parse_result',
+                        revision=revision,
+                        author=author,
+                        size=size,
+                        date_time=date_time,
+                        path=path
+                    ), logging.DEBUG)
+                
+                # Date time is already merged in the date field
+                return ListingEntry(path, revision, author, size, date_time)
+        except Exception as e:
+            self.log(self.tr('log_parse_failed', line=line, error=str(e)))
+        return None
+        
+    def stream_svn_command(self, command, allow_empty=False):
+        """Run an SVN command, given as an argument list, and yield its stdout line by line as it arrives
+        
+        The arguments reach svn as they are, without a shell, so file names
+        and passwords are never interpreted. Output is read as bytes and
+        decoded line by line with LineDecoder, in the encodings svn writes for
+        the command, so a file name in an unexpected encoding affects only its
+        own line and the command never has to be run again. svn is stopped when it prints
+        nothing for command_timeout seconds; time the consumer spends on a
+        line does not count.
+        """
+        self.check_cancelled()
+        self.log(self.tr('log_executing_command', command=self.command_text(command)))
+        
+        self.metrics.count('svn_commands')
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            # Looked up on PATH like a shell would, so that an svn.bat launcher is found on Windows too
+            [shutil.which(command[0]) or command[0], *command[1:]],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=svn_environment(),
+            **new_group_options()
+        )
+        with self.process_lock:
+            self.processes.add(process)
+        if self.cancelled.is_set():
+            # cancel() ran before the process was registered
+            kill_process_tree(process)
+        
+        # Drain stderr in the background so a chatty server cannot block stdout
+        stderr_chunks = []
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()),
+            daemon=True
+        )
+        stderr_thread.start()
+        
+        # The watchdog kills svn once the deadline passes; it is None while the consumer has a line
+        deadline = [time.monotonic() + self.command_timeout if self.command_timeout else None]
+        timed_out = threading.Event()
+        done = threading.Event()
+        
+        def watchdog():
+            while not done.wait(min(1.0, self.command_timeout)):
+                if deadline[0] is not None and time.monotonic() >= deadline[0]:
+                    timed_out.set()
+                    kill_process_tree(process)
+                    return
+        
+        if self.command_timeout:
+            threading.Thread(target=watchdog, daemon=True).start()
+        
+        decoder = LineDecoder(output_chain('--xml' in command))
+        has_output = False
+        completed = False
+        try:
+            for raw in process.stdout:
+                if not has_output:
+                    self.metrics.first_byte(time.perf_counter() - started)
+                    has_output = True
+                if self.command_timeout:
+                    deadline[0] = None
+                    yield decoder.decode(raw.rstrip(b'\r\n'))
+                    deadline[0] = time.monotonic() + self.command_timeout
+                else:
+                    yield decoder.decode(raw.rstrip(b'\r\n'))
+            completed = True
+        finally:
+            done.set()
+            # Stop svn, and anything it started, if the consumer gave up before the listing finished
+            if not completed and process.poll() is None:
+                kill_process_tree(process)
+            process.stdout.close()
+            process.wait()
+            stderr_thread.join()
+            with self.process_lock:
+                self.processes.discard(process)
+            for encoding, count in decoder.fallbacks.items():
+                self.metrics.count(f'decoded_{encoding}', count)
+        
+        self.check_cancelled()
+        if timed_out.is_set():
+            self.log(self.tr('log_command_failed', code=process.returncode))
+            raise Exception(self.tr('error_command_timeout', seconds=f"{self.command_timeout:g}"))
+        
+        if decoder.fallbacks:
+            self.log(self.tr('log_decode_fallbacks',
+                count=sum(decoder.fallbacks.values()),
+                encodings=', '.join(f"{encoding} {count}" for encoding, count in decoder.fallbacks.items())
+            ))
+        
+        # Error messages are plain text, also for XML commands
+        stderr = LineDecoder(output_chain()).decode(b''.join(stderr_chunks))
+        if process.returncode != 0:
+            error_msg = stderr if stderr else "Unknown error"
+            self.log(self.tr('log_command_failed', code=process.returncode))
+            self.log(self.tr('log_error_message', error=error_msg))
+            raise Exception(self.tr('error_svn', error=error_msg))
+        
+        if not has_output and not stderr and not allow_empty:
+            self.log(self.tr('log_command_no_output'))
+            raise Exception(self.tr('error_no_output'))
+        
+        self.log(self.tr('log_command_success'))
+    
+    def parse_svn_lines(self, lines):
+        """Parse `svn list --verbose` lines, skipping those that do not match"""
+        for line in lines:
+            if not line or not line.strip():
+                continue
+            
+            parsed = self.parse_svn_line(line)
+            if parsed:
+                yield parsed
+    
+    def parse_svn_xml(self, lines):
+        """Parse `svn list --xml` output incrementally as it arrives"""
+        try:
+            for parsed in iter_list_xml(line + '\n' for line in lines):
+                if self.log_level <= logging.DEBUG:
+                    self.log(self.tr('log_parse_result',
+                        revision=parsed.revision,
+                        author=parsed.author,
+                        size=parsed.size,
+                        date_time=parsed.date,
+                        path=parsed.path
+                    ), logging.DEBUG)
+                yield parsed
+        except ET.ParseError as e:
+            raise Exception(self.tr('error_xml_parse', error=str(e)))
+    
+    def peg(self, url):
+        """Return url pinned to the export's revision, if one is set"""
+        return f"{url}@{self.listing_revision}" if self.listing_revision else url
+    
+    def pin_revision(self):
+        """Pin the listing to the URL's current revision before it is split across several svn calls
+        
+        Every subtree call, and every retry of one, then lists the same tree
+        even if a commit lands while the export runs.
+        """
+        if not self.listing_revision:
+            self.listing_revision = self.fetch_info()['revision']
+    
+    def svn_command(self, subcommand, url, *args):
+        """Build the argument list of an svn command on url with the export's credentials"""
+        return ['svn', subcommand, url, '--username', self.username, '--password', self.password, *args]
+    
+    def list_command(self, url, depth_args):
+        """Build an `svn list` command for the configured output format"""
+        format_arg = '--xml' if self.list_format == 'xml' else '--verbose'
+        return self.svn_command('list', url, *depth_args.split(), format_arg)
+    
+    def parse_listing(self, command, allow_empty=False):
+        """Stream an `svn list` command through the parser for its format"""
+        if self.list_format == 'xml':
+            lines = self.metrics.timed('svn', self.stream_svn_command(command), 'lines_read')
+            parsed_entries = self.parse_svn_xml(lines)
+        else:
+            lines = self.metrics.timed('svn', self.stream_svn_command(command, allow_empty=allow_empty), 'lines_read')
+            parsed_entries = self.parse_svn_lines(lines)
+        return self.metrics.timed('parse', parsed_entries, 'entries_parsed')
+    
+    def list_subtree(self, path, depth_args='-R'):
+        """Yield the entries of one subtree as svn lists them, retrying only that subtree on failure
+        
+        The listing is pinned to listing_revision, so a retry lists the same
+        entries in the same order and skips as many as the failed attempt
+        already yielded.
+        """
+        url = f"{self.url}/{path.rstrip('/')}" if path else self.url
+        if self.listing_revision:
+            url = self.peg(url)
+        elif '@' in path:
+            # Stop svn from reading the '@' in the name as a peg revision
+            url += '@'
+        
+        yielded = 0
+        for attempt in range(1, self.subtree_retries + 2):
+            try:
+                listed = 0
+                for parsed in self.parse_listing(self.list_command(url, depth_args), allow_empty=True):
+                    if parsed.path.rstrip('/') in ('', '.'):
+                        continue
+                    listed += 1
+                    if listed <= yielded:
+                        continue
+                    parsed.path = path + parsed.path
+                    yielded += 1
+                    yield parsed
+                return
+            except ExportCancelled:
+                raise
+            except Exception as e:
+                if attempt > self.subtree_retries:
+                    raise Exception(self.tr('error_subtree_failed', path=path, error=str(e)))
+                self.log(self.tr('log_subtree_retry', path=path, attempt=attempt, error=str(e)))
+    
+    def list_ahead(self, executor, path, depth_args, stopped):
+        """Start list_subtree(path) on executor and return an iterator over its entries
+        
+        The worker hands entries over through a queue of at most
+        LISTING_AHEAD_ENTRIES as svn lists them; once the queue is full it
+        waits for the walk to reach the subtree, and stops, with its svn,
+        once stopped is set. A subtree no worker has started on when the
+        walk reaches it is listed by the walk itself.
+        """
+        entries = queue.Queue(maxsize=LISTING_AHEAD_ENTRIES)
+        claimed = threading.Lock()
+        
+        def hand_over(item):
+            while not stopped.is_set():
+                try:
+                    entries.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def produce():
+            if not claimed.acquire(blocking=False):
+                return
+            try:
+                for parsed in self.list_subtree(path, depth_args):
+                    if not hand_over(parsed):
+                        return
+            except Exception as e:
+                hand_over(e)
+            finally:
+                hand_over(LISTING_DONE)
+        
+        def consume():
+            if claimed.acquire(blocking=False):
+                # All workers are busy with, or waiting on, subtrees further ahead
+                yield from self.list_subtree(path, depth_args)
+                return
+            while True:
+                item = entries.get()
+                if item is LISTING_DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        
+        executor.submit(produce)
+        return consume()
+    
+    def parse_parallel(self):
+        """List the top level, then list each top-level directory concurrently
+        
+        Entries are yielded in listing order: each directory's subtree follows
+        the directory itself, whichever worker finishes first.
+        """
+        self.pin_revision()
+        top_level = [
+            parsed for parsed in self.parse_listing(self.list_command(self.peg(self.url), '--depth immediates'))
+            if parsed.path.rstrip('/') not in ('', '.')
+        ]
+        subtrees = [parsed.path for parsed in top_level if parsed.path.endswith('/')]
+        self.log(self.tr('log_parallel_listing', count=len(subtrees), workers=self.parallel_workers))
+        
+        executor = ThreadPoolExecutor(max_workers=self.parallel_workers)
+        stopped = threading.Event()
+        try:
+            listings = {path: self.list_ahead(executor, path, '-R', stopped) for path in subtrees}
+            for parsed in top_level:
+                yield parsed
+                listing = listings.pop(parsed.path, None)
+                if listing is not None:
+                    yield from listing
+        finally:
+            stopped.set()
+            executor.shutdown(wait=True)
+    
+    def parse_pruned(self, path=''):
+        """List the tree below path level by level, never listing a directory the path filters exclude
+        
+        Each directory is listed with `--depth immediates` while the filters
+        may still exclude something below it, and with a single recursive
+        call once they cannot. Directories are listed on parallel_workers
+        threads as soon as their parent has been listed, and entries are
+        yielded in `svn list -R` order.
+        """
+        self.pin_revision()
+        executor = ThreadPoolExecutor(max_workers=self.parallel_workers)
+        stopped = threading.Event()
+        listings = {}
+        pruned = 0
+        
+        def submit(path):
+            recursive = not self.file_filter.may_exclude_below(path.rstrip('/'))
+            listings[path] = (recursive, self.list_ahead(executor, path, '-R' if recursive else '--depth immediates',
+                                                         stopped))
+        
+        def walk(path):
+            nonlocal pruned
+            recursive, listing = listings.pop(path)
+            if recursive:
+                yield from listing
+                return
+            children = list(listing)
+            for child in children:
+                if child.path.endswith('/'):
+                    if self.file_filter.excludes_directory(child.path.rstrip('/')):
+                        pruned += 1
+                    else:
+                        submit(child.path)
+            for child in children:
+                yield child
+                if child.path in listings:
+                    yield from walk(child.path)
+        
+        try:
+            submit(path)
+            yield from walk(path)
+        finally:
+            stopped.set()
+            executor.shutdown(wait=True)
+            self.metrics.count('pruned_directories', pruned)
+    
+    def fetch_info(self):
+        """Return the last changed revision and repository path of the URL with one `svn info` call"""
+        if self.dav is not None:
+            return self.dav.info(self.listing_revision)
+        command = self.svn_command('info', self.peg(self.url), '--xml')
+        output = ''.join(line + '\n' for line in self.stream_svn_command(command))
+        return parse_info(output)
+    
+    def current_revision(self):
+        """Return the last changed revision of the URL with one `svn info` call, outside of a run"""
+        self.start()
+        try:
+            self.open_backend()
+            return self.fetch_info()['revision']
+        finally:
+            if self.dav is not None:
+                self.dav.close()
+                self.dav = None
+            self.batcher.stop()
+    
+    def fetch_properties(self):
+        """Return the svn:mime-type and requested properties of every file with one recursive call
+        
+        `svn proplist -R -v --xml` returns all properties of the tree at
+        once, so any number of custom properties costs a single call. It is
+        pegged to listing_revision, which run() pins beforehand. The
+        result maps listing paths to {name: value} and only holds paths
+        that have at least one of the wanted properties.
+        """
+        names = {'svn:mime-type', *self.properties}
+        if self.dav is not None:
+            # Node properties come with each directory's PROPFIND and are added here while the listing streams
+            self.dav_locks = self.dav.fetch_locks()
+            self.dav_properties = {}
+            self.log(self.tr('log_locks_fetched', count=len(self.dav_locks)))
+            return self.dav_properties
+        command = self.svn_command('proplist', self.peg(self.url), '-R', '-v', '--xml')
+        prefix = unquote(self.url) + '/'
+        properties = {}
+        try:
+            lines = self.stream_svn_command(command, allow_empty=True)
+            for target, values in iter_properties_xml((line + '\n' for line in lines), names):
+                target = unquote(target)
+                if target.startswith(prefix):
+                    properties[target[len(prefix):]] = values
+        except ET.ParseError as e:
+            raise Exception(self.tr('error_xml_parse', error=str(e)))
+        self.metrics.count('properties_read', len(properties))
+        self.log(self.tr('log_properties_fetched', count=len(properties)))
+        return properties
+    
+    def export_headers(self):
+        """Return the column headers of the export"""
+        if not self.extended_metadata:
+            return list(EXPORT_HEADERS)
+        return EXPORT_HEADERS + EXTENDED_HEADERS + self.properties
+    
+    def dav_listing(self, path='', recursive=True, revision=None, prune=False):
+        """List over WebDAV; time spent waiting for the server counts as the svn stage"""
+        names = {'svn:mime-type', *self.properties} if self.dav_properties is not None else None
+        descend = None
+        if prune and self.file_filter.may_exclude_below(''):
+            descend = lambda directory: not self.file_filter.excludes_directory(directory)
+        entries = self.dav.iter_listing(path, recursive, revision or self.listing_revision, self.dav_properties,
+                                        names, self.dav_locks, descend)
+        return self.metrics.timed('parse', self.metrics.timed('svn', entries), 'entries_parsed')
+    
+    def list_repository(self, prune=True):
+        """Run the configured listing strategy and return its parsed entries
+        
+        With prune, subtrees the path filters exclude are left out of the listing.
+        """
+        if self.dav is not None:
+            return self.dav_listing(prune=prune)
+        if prune and self.file_filter.may_exclude_below(''):
+            self.log(self.tr('log_pruned_listing'))
+            return self.parse_pruned()
+        if self.parallel_workers > 1:
+            return self.parse_parallel()
+        return self.parse_listing(self.list_command(self.peg(self.url), '-R'))
+    
+    def list_children(self, path):
+        """Return the entries directly inside directory path, with paths relative to the URL"""
+        if self.dav is None:
+            return list(self.list_subtree(path, '--depth immediates'))
+        entries = list(self.dav_listing(path, recursive=False))
+        for entry in entries:
+            entry.path = path + entry.path
+        return entries
+    
+    def list_below(self, path, prune):
+        """Yield the entries below directory path, with paths relative to the URL"""
+        directory = path.rstrip('/')
+        if prune and self.file_filter.excludes_directory(directory):
+            self.metrics.count('pruned_directories')
+            return
+        if self.dav is not None:
+            for entry in self.dav_listing(path, prune=prune):
+                entry.path = path + entry.path
+                yield entry
+        elif prune and self.file_filter.may_exclude_below(directory):
+            yield from self.parse_pruned(path)
+        else:
+            yield from self.list_subtree(path)
+    
+    def list_remaining(self, last_path, prune):
+        """Yield the entries that follow last_path in `svn list -R` order
+        
+        These are the subtree of last_path when it is a directory, then, for
+        each directory holding last_path from the deepest up, the entries
+        after it and their subtrees. Nothing before last_path is listed again.
+        """
+        if last_path.endswith('/'):
+            yield from self.list_below(last_path, prune)
+        names = last_path.rstrip('/').split('/')
+        for depth in range(len(names) - 1, -1, -1):
+            parent = ''.join(name + '/' for name in names[:depth])
+            current = parent + names[depth]
+            following = False
+            for entry in self.list_children(parent):
+                if following:
+                    yield entry
+                    if entry.path.endswith('/'):
+                        yield from self.list_below(entry.path, prune)
+                elif entry.path.rstrip('/') == current:
+                    following = True
+    
+    def checkpoint_key(self, revision, prune):
+        """Return what identifies a listing; a checkpoint of another listing is not resumed"""
+        return {
+            'url': self.url,
+            'revision': revision,
+            'username': self.username,
+            'backend': self.backend,
+            'list_format': self.list_format,
+            'properties': sorted({'svn:mime-type', *self.properties}) if self.dav_properties is not None else None,
+            # A pruned listing only holds what these filters can match
+            'filters': self.filter_patterns if prune else None
+        }
+    
+    def checkpoint_revision(self, revision, prune):
+        """Return the revision a checkpointed listing is pinned to
+        
+        Unless the export asks for a revision of its own, a checkpoint left
+        by an earlier run of the same listing is continued at the revision it
+        was listed at, however many commits came since. Otherwise the listing
+        is pinned to revision, or to the URL's current revision.
+        """
+        if self.revision is None:
+            key = read_checkpoint_key(checkpoint_path_for(self.excel_path))
+            if isinstance(key, dict) and key == self.checkpoint_key(key.get('revision'), prune):
+                return key['revision']
+        return revision if revision is not None else self.fetch_info()['revision']
+    
+    def resumable_listing(self, revision=None):
+        """Yield the entries of list_repository(), continuing the listing's checkpoint when enabled
+        
+        The listing is pinned to one revision, see checkpoint_revision(), so
+        that entries listed by separate attempts fit together, and recorded
+        as it streams. When it fails, only what follows the last entry is
+        listed again, up to subtree_retries times, and a later run of the
+        same export continues from the checkpoint on disk.
+        """
+        if not self.checkpoint:
+            yield from self.list_repository()
+            return
+        prune = self.file_filter.may_exclude_below('')
+        revision = self.checkpoint_revision(revision, prune)
+        self.listing_revision = revision
+        checkpoint = ListingCheckpoint(checkpoint_path_for(self.excel_path), self.checkpoint_key(revision, prune))
+        try:
+            checkpoint.open()
+        except OSError as e:
+            self.log(self.tr('log_checkpoint_unavailable', error=str(e)))
+            yield from self.list_repository()
+            return
+        self.listing_checkpoint = checkpoint
+        try:
+            if checkpoint.count:
+                self.log(self.tr('log_checkpoint_resumed', count=checkpoint.count, path=checkpoint.path,
+                                 revision=revision))
+                self.metrics.count('checkpoint_entries', checkpoint.count)
+                for entry, values in checkpoint.replay():
+                    if values and self.dav_properties is not None:
+                        self.dav_properties[entry.path] = values
+                    yield entry
+            if checkpoint.complete:
+                return
+            
+            last_path = checkpoint.last_path
+            source = self.list_remaining(last_path, prune) if last_path else self.list_repository()
+            attempt = 0
+            while True:
+                # Only failures of the listing itself are retried, not those of the consumer
+                try:
+                    entry = next(source, None)
+                except ExportCancelled:
+                    raise
+                except Exception as e:
+                    self.check_cancelled()
+                    attempt += 1
+                    if attempt > self.subtree_retries:
+                        raise
+                    self.log(self.tr('log_checkpoint_retry', path=last_path or '/', attempt=attempt, error=str(e)))
+                    source = self.list_remaining(last_path, prune) if last_path else self.list_repository()
+                    continue
+                if entry is None:
+                    break
+                if entry.path.rstrip('/') not in ('', '.'):
+                    values = self.dav_properties.get(entry.path) if self.dav_properties is not None else None
+                    checkpoint.append(entry, values)
+                    last_path = entry.path
+                yield entry
+            checkpoint.finish()
+        finally:
+            checkpoint.close()
+    
+    def refresh_incremental(self, cached_entries, base_path, from_revision, to_revision):
+        """Update a cached listing to to_revision from the `svn log -v` of the revisions since"""
+        delta = ListingDelta(cached_entries, base_path)
+        if self.dav is not None:
+            log_entries = self.dav.iter_log(from_revision + 1, to_revision)
+        else:
+            command = self.svn_command('log', f"{self.url}@{to_revision}", '-v', '--xml',
+                                      '-r', f"{from_revision + 1}:{to_revision}")
+            log_entries = iter_log_xml(line + '\n' for line in self.stream_svn_command(command))
+        for log_entry in log_entries:
+            delta.apply_log_entry(log_entry)
+        
+        relists = delta.pending_relists()
+        if len(relists) > self.incremental_max_calls:
+            raise FullRelistRequired(self.tr('log_incremental_too_many', count=len(relists)))
+        self.log(self.tr('log_incremental_relists', count=len(relists)))
+        for path, recursive in relists:
+            if self.dav is not None:
+                delta.apply_listing(path, recursive, self.dav_listing(path, recursive, to_revision))
+                continue
+            # Peg to the indexed revision so later commits cannot leak in
+            url = f"{self.url}/{path}@{to_revision}" if path else f"{self.url}@{to_revision}"
+            depth_args = '-R' if recursive else '--depth immediates'
+            delta.apply_listing(path, recursive,
+                                self.parse_listing(self.list_command(url, depth_args), allow_empty=True))
+        return delta.iter_entries()
+    
+    def verify_listing(self, parsed_entries):
+        """Diff an incrementally updated listing against a full listing of the URL"""
+        actual = {parsed.path: parsed for parsed in parsed_entries}
+        expected = {
+            parsed.path: parsed for parsed in self.list_repository(prune=False)
+            if parsed.path.rstrip('/') not in ('', '.')
+        }
+        mismatched = sorted(
+            path for path in actual.keys() | expected.keys()
+            if path not in actual or path not in expected
+            or actual[path].fields() != expected[path].fields()
+        )
+        if mismatched:
+            self.log(self.tr('log_incremental_mismatch', count=len(mismatched), paths=', '.join(mismatched[:5])))
+            return expected.values()
+        self.log(self.tr('log_incremental_verified', count=len(expected)))
+        return actual.values()
+    
+    def iter_listing(self):
+        """Yield parsed entries, served or updated from the listing index when possible"""
+        if self.index_path and self.extended_metadata:
+            # Locks are not versioned, so a cached listing cannot tell who holds them now
+            self.log(self.tr('log_index_skipped_extended'))
+        if not self.index_path or self.extended_metadata:
+            yield from self.resumable_listing()
+            return
+        
+        self.log(self.tr('log_checking_revision', url=self.url))
+        try:
+            info = self.fetch_info()
+            revision = info['revision']
+            index = ListingIndex(self.index_path)
+        except Exception as e:
+            self.log(self.tr('log_index_unavailable', error=str(e)))
+            yield from self.resumable_listing()
+            return
+        
+        try:
+            cached = index.find(self.url, self.username, self.list_format)
+            if cached and cached[1] == revision:
+                self.log(self.tr('log_index_hit', revision=revision))
+                self.metrics.listing_source = 'index'
+                yield from index.iter_entries(cached[0])
+                return
+            if cached and cached[1] > revision:
+                # An older revision was asked for; keep the newer cached listing for later exports
+                self.log(self.tr('log_index_newer', revision=revision, cached_revision=cached[1]))
+                yield from self.resumable_listing(revision)
+                return
+            
+            parsed_entries = None
+            if cached and self.incremental and cached[1] < revision and info['path'] is not None:
+                self.log(self.tr('log_incremental_refresh', from_revision=cached[1], to_revision=revision))
+                try:
+                    parsed_entries = self.refresh_incremental(index.iter_entries(cached[0]), info['path'],
+                                                              cached[1], revision)
+                    self.metrics.listing_source = 'incremental'
+                    if self.verify_incremental:
+                        parsed_entries = self.verify_listing(parsed_entries)
+                except FullRelistRequired as e:
+                    self.log(self.tr('log_incremental_unavailable', reason=str(e)))
+            if parsed_entries is None:
+                self.log(self.tr('log_index_miss', revision=revision))
+                if self.file_filter.may_exclude_below(''):
+                    # A listing without the excluded subtrees would be wrong for other filters
+                    self.log(self.tr('log_index_not_recorded_pruned'))
+                    yield from self.resumable_listing(revision)
+                    return
+                if self.checkpoint:
+                    # An interrupted listing continues at its own revision, which the index then records
+                    revision = self.checkpoint_revision(revision, False)
+                parsed_entries = self.resumable_listing(revision)
+            yield from index.record(self.url, self.username, self.list_format, revision, parsed_entries)
+        finally:
+            index.close()
+    
+    def iter_files(self, parsed_entries):
+        """Yield the parsed entries of files that pass the filter, counting what is skipped"""
+        skipped_dirs = filtered_out = 0
+        try:
+            for parsed in parsed_entries:
+                self.check_cancelled()
+                path = parsed.path
+                if path.endswith('/'):
+                    skipped_dirs += 1
+                    continue
+                    
+                # Check if file matches filter
+                if not self.is_file_matched(path):
+                    filtered_out += 1
+                    continue
+                yield parsed
+        finally:
+            self.metrics.count('directories', skipped_dirs)
+            self.metrics.count('filtered_out', filtered_out)
+    
+    def iter_entries(self, parsed_entries, properties=None, summary=None):
+        """Filter parsed listing entries and shape them into export rows
+        
+        Rows hold the file name, directory URL, revision, author and commit
+        date. Directory URLs come from a DirectoryTable, so each one is built
+        once and shared by all rows of that directory. With extended metadata
+        each row also gets the size, lock owner and properties of its file,
+        joined by path from the properties of fetch_properties(). Each file
+        is also added to `summary`, a ListingSummary, when one is given.
+        """
+        directories = DirectoryTable(self.url)
+        if properties is None:
+            properties = {}
+        no_properties = {}
+        for parsed in self.iter_files(parsed_entries):
+            path = parsed.path
+            dir_path, _, file_name = path.rpartition('/')
+            directory = directories.url_for(dir_path)
+            if summary is not None:
+                summary.add(parsed, directory)
+            row = [
+                file_name,
+                directory,
+                parsed.revision,
+                parsed.author,
+                f"{parsed.date} {parsed.time}"
+            ]
+            if self.extended_metadata:
+                values = properties.get(path, no_properties)
+                size = parsed.size
+                row += [int(size) if size.isdigit() else size, human_size(size), parsed.lock_owner,
+                        values.get('svn:mime-type', '')]
+                row += [values.get(name, '') for name in self.properties]
+            yield row
+            
+    def sort_rows(self, rows):
+        """Yield rows in sort_by order, with an external merge sort bounded by sort_memory_mb"""
+        sorter = ExternalSorter(SORT_KEYS[self.sort_by], self.sort_memory_mb * 1024 * 1024)
+        try:
+            count = 0
+            for row in rows:
+                self.check_cancelled()
+                sorter.add(row)
+                count += 1
+                self.batcher.progress(count)
+            self.metrics.count('sort_runs', len(sorter.runs))
+            self.log(self.tr('log_sorting', count=count, column=self.sort_by, runs=len(sorter.runs)))
+            yield from sorter.sorted_rows()
+        finally:
+            sorter.close()
+            
+    def write_summary(self, summary, writer):
+        """Write the summary tables as sheets of the workbook, or as files next to other formats"""
+        written = summary.write(writer, self.excel_path,
+                                lambda path, headers: create_writer(path, headers, self.output_format))
+        self.log(self.tr('log_summary_written', tables=', '.join(written)))
+            
+    def start(self):
+        """Reset the run state and start delivering log lines; finish() ends the run"""
+        self.metrics = ExportMetrics()
+        self.dav_properties = self.dav_locks = None
+        self.listing_revision = self.revision
+        self.listing_checkpoint = None
+        self.batcher.start()
+        
+    def open_backend(self):
+        """Check the URL and connect the listing backend"""
+        if not self.url.startswith(('http://', 'https://', 'svn://', 'file:///')):
+            raise Exception(self.tr('error_invalid_url'))
+        if self.backend == 'dav':
+            if not self.url.startswith(('http://', 'https://')):
+                raise Exception(self.tr('error_dav_url'))
+            connections = self.parallel_workers if self.parallel_workers > 1 else DEFAULT_CONNECTIONS
+            self.dav = DavClient(self.url, self.username, self.password, connections, self.subtree_retries,
+                                 self.command_timeout or None)
+            if self.cancelled.is_set():
+                # cancel() ran before the client was created
+                self.dav.abort()
+            self.log(self.tr('log_dav_listing', connections=connections))
+            
+    def run(self):
+        """Run the export and return (success, message)"""
+        self.start()
+        try:
+            self.log(self.tr('log_starting_export'))
+            
+            try:
+                self.open_backend()
+                properties = None
+                if self.extended_metadata:
+                    self.log(self.tr('log_extended_metadata'))
+                    with self.metrics.stage('properties'):
+                        if self.dav is None:
+                            # Read the properties of the same tree the listing is then pinned to
+                            if self.checkpoint:
+                                self.listing_revision = self.checkpoint_revision(
+                                    None, self.file_filter.may_exclude_below(''))
+                            self.pin_revision()
+                        properties = self.fetch_properties()
+                parsed_entries = self.metrics.timed('listing', self.iter_listing())
+                
+                format_name = FORMAT_NAMES[self.output_format]
+                self.log(self.tr('log_creating_excel', format=format_name))
+                headers = self.export_headers()
+                try:
+                    if self.writer_factory:
+                        writer = self.writer_factory(headers)
+                    else:
+                        writer = create_writer(self.excel_path, headers, self.output_format)
+                except ImportError as e:
+                    raise Exception(self.tr('error_missing_package', format=format_name, package=e.name))
+                
+                # Rows are written while svn is still listing, or merged from sorted runs once it is done
+                count = 0
+                summary = ListingSummary() if self.summary_sheets else None
+                try:
+                    with self.metrics.stage('write'):
+                        rows = self.metrics.timed('filter', self.iter_entries(parsed_entries, properties, summary),
+                                                  'rows_written')
+                        if self.sort_by:
+                            rows = self.metrics.timed('sort', self.sort_rows(rows))
+                        for row in rows:
+                            self.check_cancelled()
+                            writer.write(row)
+                            if self.result_store is not None:
+                                self.result_store.append(row)
+                            count += 1
+                            if not self.sort_by:
+                                self.batcher.progress(count)
+                    self.log(self.tr('log_file_list_success'))
+                    
+                    if not count:
+                        raise Exception(self.tr('error_no_files'))
+                    
+                    self.log(self.tr('log_files_found', count=count))
+                    self.log(self.tr('log_saving_excel', format=format_name, path=self.excel_path))
+                    with self.metrics.stage('save'):
+                        if summary is not None:
+                            self.write_summary(summary, writer)
+                        writer.save()
+                except Exception:
+                    writer.discard()
+                    raise
+                self.log(self.tr('log_excel_saved', format=format_name))
+                stats = {
+                    'rows': writer.rows,
+                    'rate': f"{writer.rows_per_second:,.0f}",
+                    'memory': f"{peak_memory_bytes() / (1024 * 1024):,.1f}"
+                }
+                if hasattr(writer, 'sheet_count'):
+                    self.log(self.tr('log_excel_stats', sheets=writer.sheet_count, **stats))
+                else:
+                    self.log(self.tr('log_export_stats', **stats))
+                self.files_exported = count
+                return self.finish(True, self.tr('log_export_success', count=count, format=format_name))
+                
+            except ExportCancelled as e:
+                self.log(str(e))
+                return self.finish(False, str(e))
+            except Exception as e:
+                if self.cancelled.is_set():
+                    # Requests cut short by cancel() fail with errors of their own
+                    message = self.tr('export_cancelled')
+                    self.log(message)
+                    return self.finish(False, message)
+                self.log(self.tr('log_svn_failed', error=str(e)))
+                return self.finish(False, self.tr('error_svn', error=str(e)))
+            
+        except Exception as e:
+            self.log(self.tr('log_program_failed', error=str(e)))
+            return self.finish(False, self.tr('error_general', error=str(e))) 
\ No newline at end of file
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from resource_usage import peak_memory_bytes
+
+
+def metrics_path_for(output_path):
+    """Return the metrics history file kept next to an export output"""
+    return os.path.splitext(output_path)[0] + '_metrics.jsonl'
+
+
+class ExportMetrics:
+    """Per-stage timers and counters of one export run
+
+    Stages of the streaming pipeline overlap, so each stage records the
+    time spent producing its items. Stages that pull from another stage
+    include it, and report() subtracts the inner stage again. Timers and
+    counters may be updated from the parallel listing threads; their
+    totals then add up the time of all threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.seconds = {}
+        self.counts = {}
+        self.time_to_first_byte = None
+        self.listing_source = 'svn'
+
+    def add(self, stage, seconds):
+        with self.lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def first_byte(self, seconds):
+        """Record the delay between starting svn and its first output line, once per run"""
+        with self.lock:
+            if self.time_to_first_byte is None:
+                self.time_to_first_byte = seconds
+
+    def timed(self, stage, iterable, counter=None):
+        """Yield from iterable, adding the time spent producing items to stage
+
+        The items are also counted under `counter` when it is given. Totals
+        are recorded once the iterable ends or is closed.
+        """
+        elapsed = 0.0
+        produced = 0
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    return
+                elapsed += time.perf_counter() - start
+                produced += 1
+                yield item
+        finally:
+            self.add(stage, elapsed)
+            if counter:
+                self.count(counter, produced)
+
+    @contextmanager
+    def stage(self, stage):
+        """Time a block of work as a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def report(self, **details):
+        """Return the metrics as a JSON-serializable dict, with details merged in"""
+        with self.lock:
+            seconds = dict(self.seconds)
+            counts = dict(self.counts)
+        total = time.perf_counter() - self.started
+
+        def stage(name, *inner):
+            return round(max(seconds.get(name, 0.0) - sum(seconds.get(other, 0.0) for other in inner), 0.0), 4)
+
+        stages = {
+            'properties': stage('properties'),
+            'svn': stage('svn'),
+            'parse': stage('parse', 'svn'),
+            'listing': stage('listing'),
+            'filter': stage('filter', 'listing'),
+            'sort': stage('sort', 'filter'),
+            'write': stage('write', 'sort' if 'sort' in seconds else 'filter'),
+            'save': stage('save')
+        }
+        lines = counts.get('lines_read', 0)
+        rows = counts.get('rows_written', 0)
+        read_seconds = seconds.get('parse', 0.0) or seconds.get('svn', 0.0)
+        report = {
+            'started': self.started_at,
+            'seconds': round(total, 4),
+            'time_to_first_byte_seconds': None if self.time_to_first_byte is None else round(self.time_to_first_byte, 4),
+            'listing_source': self.listing_source,
+            'stages': stages,
+            'counts': counts,
+            'lines_per_second': round(lines / read_seconds, 1) if read_seconds else 0.0,
+            'rows_per_second': round(rows / total, 1) if total else 0.0,
+            'peak_memory_bytes': peak_memory_bytes()
+        }
+        report.update(details)
+        return report
+
+    def append_to(self, path, report):
+        """Append a report as one line of a JSON Lines history file"""
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, ensure_ascii=False) + '\n')
@@ -0,0 +1,178 @@
+import csv
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+
+# Output file extension -> export format
+OUTPUT_FORMATS = {
+    '.xlsx': 'xlsx',
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.parquet': 'parquet'
+}
+
+FORMAT_NAMES = {
+    'xlsx': 'Excel',
+    'csv': 'CSV',
+    'jsonl': 'JSON Lines',
+    'parquet': 'Parquet'
+}
+
+
+def file_dialog_filters():
+    """Return the save dialog filters for every format, e.g. "Excel files (*.xlsx)" """
+    return [f"{FORMAT_NAMES[output_format]} files (*{extension})"
+            for extension, output_format in OUTPUT_FORMATS.items()]
+
+
+def format_for_path(path, default=None):
+    """Return the export format for an output path from its extension"""
+    return OUTPUT_FORMATS.get(os.path.splitext(path)[1].lower(), default)
+
+
+def create_writer(path, headers, output_format=None):
+    """Create the streaming writer for an output path
+
+    The format defaults to the one implied by the file extension, and to
+    xlsx when the extension is unknown.
+    """
+    output_format = output_format or format_for_path(path, 'xlsx')
+    if output_format == 'xlsx':
+        # openpyxl is only loaded when Excel output is actually written
+        from excel_writer import ExcelWriter
+        return ExcelWriter(path, headers)
+    writers = {'csv': CsvWriter, 'jsonl': JsonLinesWriter, 'parquet': ParquetWriter}
+    if output_format not in writers:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return writers[output_format](path, headers)
+
+
+class StreamWriter(ABC):
+    """Base class of the row writers used by the export, including ExcelWriter
+
+    A writer receives the header row up front and then one row per exported
+    file through write(). save() finishes the output and discard() drops an
+    export that failed. Subclasses write to a temporary file next to the
+    target that replaces it only on save, so a failed export never leaves a
+    truncated file behind.
+    """
+
+    def __init__(self, path, headers):
+        self.path = path
+        self.headers = list(headers)
+        self.temp_path = path + '.part'
+        self.rows = 0
+        self.start_time = time.perf_counter()
+
+    @abstractmethod
+    def write(self, row):
+        """Add one row after the rows written so far"""
+
+    @abstractmethod
+    def close(self):
+        """Flush and close the temporary file"""
+
+    def save(self):
+        self.close()
+        os.replace(self.temp_path, self.path)
+
+    def discard(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+        self.remove_temp_file()
+
+    def remove_temp_file(self):
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.perf_counter() - self.start_time
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+
+class CsvWriter(StreamWriter):
+    """Streaming CSV writer
+
+    The file is UTF-8 with a byte order mark so that Excel detects the
+    encoding of non-ASCII paths and author names.
+    """
+
+    def __init__(self, path, headers):
+        super().__init__(path, headers)
+        self.file = open(self.temp_path, 'w', encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.headers)
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.rows += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class JsonLinesWriter(StreamWriter):
+    """Streaming JSON Lines writer, one object per row keyed by the headers"""
+
+    def __init__(self, path, headers):
+        super().__init__(path, headers)
+        self.file = open(self.temp_path, 'w', encoding='utf-8', newline='\n')
+
+    def write(self, row):
+        self.file.write(json.dumps(dict(zip(self.headers, row)), ensure_ascii=False))
+        self.file.write('\n')
+        self.rows += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class ParquetWriter(StreamWriter):
+    """Streaming Parquet writer that buffers rows into row groups
+
+    Rows are collected column by column and written as one row group every
+    `row_group_size` rows, so memory use is bounded by the row group size
+    rather than the listing size. All columns are stored as strings.
+    Requires the optional pyarrow package.
+    """
+
+    def __init__(self, path, headers, row_group_size=100000):
+        super().__init__(path, headers)
+        import pyarrow
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(header, pyarrow.string()) for header in self.headers])
+        self.row_group_size = row_group_size
+        self.columns = [[] for _ in self.headers]
+        self.writer = pyarrow.parquet.ParquetWriter(self.temp_path, self.schema, compression='snappy')
+
+    def write(self, row):
+        for column, value in zip(self.columns, row):
+            column.append(None if value is None else str(value))
+        self.rows += 1
+        if len(self.columns[0]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if self.columns[0]:
+            self.writer.write_table(self.pyarrow.Table.from_arrays(self.columns, schema=self.schema))
+            self.columns = [[] for _ in self.headers]
+
+    def discard(self):
+        # Drop buffered rows instead of writing them as a last row group
+        self.columns = [[] for _ in self.headers]
+        super().discard()
+
+    def close(self):
+        if self.writer is not None:
+            try:
+                self.flush()
+            finally:
+                self.writer.close()
+                self.writer = None
@@ -0,0 +1,107 @@
+import heapq
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+# Rows are pickled to run files in chunks, and read back one chunk per run while merging
+CHUNK_ROWS = 4096
+# More runs than this are first merged into fewer, longer runs, to bound open files
+MAX_MERGE_RUNS = 64
+# Rows whose size is measured to estimate the memory the buffer holds
+SAMPLE_EVERY = 256
+
+
+def row_size(row):
+    """Estimate the memory of a row list and its values in bytes"""
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+class ExternalSorter:
+    """Sort more rows than fit in memory by spilling sorted runs to temporary files
+
+    Rows are buffered until their estimated size reaches `memory_bytes`;
+    the buffer is then sorted and written to a run file. sorted_rows()
+    merges the runs and the last buffer, reading each run one chunk at a
+    time, so memory stays near the budget however many rows there are.
+    The sort is stable: rows with equal keys keep the order they were added in.
+    """
+
+    def __init__(self, key, memory_bytes, temp_dir=None):
+        self.key = key
+        self.memory_bytes = memory_bytes
+        self.temp_dir = temp_dir
+        self.directory = None
+        self.runs = []  # Run file paths, in the order they were written
+        self.runs_written = 0
+        self.buffer = []
+        self.buffer_bytes = 0
+        self.average_row = 0
+        self.rows = 0
+
+    def add(self, row):
+        self.buffer.append(row)
+        self.rows += 1
+        if self.rows % SAMPLE_EVERY == 1:
+            size = row_size(row)
+            self.average_row = size if self.average_row == 0 else (self.average_row * 7 + size) / 8
+        self.buffer_bytes += self.average_row
+        if self.buffer_bytes >= self.memory_bytes:
+            self.spill()
+
+    def spill(self):
+        self.buffer.sort(key=self.key)
+        self.runs.append(self.write_run(self.buffer))
+        self.buffer = []
+        self.buffer_bytes = 0
+
+    def write_run(self, rows):
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix='svn_export_sort_', dir=self.temp_dir)
+        path = os.path.join(self.directory, f"run{self.runs_written}.bin")
+        self.runs_written += 1
+        with open(path, 'wb') as f:
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= CHUNK_ROWS:
+                    pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+                    chunk = []
+            if chunk:
+                pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def read_run(self, path):
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    break
+                yield from chunk
+        os.remove(path)
+
+    def sorted_rows(self):
+        """Yield all added rows in key order, then remove the temporary files"""
+        try:
+            self.buffer.sort(key=self.key)
+            if not self.runs:
+                yield from self.buffer
+                return
+            # Merge the oldest runs first, so equal keys keep their order
+            while len(self.runs) > MAX_MERGE_RUNS:
+                group, self.runs = self.runs[:MAX_MERGE_RUNS], self.runs[MAX_MERGE_RUNS:]
+                merged = self.write_run(heapq.merge(*map(self.read_run, group), key=self.key))
+                self.runs.insert(0, merged)
+            buffer, self.buffer = self.buffer, []
+            yield from heapq.merge(*map(self.read_run, self.runs), buffer, key=self.key)
+        finally:
+            self.close()
+
+    def close(self):
+        self.buffer = []
+        self.runs = []
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
@@ -0,0 +1,187 @@
+import re
+
+
+def glob_to_regex(pattern, path_scoped):
+    """Translate a wildcard pattern into an anchored regex body
+    
+    Path-scoped patterns keep `*` and `?` inside one path segment and use
+    `**` to cross directories; name patterns match anything with `*`.
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i) and path_scoped:
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*' if path_scoped else '.*')
+        elif char == '?':
+            parts.append('[^/]' if path_scoped else '.')
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return ''.join(parts)
+
+
+class PathPattern:
+    """A path-scoped pattern matched one directory level at a time, to decide which subtrees to list
+    
+    A segment containing `**` is treated like a whole `**` segment, which
+    can only make a directory look more likely to contain matches.
+    """
+    
+    def __init__(self, pattern):
+        self.segments = ['**' if '**' in segment else segment for segment in pattern.split('/')]
+        self.regexes = [None if segment == '**' else re.compile(glob_to_regex(segment, True), re.IGNORECASE)
+                        for segment in self.segments]
+        
+    def closure(self, states):
+        """Add the states reached by letting a `**` segment match no directory"""
+        pending = list(states)
+        while pending:
+            state = pending.pop()
+            if state < len(self.segments) and self.segments[state] == '**' and state + 1 not in states:
+                states.add(state + 1)
+                pending.append(state + 1)
+        return states
+        
+    def states(self, directory):
+        """Return the pattern positions reachable once the segments of directory are matched"""
+        states = self.closure({0})
+        for name in directory.split('/') if directory else ():
+            following = set()
+            for state in states:
+                if state == len(self.segments):
+                    continue
+                if self.segments[state] == '**':
+                    following.add(state)
+                elif self.regexes[state].fullmatch(name):
+                    following.add(state + 1)
+            states = self.closure(following)
+            if not states:
+                break
+        return states
+
+
+class PatternSet:
+    """A group of wildcard patterns compiled once for repeated matching
+    
+    A pattern without wildcards and without `/`, such as `dwg` or `.dwg`,
+    matches any path that contains it, as filters always have.
+    """
+    
+    # Plain `*.ext` patterns are answered with a set lookup instead of a regex
+    EXTENSION_PATTERN = re.compile(r'^\*\.([^*?/.\[\]]+)$')
+    
+    def __init__(self, patterns):
+        self.extensions = set()
+        self.substrings = []
+        name_regexes = []
+        path_regexes = []
+        self.path_patterns = []
+        # Patterns like `tags/**` cover whole directories; kept without the `/**` to match the directory
+        self.directory_patterns = []
+        
+        for pattern in patterns:
+            extension = self.EXTENSION_PATTERN.match(pattern)
+            if extension:
+                self.extensions.add(extension.group(1).lower())
+            elif '/' not in pattern and '*' not in pattern and '?' not in pattern:
+                self.substrings.append(pattern.lower())
+            elif '/' in pattern:
+                pattern = pattern.lstrip('/')
+                if pattern.endswith('/'):
+                    # A bare directory scopes everything below it
+                    pattern += '**'
+                path_regexes.append(glob_to_regex(pattern, True))
+                self.path_patterns.append(PathPattern(pattern))
+                if pattern.endswith('/**') and len(pattern) > 3:
+                    self.directory_patterns.append(PathPattern(pattern[:-3]))
+            else:
+                name_regexes.append(glob_to_regex(pattern, False))
+        
+        self.name_regex = self.combine(name_regexes)
+        self.path_regex = self.combine(path_regexes)
+        self.empty = not (self.extensions or self.substrings or name_regexes or path_regexes)
+        self.path_only = not (self.extensions or self.substrings or name_regexes)
+        
+    @staticmethod
+    def combine(regexes):
+        if not regexes:
+            return None
+        return re.compile('|'.join(f'(?:{regex})' for regex in regexes), re.IGNORECASE)
+        
+    def matches(self, path, name):
+        if self.extensions:
+            dot = name.rfind('.')
+            if dot >= 0 and name[dot + 1:].lower() in self.extensions:
+                return True
+        if self.substrings:
+            lowered = path.lower()
+            if any(substring in lowered for substring in self.substrings):
+                return True
+        if self.name_regex is not None and self.name_regex.fullmatch(name):
+            return True
+        if self.path_regex is not None and self.path_regex.fullmatch(path):
+            return True
+        return False
+
+
+class FileFilter:
+    """Include/exclude file filter built from semicolon separated patterns
+    
+    - `*.dwg` matches file names by extension (case-insensitive)
+    - `report_??.xlsx` matches file names with wildcards
+    - `dwg` or `.dwg`, without wildcards, matches paths containing it
+    - `trunk/design/**/*.dwg` or `trunk/` matches paths relative to the URL
+    - a leading `!` turns any pattern into an exclusion, e.g. `!tags/`
+    
+    excludes_directory() and may_exclude_below() tell the lister which
+    subtrees cannot hold a matching file, so they are never listed.
+    """
+    
+    def __init__(self, patterns=None):
+        includes = []
+        excludes = []
+        for pattern in patterns or []:
+            pattern = pattern.strip().replace('\\', '/')
+            if pattern.startswith('!'):
+                if pattern[1:]:
+                    excludes.append(pattern[1:])
+            elif pattern:
+                includes.append(pattern)
+        self.includes = PatternSet(includes)
+        self.excludes = PatternSet(excludes)
+        
+    def matches(self, path):
+        name = path[path.rfind('/') + 1:]
+        if not self.excludes.empty and self.excludes.matches(path, name):
+            return False
+        return self.includes.empty or self.includes.matches(path, name)
+    
+    def excludes_directory(self, directory):
+        """Return whether no file below directory (a path without trailing slash) can match"""
+        for pattern in self.excludes.directory_patterns:
+            if len(pattern.segments) in pattern.states(directory):
+                return True
+        if self.includes.empty or not self.includes.path_only:
+            return False
+        return not any(state < len(pattern.segments)
+                       for pattern in self.includes.path_patterns for state in pattern.states(directory))
+    
+    def may_exclude_below(self, directory):
+        """Return whether excludes_directory() can be true for any directory below directory"""
+        for pattern in self.excludes.directory_patterns:
+            if any(state < len(pattern.segments) for state in pattern.states(directory)):
+                return True
+        if self.includes.empty or not self.includes.path_only:
+            return False
+        # Once a pattern has reached `**`, every directory below may hold a match
+        return not any(state < len(pattern.segments) and pattern.segments[state] == '**'
+                       for pattern in self.includes.path_patterns for state in pattern.states(directory))
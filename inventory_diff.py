@@ -0,0 +1,272 @@
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from batch_export import url_label
+from export_engine import ExportEngine
+from exporters import FORMAT_NAMES, create_writer, format_for_path
+from listing_delta import path_sort_key
+
+CHANGES = ('added', 'removed', 'modified')
+SHEET_TITLES = {'added': 'Added', 'removed': 'Removed', 'modified': 'Modified'}
+SIDE_HEADERS = ['Path', 'Revision', 'Author', 'Commit Date', 'Size']
+MODIFIED_HEADERS = ['Path', 'Old Revision', 'Old Author', 'Old Commit Date', 'Old Size',
+                    'New Revision', 'New Author', 'New Commit Date', 'New Size']
+
+# Entries are handed from the listing threads in chunks; a side that lists
+# faster than the other waits once QUEUE_CHUNKS chunks are buffered
+CHUNK_SIZE = 1000
+QUEUE_CHUNKS = 16
+
+
+class UnsortedListing(Exception):
+    """Raised when a listing is not in `svn list -R` order, so it cannot be merged"""
+
+
+def split_target(target):
+    """Split 'URL@REV' into (URL, revision); the revision is None for HEAD or without a peg"""
+    url, at, revision = target.rpartition('@')
+    if at and '://' in url and (revision.isdigit() or revision.upper() == 'HEAD'):
+        return url, int(revision) if revision.isdigit() else None
+    return target, None
+
+
+def ordered(entries):
+    """Yield (sort key, entry), checking that the entries are in `svn list -R` order"""
+    previous = None
+    for parsed in entries:
+        key = path_sort_key(parsed.path)
+        if previous is not None and key <= previous:
+            raise UnsortedListing(parsed.path)
+        previous = key
+        yield key, parsed
+
+
+def diff_listings(old_entries, new_entries):
+    """Merge two file listings by path and yield (change, old entry, new entry)
+
+    change is 'added', 'removed', 'modified' or 'unchanged'; a file is
+    modified when its last changed revision or size differs. Every listing
+    source yields entries in `svn list -R` order, so walking both listings
+    side by side joins them in one pass while holding a single entry of
+    each, however large they are.
+    """
+    old_iter = ordered(old_entries)
+    new_iter = ordered(new_entries)
+    old = next(old_iter, None)
+    new = next(new_iter, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            yield 'removed', old[1], None
+            old = next(old_iter, None)
+        elif old is None or new[0] < old[0]:
+            yield 'added', None, new[1]
+            new = next(new_iter, None)
+        else:
+            changed = old[1].revision != new[1].revision or old[1].size != new[1].size
+            yield 'modified' if changed else 'unchanged', old[1], new[1]
+            old = next(old_iter, None)
+            new = next(new_iter, None)
+
+
+def side_values(parsed):
+    size = parsed.size
+    return [parsed.revision, parsed.author, f"{parsed.date} {parsed.time}", int(size) if size.isdigit() else size]
+
+
+class InventoryDiff:
+    """Compare the files of two URLs or revisions and write what was added, removed and modified
+
+    Targets are URLs with an optional peg revision, e.g. URL@1200. Both
+    sides are listed at the same time on their own threads, each through
+    an ExportEngine, so cached listings and every listing option apply.
+    An xlsx output gets Added, Removed, Modified and Summary sheets; other
+    formats are written as <output>_added, _removed and _modified files.
+    """
+
+    def __init__(self, old_target, new_target, username, password, output, filter_patterns=None,
+                 output_format=None, engine_options=None, emit_logs=None, emit_progress=None, translations=None):
+        self.old_target = old_target
+        self.new_target = new_target
+        self.username = username
+        self.password = password
+        self.output = output
+        self.filter_patterns = filter_patterns or []
+        self.output_format = output_format or format_for_path(output, 'xlsx')
+        self.engine_options = engine_options or {}
+        self.emit_logs = emit_logs or (lambda text: None)
+        self.emit_progress = emit_progress or (lambda count: None)
+        self.translations = translations or {}
+        self.log_lock = threading.Lock()
+        self.counts = Counter()
+        self.engines = []
+
+    def tr(self, key, **kwargs):
+        text = self.translations.get(key, key)
+        return text.format(**kwargs) if kwargs else text
+
+    def log(self, message):
+        self.emit_logs(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+
+    def output_paths(self):
+        """Return {change: output path}; every change shares the workbook for xlsx"""
+        if self.output_format == 'xlsx':
+            return {change: self.output for change in CHANGES}
+        stem, extension = os.path.splitext(self.output)
+        return {change: f"{stem}_{change}{extension}" for change in CHANGES}
+
+    def create_engine(self, target):
+        url, revision = split_target(target)
+        label = url_label(url) + (f"@{revision}" if revision else '')
+
+        def emit_logs(text):
+            with self.log_lock:
+                self.emit_logs('\n'.join(f"[{label}] {line}" for line in text.split('\n')))
+
+        options = dict(self.engine_options)
+        # Both sides share the output path, so their metrics are only logged and their listings not checkpointed
+        options['write_metrics'] = False
+        options['checkpoint'] = False
+        engine = ExportEngine(url, self.username, self.password, self.output, self.filter_patterns,
+                              emit_logs=emit_logs, output_format=self.output_format, revision=revision, **options)
+        engine.set_translations(self.translations)
+        return engine
+
+    def start_listing(self, engine, stopped):
+        """List one side on a background thread and return its file entries as an iterator"""
+        chunks = queue.Queue(maxsize=QUEUE_CHUNKS)
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            engine.start()
+            count = 0
+            try:
+                engine.open_backend()
+                entries = engine.iter_files(engine.metrics.timed('listing', engine.iter_listing()))
+                try:
+                    chunk = []
+                    for parsed in entries:
+                        chunk.append(parsed)
+                        if len(chunk) >= CHUNK_SIZE:
+                            if not put(chunk):
+                                break
+                            count += len(chunk)
+                            chunk = []
+                    else:
+                        count += len(chunk)
+                        put(chunk)
+                        put(None)
+                finally:
+                    entries.close()
+                engine.files_exported = count
+                engine.finish(True, self.tr('log_files_found', count=count))
+            except Exception as e:
+                engine.finish(False, self.tr('error_svn', error=str(e)))
+                put(e)
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+
+        def consume():
+            while True:
+                item = chunks.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield from item
+
+        return thread, consume()
+
+    def create_writers(self):
+        paths = self.output_paths()
+        headers = {change: MODIFIED_HEADERS if change == 'modified' else SIDE_HEADERS for change in CHANGES}
+        if self.output_format != 'xlsx':
+            return None, {change: create_writer(paths[change], headers[change], self.output_format)
+                          for change in CHANGES}
+        from excel_writer import ExcelWriter, SharedWorkbook
+        workbook = SharedWorkbook(self.output)
+        return workbook, {change: ExcelWriter(self.output, headers[change], sheet_title=SHEET_TITLES[change],
+                                              shared_workbook=workbook)
+                          for change in CHANGES}
+
+    def write_summary_sheet(self, workbook, seconds):
+        sheet = workbook.create_sheet("Summary")
+        sheet.append(['Old', 'New', 'Added', 'Removed', 'Modified', 'Unchanged', 'Seconds'])
+        sheet.append([self.old_target, self.new_target, self.counts['added'], self.counts['removed'],
+                      self.counts['modified'], self.counts['unchanged'], round(seconds, 3)])
+
+    def cancel(self):
+        """Stop both listings; run() then returns (False, message)"""
+        for engine in self.engines:
+            engine.cancel()
+
+    def run(self):
+        """Compare both targets, write the differences and return (success, message)"""
+        start = time.perf_counter()
+        self.counts = Counter()
+        self.log(self.tr('log_diff_start', old=self.old_target, new=self.new_target))
+        self.engines = [self.create_engine(self.old_target), self.create_engine(self.new_target)]
+        stopped = threading.Event()
+        threads = []
+        workbook = writers = None
+        try:
+            try:
+                workbook, writers = self.create_writers()
+            except ImportError as e:
+                raise Exception(self.tr('error_missing_package', format=FORMAT_NAMES[self.output_format],
+                                        package=e.name))
+            listings = []
+            for engine in self.engines:
+                thread, entries = self.start_listing(engine, stopped)
+                threads.append(thread)
+                listings.append(entries)
+
+            compared = 0
+            for change, old, new in diff_listings(*listings):
+                self.counts[change] += 1
+                if change == 'modified':
+                    writers[change].write([new.path] + side_values(old) + side_values(new))
+                elif change != 'unchanged':
+                    parsed = new if change == 'added' else old
+                    writers[change].write([parsed.path] + side_values(parsed))
+                compared += 1
+                if compared % CHUNK_SIZE == 0:
+                    self.emit_progress(compared)
+            self.emit_progress(compared)
+
+            for writer in writers.values():
+                writer.save()
+            if workbook is not None:
+                self.write_summary_sheet(workbook, time.perf_counter() - start)
+                workbook.save()
+            for path in sorted(set(self.output_paths().values())):
+                self.log(self.tr('log_diff_written', path=path))
+            message = self.tr('log_diff_summary', added=self.counts['added'], removed=self.counts['removed'],
+                              modified=self.counts['modified'], unchanged=self.counts['unchanged'],
+                              seconds=f"{time.perf_counter() - start:.1f}")
+            self.log(message)
+            return True, message
+        except Exception as e:
+            if isinstance(e, UnsortedListing):
+                e = Exception(self.tr('error_diff_unsorted', path=str(e)))
+            for writer in (writers or {}).values():
+                writer.discard()
+            message = self.tr('error_svn', error=str(e))
+            self.log(message)
+            return False, message
+        finally:
+            stopped.set()
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,68 @@
+import codecs
+import locale
+import os
+import sys
+
+# Tried in order for each line; svn prints UTF-8 under a UTF-8 locale and the
+# ANSI code page (GBK on Chinese Windows) otherwise
+DECODE_CHAIN = ('utf-8', 'gbk', 'gb18030')
+
+
+def output_chain(xml=False):
+    """Return the decode chain for the output of an svn command
+    
+    XML output is always UTF-8. Plain text is UTF-8 where svn_environment()
+    asks for a UTF-8 locale, but on Windows svn writes it in the ANSI code
+    page, which therefore has to come first: many GBK names, such as 一丐,
+    are also valid UTF-8 and would otherwise be decoded as other characters.
+    """
+    if xml or os.name != 'nt':
+        return DECODE_CHAIN
+    ansi = codecs.lookup(locale.getpreferredencoding(False)).name
+    return (ansi,) + tuple(encoding for encoding in DECODE_CHAIN if encoding != ansi)
+
+
+class LineDecoder:
+    """Decode raw svn output one line at a time
+
+    Each line is decoded with the first encoding of the chain that accepts
+    it, and a line no encoding accepts is decoded with replacement
+    characters. A single undecodable file name therefore costs one line,
+    not a second run of the whole listing. `fallbacks` counts the lines
+    that needed an encoding other than the first one, by encoding.
+    """
+
+    def __init__(self, chain=DECODE_CHAIN):
+        self.chain = chain
+        self.fallbacks = {}
+
+    def decode(self, raw):
+        try:
+            return raw.decode(self.chain[0])
+        except UnicodeDecodeError:
+            pass
+        for encoding in self.chain[1:]:
+            try:
+                text = raw.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+            self.fallbacks[encoding] = self.fallbacks.get(encoding, 0) + 1
+            return text
+        self.fallbacks['replacement'] = self.fallbacks.get('replacement', 0) + 1
+        return raw.decode(self.chain[0], errors='replace')
+
+
+def svn_environment():
+    """Return the environment for svn processes, asking for UTF-8 output where the platform allows"""
+    env = os.environ.copy()
+    # Chinese messages where that locale is installed
+    env['LANG'] = 'zh_CN.UTF-8'
+    if os.name == 'nt':
+        # svn on Windows writes the ANSI code page regardless of the locale variables
+        env['LC_ALL'] = 'zh_CN.UTF-8'
+    else:
+        # Unlike zh_CN.UTF-8, a plain UTF-8 character type exists on every system, so
+        # svn never falls back to escaping non-ASCII names as "?\\NNN"
+        env.pop('LC_ALL', None)
+        env['LC_CTYPE'] = 'UTF-8' if sys.platform == 'darwin' else 'C.UTF-8'
+    return env
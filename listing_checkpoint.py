@@ -0,0 +1,129 @@
+import json
+import os
+
+from listing_entry import ListingEntry
+
+# Entries are handed to the operating system in batches of this many lines
+FLUSH_EVERY = 1000
+
+
+def checkpoint_path_for(output_path):
+    """Return the listing checkpoint kept next to an export output until the export succeeds"""
+    return os.path.splitext(output_path)[0] + '_checkpoint.jsonl'
+
+
+def read_checkpoint_key(path):
+    """Return the key of the checkpoint at path, or None when there is no readable one"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.readline()
+        return json.loads(header) if header.endswith(b'\n') else None
+    except (OSError, ValueError):
+        return None
+
+
+class ListingCheckpoint:
+    """Journal of the entries listed so far, so that an interrupted listing resumes where it stopped
+
+    The first line holds `key`, which identifies the listing (URL,
+    revision, user, format and anything else that changes its entries).
+    Each following line holds one entry, in listing order, and a final
+    {"complete": true} line marks a listing that finished. open() keeps the
+    entries of an earlier run with the same key, and new entries are
+    appended after them; a journal with another key is started over. A
+    line cut short when the process was killed is dropped.
+    """
+
+    def __init__(self, path, key):
+        self.path = path
+        self.key = key
+        self.file = None
+        self.valid = 0  # Length of the journal up to its last complete line
+        self.count = 0  # Entries recorded by earlier runs
+        self.last_path = None  # Path of the last of them
+        self.complete = False
+        self.unflushed = 0
+
+    def records(self, f):
+        """Yield the entry records of an open journal after its header, with their end offsets"""
+        offset = f.tell()
+        for line in f:
+            if not line.endswith(b'\n'):
+                return
+            offset += len(line)
+            yield json.loads(line), offset
+
+    def scan(self):
+        """Find the valid part of an earlier journal of the same listing"""
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.readline()
+                if not header.endswith(b'\n') or json.loads(header) != self.key:
+                    return
+                self.valid = len(header)
+                for record, offset in self.records(f):
+                    if isinstance(record, dict):
+                        self.complete = bool(record.get('complete'))
+                    else:
+                        self.count += 1
+                        self.last_path = record[0]
+                    self.valid = offset
+        except (OSError, ValueError, TypeError, IndexError):
+            # No journal yet, or an unreadable line; the listing continues after the last good entry
+            pass
+
+    def open(self):
+        """Keep what an earlier run of the same listing recorded and prepare to append after it"""
+        self.scan()
+        if self.valid:
+            self.file = open(self.path, 'r+b')
+            self.file.truncate(self.valid)
+            self.file.seek(self.valid)
+        else:
+            self.count = 0
+            self.last_path = None
+            self.complete = False
+            self.file = open(self.path, 'wb')
+            self.write(self.key)
+
+    def replay(self):
+        """Yield (entry, properties) for each entry recorded by earlier runs"""
+        with open(self.path, 'rb') as f:
+            f.readline()
+            for record, offset in self.records(f):
+                if offset > self.valid:
+                    return
+                if not isinstance(record, dict):
+                    yield ListingEntry(*record[:8]), record[8] if len(record) > 8 else None
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n')
+
+    def append(self, entry, properties=None):
+        record = [entry.path, entry.revision, entry.author, entry.size, entry.date, entry.time, entry.kind,
+                  entry.lock_owner]
+        if properties:
+            record.append(properties)
+        self.write(record)
+        self.unflushed += 1
+        if self.unflushed >= FLUSH_EVERY:
+            self.file.flush()
+            self.unflushed = 0
+
+    def finish(self):
+        """Mark the listing complete, so that a rerun replays it without listing anything"""
+        self.write({'complete': True})
+        self.complete = True
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def remove(self):
+        """Delete the journal once the export that needed it has succeeded"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,128 @@
+def parent_of(path):
+    """Return the parent directory of a listing path ('' for top-level entries)"""
+    stripped = path.rstrip('/')
+    return stripped[:stripped.rfind('/') + 1]
+
+
+def path_sort_key(path):
+    # `svn list -R` prints each directory's children right after it, sorted by name
+    return path.rstrip('/').split('/')
+
+
+class FullRelistRequired(Exception):
+    """Raised when a change cannot be applied incrementally"""
+
+
+class ListingDelta:
+    """Bring a saved listing up to date from `svn log -v` changed paths
+
+    Deleted paths are removed immediately. Every changed path marks its
+    parent directories for a `--depth immediates` relisting, and directories
+    copied from elsewhere are marked for a recursive relisting, so the number
+    of svn calls follows the number of changed directories instead of the
+    repository size.
+    """
+
+    def __init__(self, parsed_entries, base_path):
+        self.base_path = base_path.rstrip('/')
+        self.entries = {}
+        self.children = {}
+        for parsed in parsed_entries:
+            if parsed.path.rstrip('/') in ('', '.'):
+                continue
+            self.add(parsed)
+        self.relist_dirs = set()
+        self.relist_trees = set()
+
+    def add(self, parsed):
+        path = parsed.path
+        if path not in self.entries:
+            self.children.setdefault(parent_of(path), set()).add(path)
+        self.entries[path] = parsed
+
+    def remove(self, path):
+        """Remove a path and, for directories, everything below it"""
+        for key in (path, path + '/'):
+            if key in self.entries:
+                del self.entries[key]
+                self.children.get(parent_of(key), set()).discard(key)
+            for child in self.children.pop(key, ()):
+                if child in self.entries:
+                    self.remove(child.rstrip('/'))
+
+    def relative(self, repo_path, action):
+        """Map a repository path to a listing path, or None when outside the URL"""
+        if repo_path == self.base_path or self.base_path.startswith(repo_path.rstrip('/') + '/'):
+            if action != 'M':
+                # The URL itself or one of its parents was replaced, moved or deleted
+                raise FullRelistRequired(repo_path)
+            return None
+        if self.base_path and not repo_path.startswith(self.base_path + '/'):
+            return None
+        return repo_path[len(self.base_path):].lstrip('/')
+
+    def covered(self, path):
+        """Whether a path lies inside a subtree that will be relisted recursively"""
+        return any(path == tree or path.startswith(tree + '/') for tree in self.relist_trees)
+
+    def mark_ancestors(self, path):
+        # A change updates the last changed revision of every parent directory,
+        # and each directory entry is refreshed by listing the directory above it
+        parent = parent_of(path).rstrip('/')
+        while True:
+            self.relist_dirs.add(parent)
+            if not parent:
+                break
+            parent = parent_of(parent).rstrip('/')
+
+    def apply_log_entry(self, log_entry):
+        for change in log_entry['paths']:
+            action = change['action']
+            path = self.relative(change['path'], action)
+            if not path:
+                continue
+
+            if action in ('D', 'R'):
+                self.remove(path)
+                self.relist_dirs = {d for d in self.relist_dirs if not (d == path or d.startswith(path + '/'))}
+                self.relist_trees = {t for t in self.relist_trees if not (t == path or t.startswith(path + '/'))}
+            if action != 'D' and change['copyfrom_path'] and not self.covered(path):
+                if change['kind'] == 'dir':
+                    # Copied children keep their original revisions, so list the copy
+                    self.relist_trees = {t for t in self.relist_trees if not t.startswith(path + '/')}
+                    self.relist_trees.add(path)
+                elif change['kind'] != 'file':
+                    raise FullRelistRequired(change['path'])
+            self.mark_ancestors(path)
+
+    def pending_relists(self):
+        """Return the (path, recursive) listings needed to finish the update"""
+        dirs = {d for d in self.relist_dirs if not self.covered(d)}
+        return [(path, True) for path in sorted(self.relist_trees)] + [(path, False) for path in sorted(dirs)]
+
+    def apply_listing(self, path, recursive, parsed_entries):
+        """Merge a fresh listing of path (entries relative to path) into the listing"""
+        prefix = path + '/' if path else ''
+        if recursive:
+            self.remove(path)
+        else:
+            for child in list(self.children.get(prefix, ())):
+                if child.endswith('/'):
+                    # Keep the subtree; only the directory entry itself is refreshed
+                    self.entries.pop(child, None)
+                    self.children[prefix].discard(child)
+                else:
+                    self.remove(child)
+        for parsed in parsed_entries:
+            relative = parsed.path
+            if relative.rstrip('/') in ('', '.'):
+                continue
+            if not recursive and '/' in relative.rstrip('/'):
+                continue
+            parsed.path = prefix + relative
+            self.add(parsed)
+
+    def iter_entries(self):
+        """Yield the updated listing in `svn list -R` order"""
+        for path in sorted(self.entries, key=path_sort_key):
+            yield self.entries[path]
@@ -0,0 +1,77 @@
+import sys
+
+
+class ListingEntry:
+    """One parsed `svn list` entry
+
+    Entries use __slots__ instead of a dict per entry, and the author and
+    date strings, which repeat across most of a listing, are interned so
+    that every entry shares one copy. Directory paths end with '/'. The
+    lock owner is only known from a live `svn list --xml`, since locks are
+    not versioned and are therefore not kept in the listing index.
+    """
+
+    __slots__ = ('path', 'revision', 'author', 'size', 'date', 'time', 'kind', 'lock_owner')
+
+    def __init__(self, path, revision='', author='', size='', date='', time='', kind='', lock_owner=''):
+        self.path = path
+        self.revision = revision
+        self.author = sys.intern(author) if author else ''
+        self.size = size
+        self.date = sys.intern(date) if date else ''
+        self.time = time
+        self.kind = kind
+        self.lock_owner = lock_owner
+
+    def fields(self):
+        """Return the versioned fields, in the order of the listing index columns"""
+        return (self.path, self.revision, self.author, self.size, self.date, self.time, self.kind)
+
+    def __repr__(self):
+        return f"ListingEntry{self.fields()!r}"
+
+
+class DirectoryTable:
+    """Builds the repository URL of each distinct directory once
+
+    A listing has far fewer directories than files, so the URL of a file's
+    directory is looked up by its listing path instead of being joined and
+    normalized again for every file. Each directory gets an id, its index
+    in `urls`, and all files of a directory share the same URL string.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.ids = {}  # directory path relative to base_url -> id
+        self.urls = []  # id -> repository URL
+
+    def id_for(self, dir_path):
+        directory_id = self.ids.get(dir_path)
+        if directory_id is None:
+            directory_id = len(self.urls)
+            self.urls.append(self.build_url(dir_path))
+            self.ids[dir_path] = directory_id
+        return directory_id
+
+    def url_for(self, dir_path):
+        return self.urls[self.id_for(dir_path)]
+
+    def build_url(self, dir_path):
+        url = f"{self.base_url}/{dir_path}" if dir_path else self.base_url
+        # Only handle duplicate slashes in path part, protect protocol part
+        if '://' in url:
+            protocol, path = url.split('://', 1)
+            return f"{protocol}://{path.replace('//', '/')}"
+        return url.replace('//', '/')
+
+
+def human_size(size):
+    """Format a byte count such as '1536' as '1.5 KB'; other values are returned as they are"""
+    if not str(size).isdigit():
+        return size
+    value = int(size)
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if value < 1024 or unit == 'TB':
+            break
+        value /= 1024
+    return f"{value} B" if unit == 'B' else f"{value:.1f} {unit}"
@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import time
+
+from listing_entry import ListingEntry
+
+# Total number of cached entries kept across all URLs before old listings are evicted
+DEFAULT_MAX_ENTRIES = 5000000
+
+# Entry columns, in the order ListingEntry takes and returns its fields
+ENTRY_FIELDS = ('path', 'revision', 'author', 'size', 'date', 'time', 'kind')
+
+# The index is only a cache, so a database with another schema version is rebuilt
+SCHEMA_VERSION = 1
+
+# Unfinished listings older than this were left behind by a crashed export
+STALE_LISTING_SECONDS = 24 * 60 * 60
+
+
+def default_index_path():
+    """Return the per-user location of the listing index database"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'SVNFileExporter', 'listing_index.sqlite')
+
+
+class ListingIndex:
+    """On-disk cache of parsed repository listings keyed by URL and revision
+    
+    One listing is kept per (url, username, list_format). When the total
+    number of cached entries exceeds max_entries, the least recently used
+    listings are evicted. A listing is written in short transactions while it
+    streams in and only becomes visible once complete, so several exports can
+    share the index at the same time.
+    """
+    
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, isolation_level=None, timeout=30)
+        self.connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+        """)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.connection.executescript(f"""
+                DROP TABLE IF EXISTS listings;
+                DROP TABLE IF EXISTS entries;
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS listings (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                username TEXT NOT NULL,
+                list_format TEXT NOT NULL,
+                revision INTEGER NOT NULL,
+                entry_count INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                complete INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS listings_key ON listings (url, username, list_format);
+            CREATE TABLE IF NOT EXISTS entries (
+                listing_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                revision TEXT,
+                author TEXT,
+                size TEXT,
+                date TEXT,
+                time TEXT,
+                kind TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entries_listing ON entries (listing_id);
+        """)
+        for (listing_id,) in self.connection.execute(
+                "SELECT id FROM listings WHERE complete = 0 AND last_used < ?",
+                (time.time() - STALE_LISTING_SECONDS,)).fetchall():
+            self.delete(listing_id)
+        
+    def close(self):
+        self.connection.close()
+        
+    def find(self, url, username, list_format):
+        """Return (listing id, revision) of the cached listing for this key, or None"""
+        row = self.connection.execute(
+            "SELECT id, revision FROM listings WHERE url = ? AND username = ? AND list_format = ? AND complete = 1",
+            (url, username, list_format)
+        ).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE listings SET last_used = ? WHERE id = ?", (time.time(), row[0]))
+        return row
+        
+    def iter_entries(self, listing_id):
+        """Yield the cached parsed entries of a listing in their original order"""
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(ENTRY_FIELDS)} FROM entries WHERE listing_id = ? ORDER BY rowid",
+            (listing_id,)
+        )
+        cursor.arraysize = 10000
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                yield ListingEntry(*row)
+                
+    def record(self, url, username, list_format, revision, parsed_entries, batch_size=10000):
+        """Pass parsed entries through while storing them as the listing at revision
+        
+        The listing replaces any older one for the same key only once the
+        input has been fully consumed; an interrupted listing is discarded.
+        """
+        connection = self.connection
+        listing_id = connection.execute(
+            "INSERT INTO listings (url, username, list_format, revision, entry_count, last_used, complete) "
+            "VALUES (?, ?, ?, ?, 0, ?, 0)",
+            (url, username, list_format, revision, time.time())
+        ).lastrowid
+        try:
+            insert = f"INSERT INTO entries (listing_id, {', '.join(ENTRY_FIELDS)}) VALUES (?{', ?' * len(ENTRY_FIELDS)})"
+            batch = []
+            count = 0
+            for parsed in parsed_entries:
+                batch.append((listing_id,) + parsed.fields())
+                if len(batch) >= batch_size:
+                    self.insert_batch(insert, batch)
+                    batch = []
+                count += 1
+                yield parsed
+            if batch:
+                self.insert_batch(insert, batch)
+            
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for (old_id,) in connection.execute(
+                        "SELECT id FROM listings WHERE url = ? AND username = ? AND list_format = ? AND id != ?",
+                        (url, username, list_format, listing_id)).fetchall():
+                    self.delete(old_id)
+                connection.execute(
+                    "UPDATE listings SET entry_count = ?, complete = 1, last_used = ? WHERE id = ?",
+                    (count, time.time(), listing_id)
+                )
+                self.evict(keep_id=listing_id)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except BaseException:
+            self.delete(listing_id)
+            raise
+            
+    def insert_batch(self, insert, batch):
+        self.connection.execute("BEGIN")
+        try:
+            self.connection.executemany(insert, batch)
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+            
+    def delete(self, listing_id):
+        self.connection.execute("DELETE FROM entries WHERE listing_id = ?", (listing_id,))
+        self.connection.execute("DELETE FROM listings WHERE id = ?", (listing_id,))
+        
+    def evict(self, keep_id=None):
+        """Drop least recently used listings until the entry budget is met"""
+        total = self.connection.execute(
+            "SELECT COALESCE(SUM(entry_count), 0) FROM listings WHERE complete = 1").fetchone()[0]
+        if total <= self.max_entries:
+            return
+        candidates = self.connection.execute(
+            "SELECT id, entry_count FROM listings WHERE id != ? AND complete = 1 ORDER BY last_used",
+            (keep_id if keep_id is not None else -1,)
+        ).fetchall()
+        for listing_id, entry_count in candidates:
+            if total <= self.max_entries:
+                break
+            self.delete(listing_id)
+            total -= entry_count
@@ -0,0 +1,98 @@
+import heapq
+import os
+
+from listing_entry import human_size
+
+GROUP_HEADERS = ['Files', 'Size', 'Size (readable)', 'Last Revision', 'Last Commit Date']
+RECENT_HEADERS = ['Directory', 'Last Revision', 'Last Author', 'Last Commit Date', 'Files', 'Size']
+# Directories listed on the recently changed sheet
+RECENT_DIRECTORIES = 1000
+
+
+class ListingSummary:
+    """Rolls up exported files by author, top-level directory, extension and directory
+
+    add() is called for each file as it is written, so the summary is
+    built in the same pass as the export. Every group keeps one small list
+    of totals however many files it has: file count, bytes, and the
+    revision and date of its last change. Revisions only grow with time,
+    so the date of the highest revision is the latest commit date.
+    """
+
+    # (title, key header, file name suffix) of each rollup
+    GROUPS = (
+        ('By Author', 'Author', 'by_author'),
+        ('By Directory', 'Top-Level Directory', 'by_directory'),
+        ('By Extension', 'Extension', 'by_extension')
+    )
+    RECENT = ('Recent Directories', 'recent_directories')
+
+    def __init__(self, recent_limit=RECENT_DIRECTORIES):
+        self.recent_limit = recent_limit
+        self.groups = tuple({} for _ in self.GROUPS)
+        self.directories = {}  # directory URL -> [files, bytes, revision, author, date]
+
+    def add(self, parsed, directory):
+        """Count one file entry; directory is the URL of its directory"""
+        path = parsed.path
+        size = int(parsed.size) if parsed.size.isdigit() else 0
+        revision = int(parsed.revision) if parsed.revision.isdigit() else 0
+        date = f"{parsed.date} {parsed.time}".rstrip()
+        top_level, slash, _ = path.partition('/')
+        extension = os.path.splitext(path.rpartition('/')[2])[1].lower()
+        keys = (parsed.author or '(none)', top_level if slash else '/', extension or '(none)')
+        for groups, key in zip(self.groups, keys):
+            totals = groups.get(key)
+            if totals is None:
+                groups[key] = [1, size, revision, date]
+                continue
+            totals[0] += 1
+            totals[1] += size
+            if revision > totals[2]:
+                totals[2] = revision
+                totals[3] = date
+        totals = self.directories.get(directory)
+        if totals is None:
+            self.directories[directory] = [1, size, revision, parsed.author, date]
+            return
+        totals[0] += 1
+        totals[1] += size
+        if revision > totals[2]:
+            totals[2:] = [revision, parsed.author, date]
+
+    def tables(self):
+        """Return (title, headers, rows, file name suffix) for each summary table"""
+        tables = []
+        for (title, key_header, suffix), groups in zip(self.GROUPS, self.groups):
+            # Largest groups first, like a pivot table sorted by count
+            rows = [[key, files, size, human_size(str(size)), revision, date]
+                    for key, (files, size, revision, date) in
+                    sorted(groups.items(), key=lambda item: (-item[1][0], item[0]))]
+            tables.append((title, [key_header] + GROUP_HEADERS, rows, suffix))
+        recent = heapq.nsmallest(self.recent_limit, self.directories.items(), key=lambda item: (-item[1][2], item[0]))
+        rows = [[directory, revision, author, date, files, size]
+                for directory, (files, size, revision, author, date) in recent]
+        tables.append((self.RECENT[0], RECENT_HEADERS, rows, self.RECENT[1]))
+        return tables
+
+    def write(self, writer, output_path, create_writer):
+        """Write the tables as extra sheets of an Excel writer, or else as files next to the output
+
+        Returns the sheet titles or file paths written.
+        """
+        if hasattr(writer, 'add_sheet'):
+            return [writer.add_sheet(title, headers, rows) for title, headers, rows, _ in self.tables()]
+        stem, extension = os.path.splitext(output_path)
+        paths = []
+        for _, headers, rows, suffix in self.tables():
+            path = f"{stem}_{suffix}{extension}"
+            table_writer = create_writer(path, headers)
+            try:
+                for row in rows:
+                    table_writer.write(row)
+                table_writer.save()
+            except Exception:
+                table_writer.discard()
+                raise
+            paths.append(path)
+        return paths
@@ -0,0 +1,54 @@
+import threading
+
+
+class LogBatcher:
+    """Coalesce log lines and progress updates into time-based batches
+
+    Producers may call log() and progress() from any thread at any rate; a
+    background thread hands the pending lines (joined with newlines) and the
+    latest progress value to the callbacks at most once per interval.
+    """
+
+    def __init__(self, emit_logs, emit_progress, interval=0.1):
+        self.emit_logs = emit_logs
+        self.emit_progress = emit_progress
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.lines = []
+        self.value = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the background thread and deliver everything still pending"""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def log(self, line):
+        with self.lock:
+            self.lines.append(line)
+
+    def progress(self, value):
+        with self.lock:
+            self.value = value
+
+    def flush(self):
+        with self.lock:
+            lines, self.lines = self.lines, []
+            value, self.value = self.value, None
+        if lines:
+            self.emit_logs('\n'.join(lines))
+        if value is not None:
+            self.emit_progress(value)
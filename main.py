@@ -1,18 +1,32 @@
 import sys
 import os
-import subprocess
+import logging
 import re
 from datetime import datetime
-from svn_worker import SVNWorker
+# The export modules are imported by the workers when an export starts
+from svn_worker import SVNWorker, BatchWorker, SvnProbeWorker
+from svn_probe import probe_svn
+from exporters import OUTPUT_FORMATS, file_dialog_filters, format_for_path
+from results_browser import ResultsPane
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QLabel, QLineEdit, QPushButton,
                             QProgressBar, QFileDialog, QMessageBox, QComboBox,
-                            QTextEdit, QSplitter, QFormLayout, QGroupBox)
+                            QPlainTextEdit, QSplitter, QFormLayout, QGroupBox, QSpinBox,
+                            QCheckBox, QTabWidget)
 from PySide6.QtCore import Qt, QThread, Signal, QSettings
 from PySide6.QtGui import QIcon
 from translations import en_US, zh_CN
 
 VERSION = "v1.1"  # Current version
+LOG_MAX_LINES = 10000  # Older log lines are dropped so the log view stays responsive
+# Sort choices: translation key -> export sort option, '' keeps the listing order
+SORT_OPTIONS = {
+    'sort_listing_order': '',
+    'sort_by_path': 'path',
+    'sort_by_revision': 'revision',
+    'sort_by_author': 'author',
+    'sort_by_date': 'date'
+}
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -22,6 +36,7 @@ class MainWindow(QMainWindow):
         self.initTranslations()
         self.initUI()
         self.loadSettings()
+        self.start_svn_probe()
         
         # Set window icon and title with version
         icon_path = self.get_resource_path('resources/app.ico')
@@ -63,14 +78,41 @@ class MainWindow(QMainWindow):
         self.url_label.setText(self.tr('svn_url'))
         self.username_label.setText(self.tr('username'))
         self.password_label.setText(self.tr('password'))
+        self.workers_label.setText(self.tr('parallel_workers'))
+        self.workers_input.setToolTip(self.tr('parallel_workers_tooltip'))
+        self.dav_checkbox.setText(self.tr('use_dav'))
+        self.dav_checkbox.setToolTip(self.tr('use_dav_tooltip'))
+        self.timeout_label.setText(self.tr('command_timeout'))
+        self.timeout_input.setToolTip(self.tr('command_timeout_tooltip'))
+        self.timeout_input.setSpecialValueText(self.tr('command_timeout_none'))
         self.filter_group.setTitle(self.tr('file_format_filter'))
         self.filter_input.setPlaceholderText(self.tr('file_format_placeholder'))
         self.excel_group.setTitle(self.tr('excel_save_location'))
         self.browse_button.setText(self.tr('choose_path'))
+        self.index_checkbox.setText(self.tr('use_listing_index'))
+        self.resume_checkbox.setText(self.tr('resume_exports'))
+        self.resume_checkbox.setToolTip(self.tr('resume_exports_tooltip'))
+        self.metrics_checkbox.setText(self.tr('write_metrics'))
+        self.metrics_checkbox.setToolTip(self.tr('write_metrics_tooltip'))
+        self.extended_checkbox.setText(self.tr('extended_metadata'))
+        self.extended_checkbox.setToolTip(self.tr('extended_metadata_tooltip'))
+        self.properties_input.setPlaceholderText(self.tr('custom_properties_placeholder'))
+        self.summary_checkbox.setText(self.tr('summary_sheets'))
+        self.summary_checkbox.setToolTip(self.tr('summary_sheets_tooltip'))
+        self.sort_label.setText(self.tr('sort_rows_by'))
+        for index, key in enumerate(SORT_OPTIONS):
+            self.sort_input.setItemText(index, self.tr(key))
         self.progress_group.setTitle(self.tr('export_progress'))
         self.progress_bar.setFormat(self.tr('progress_format'))
         self.start_button.setText(self.tr('start_export'))
+        self.batch_button.setText(self.tr('export_all'))
+        self.batch_button.setToolTip(self.tr('export_all_tooltip'))
+        self.cancel_button.setText(self.tr('cancel_export'))
         self.log_label.setText(self.tr('log_info'))
+        self.verbose_log_checkbox.setText(self.tr('verbose_log'))
+        self.lower_tabs.setTabText(0, self.tr('log_tab'))
+        self.lower_tabs.setTabText(1, self.tr('results_tab'))
+        self.results_pane.retranslate()
         
     def validate_inputs(self):
         """Validate all required inputs"""
@@ -164,6 +206,32 @@ class MainWindow(QMainWindow):
         self.password_input.returnPressed.connect(self.handle_return_pressed)
         form_layout.addRow(self.password_label, self.password_input)
         
+        # Number of concurrent subtree listings (1 lists the repository in one call)
+        self.workers_label = QLabel(self.tr('parallel_workers'))
+        self.workers_input = QSpinBox()
+        self.workers_input.setRange(1, 16)
+        self.workers_input.setMinimumHeight(30)
+        self.workers_input.setToolTip(self.tr('parallel_workers_tooltip'))
+        self.dav_checkbox = QCheckBox(self.tr('use_dav'))
+        self.dav_checkbox.setToolTip(self.tr('use_dav_tooltip'))
+        # Seconds an svn command may print nothing before it is stopped; 0 waits forever
+        self.timeout_label = QLabel(self.tr('command_timeout'))
+        self.timeout_input = QSpinBox()
+        self.timeout_input.setRange(0, 3600)
+        self.timeout_input.setSingleStep(30)
+        self.timeout_input.setSuffix(' s')
+        self.timeout_input.setSpecialValueText(self.tr('command_timeout_none'))
+        self.timeout_input.setMinimumHeight(30)
+        self.timeout_input.setToolTip(self.tr('command_timeout_tooltip'))
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(self.workers_input)
+        workers_layout.addWidget(self.dav_checkbox)
+        workers_layout.addSpacing(20)
+        workers_layout.addWidget(self.timeout_label)
+        workers_layout.addWidget(self.timeout_input)
+        workers_layout.addStretch()
+        form_layout.addRow(self.workers_label, workers_layout)
+        
         # Create upper widget for input area
         upper_widget = QWidget()
         upper_layout = QVBoxLayout(upper_widget)
@@ -191,7 +259,40 @@ class MainWindow(QMainWindow):
         self.browse_button.clicked.connect(self.browse_save_location)
         excel_layout.addWidget(self.excel_path_input)
         excel_layout.addWidget(self.browse_button)
-        self.excel_group.setLayout(excel_layout)
+        excel_group_layout = QVBoxLayout()
+        excel_group_layout.addLayout(excel_layout)
+        self.index_checkbox = QCheckBox(self.tr('use_listing_index'))
+        excel_group_layout.addWidget(self.index_checkbox)
+        self.resume_checkbox = QCheckBox(self.tr('resume_exports'))
+        self.resume_checkbox.setToolTip(self.tr('resume_exports_tooltip'))
+        excel_group_layout.addWidget(self.resume_checkbox)
+        self.metrics_checkbox = QCheckBox(self.tr('write_metrics'))
+        self.metrics_checkbox.setToolTip(self.tr('write_metrics_tooltip'))
+        excel_group_layout.addWidget(self.metrics_checkbox)
+        extended_layout = QHBoxLayout()
+        self.extended_checkbox = QCheckBox(self.tr('extended_metadata'))
+        self.extended_checkbox.setToolTip(self.tr('extended_metadata_tooltip'))
+        self.properties_input = QLineEdit()
+        self.properties_input.setPlaceholderText(self.tr('custom_properties_placeholder'))
+        self.properties_input.setEnabled(False)
+        self.extended_checkbox.toggled.connect(self.properties_input.setEnabled)
+        extended_layout.addWidget(self.extended_checkbox)
+        extended_layout.addWidget(self.properties_input)
+        excel_group_layout.addLayout(extended_layout)
+        self.summary_checkbox = QCheckBox(self.tr('summary_sheets'))
+        self.summary_checkbox.setToolTip(self.tr('summary_sheets_tooltip'))
+        sort_layout = QHBoxLayout()
+        sort_layout.addWidget(self.summary_checkbox)
+        sort_layout.addSpacing(20)
+        self.sort_label = QLabel(self.tr('sort_rows_by'))
+        sort_layout.addWidget(self.sort_label)
+        self.sort_input = QComboBox()
+        for key, sort_by in SORT_OPTIONS.items():
+            self.sort_input.addItem(self.tr(key), sort_by)
+        sort_layout.addWidget(self.sort_input)
+        sort_layout.addStretch()
+        excel_group_layout.addLayout(sort_layout)
+        self.excel_group.setLayout(excel_group_layout)
         upper_layout.addWidget(self.excel_group)
         
         # Progress information
@@ -215,6 +316,21 @@ class MainWindow(QMainWindow):
         self.start_button.setFont(font)
         self.start_button.clicked.connect(self.start_export)
         button_layout.addWidget(self.start_button)
+        
+        # Export every remembered repository into one folder
+        self.batch_button = QPushButton(self.tr('export_all'))
+        self.batch_button.setMinimumSize(160, 36)
+        self.batch_button.setToolTip(self.tr('export_all_tooltip'))
+        self.batch_button.clicked.connect(self.start_batch_export)
+        button_layout.addWidget(self.batch_button)
+        
+        # Stops the running export and its svn processes
+        self.cancel_button = QPushButton(self.tr('cancel_export'))
+        self.cancel_button.setMinimumSize(120, 36)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_export)
+        self.cancel_requested = False
+        button_layout.addWidget(self.cancel_button)
         button_layout.addStretch()
         upper_layout.addLayout(button_layout)
         
@@ -227,26 +343,41 @@ class MainWindow(QMainWindow):
         log_layout = QVBoxLayout(log_widget)
         log_layout.setContentsMargins(10, 0, 10, 10)
         
-        # Add log title
+        # Add log title with the per-file detail switch
+        log_header_layout = QHBoxLayout()
         self.log_label = QLabel(self.tr('log_info'))
         font = self.log_label.font()
         font.setPointSize(10)
         self.log_label.setFont(font)
-        log_layout.addWidget(self.log_label)
-        
-        # Log text box
-        self.log_text = QTextEdit()
+        log_header_layout.addWidget(self.log_label)
+        log_header_layout.addStretch()
+        self.verbose_log_checkbox = QCheckBox(self.tr('verbose_log'))
+        log_header_layout.addWidget(self.verbose_log_checkbox)
+        log_layout.addLayout(log_header_layout)
+        
+        # Log text box, bounded to the most recent lines
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(LOG_MAX_LINES)
         log_layout.addWidget(self.log_text)
         
-        splitter.addWidget(log_widget)
+        # Log and the browsable results of the last export share the lower part
+        self.lower_tabs = QTabWidget()
+        self.lower_tabs.addTab(log_widget, self.tr('log_tab'))
+        self.results_pane = ResultsPane(self.tr)
+        self.lower_tabs.addTab(self.results_pane, self.tr('results_tab'))
+        splitter.addWidget(self.lower_tabs)
         
         # Set initial splitter sizes (30% for upper part, 70% for log)
         main_layout.addWidget(splitter)
         splitter.setSizes([300, 700])
         
     def log(self, message):
-        self.log_text.append(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+        self.log_text.appendPlainText(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+        
+    def append_log(self, text):
+        """Append a batch of already timestamped log lines from the worker"""
+        self.log_text.appendPlainText(text)
         
     def loadSettings(self):
         urls = self.settings.value('svn_urls', [])
@@ -266,6 +397,17 @@ class MainWindow(QMainWindow):
         if file_filters:
             self.filter_input.setText(file_filters)
             
+        self.workers_input.setValue(int(self.settings.value('parallel_workers', 1)))
+        self.dav_checkbox.setChecked(self.settings.value('use_dav', 'false') == 'true')
+        self.timeout_input.setValue(int(self.settings.value('command_timeout', 300)))
+        self.index_checkbox.setChecked(self.settings.value('use_listing_index', 'true') == 'true')
+        self.resume_checkbox.setChecked(self.settings.value('resume_exports', 'false') == 'true')
+        self.metrics_checkbox.setChecked(self.settings.value('write_metrics', 'false') == 'true')
+        self.extended_checkbox.setChecked(self.settings.value('extended_metadata', 'false') == 'true')
+        self.properties_input.setText(self.settings.value('custom_properties', ''))
+        self.summary_checkbox.setChecked(self.settings.value('summary_sheets', 'false') == 'true')
+        self.sort_input.setCurrentIndex(max(0, self.sort_input.findData(self.settings.value('sort_by', ''))))
+            
     def saveSettings(self):
         current_url = self.url_input.currentText().strip()
         if current_url:
@@ -289,19 +431,36 @@ class MainWindow(QMainWindow):
         if file_filters:
             self.settings.setValue('file_filters', file_filters)
             
+        self.settings.setValue('parallel_workers', self.workers_input.value())
+        self.settings.setValue('use_dav', 'true' if self.dav_checkbox.isChecked() else 'false')
+        self.settings.setValue('command_timeout', self.timeout_input.value())
+        self.settings.setValue('use_listing_index', 'true' if self.index_checkbox.isChecked() else 'false')
+        self.settings.setValue('resume_exports', 'true' if self.resume_checkbox.isChecked() else 'false')
+        self.settings.setValue('write_metrics', 'true' if self.metrics_checkbox.isChecked() else 'false')
+        self.settings.setValue('extended_metadata', 'true' if self.extended_checkbox.isChecked() else 'false')
+        self.settings.setValue('custom_properties', self.properties_input.text().strip())
+        self.settings.setValue('summary_sheets', 'true' if self.summary_checkbox.isChecked() else 'false')
+        self.settings.setValue('sort_by', self.sort_input.currentData())
+            
     def browse_save_location(self):
         last_path = self.settings.value('excel_path', '')
         start_dir = os.path.dirname(last_path) if last_path else ""
         
-        file_path, _ = QFileDialog.getSaveFileName(
+        # The export format follows the file extension; offer the last used one first
+        extensions = list(OUTPUT_FORMATS)
+        filters = file_dialog_filters()
+        last_format = format_for_path(last_path, 'xlsx')
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             self.tr('excel_save_location'),
             start_dir,
-            "Excel files (*.xlsx)"
+            ';;'.join(filters),
+            filters[list(OUTPUT_FORMATS.values()).index(last_format)]
         )
         if file_path:
-            if not file_path.endswith('.xlsx'):
-                file_path += '.xlsx'
+            if format_for_path(file_path) is None:
+                extension = extensions[filters.index(selected_filter)] if selected_filter in filters else '.xlsx'
+                file_path += extension
             self.excel_path_input.setText(file_path)
             
     def start_export(self):
@@ -315,16 +474,17 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, self.tr('warning'), self.tr('fill_required'))
             return
             
-        try:
-            result = subprocess.run(['svn', '--version'], capture_output=True, text=True)
-        except FileNotFoundError:
+        if not self.svn_available():
             QMessageBox.critical(self, self.tr('error'), self.tr('svn_not_found'))
             return
             
         self.saveSettings()
         self.log_text.clear()
+        self.log_svn_client()
             
         self.start_button.setEnabled(False)
+        self.batch_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
         self.progress_bar.setValue(0)
         
         # Process file filters
@@ -332,23 +492,164 @@ class MainWindow(QMainWindow):
         if file_filters:
             filter_patterns = [pattern.strip() for pattern in file_filters.split(';') if pattern.strip()]
         
-        # Pass translations to SVNWorker
-        self.worker = SVNWorker(url, username, password, excel_path, filter_patterns)
+        # Pass translations to SVNWorker; the written rows are kept for the results browser
+        from result_store import ResultStore
+        self.worker = SVNWorker(url, username, password, excel_path, filter_patterns,
+                                result_store=ResultStore(), **self.engine_options())
         self.worker.set_translations(self.translations[self.current_language])
         self.worker.progress.connect(self.update_progress)
         self.worker.finished.connect(self.export_finished)
-        self.worker.log_message.connect(self.log)
+        self.worker.log_message.connect(self.append_log)
+        self.worker.start()
+        
+    def start_svn_probe(self):
+        """Look for the svn client in the background, reusing the last result while the binary is unchanged"""
+        cached = None
+        if self.settings.value('svn_client_path'):
+            cached = {
+                'path': self.settings.value('svn_client_path'),
+                'signature': self.settings.value('svn_client_signature'),
+                'version': self.settings.value('svn_client_version')
+            }
+        self.svn_client = None  # Set once the probe has finished
+        self.svn_probe = SvnProbeWorker(cached)
+        self.svn_probe.probed.connect(self.svn_probed)
+        self.svn_probe.start()
+        
+    def svn_probed(self, result):
+        self.svn_client = result
+        if result['path']:
+            self.settings.setValue('svn_client_path', result['path'])
+            self.settings.setValue('svn_client_signature', result['signature'])
+            self.settings.setValue('svn_client_version', result['version'])
+        else:
+            self.settings.remove('svn_client_path')
+        
+    def svn_available(self):
+        """Return whether exports can run: the svn client is installed or the built-in HTTP client is used"""
+        if self.dav_checkbox.isChecked():
+            return True
+        if self.svn_client is None:
+            # Clicked before the startup probe finished
+            self.svn_probe.wait()
+            self.svn_probed(self.svn_probe.result)
+        if not self.svn_client['path']:
+            # The client may have been installed since the probe
+            self.svn_probed(probe_svn())
+        return bool(self.svn_client['path'])
+        
+    def log_svn_client(self):
+        if not self.dav_checkbox.isChecked():
+            self.log(self.tr('log_svn_client').format(path=self.svn_client['path'], version=self.svn_client['version']))
+        
+    def engine_options(self):
+        """Export options shared by single and batch exports"""
+        from listing_index import default_index_path
+        return {
+            'backend': 'dav' if self.dav_checkbox.isChecked() else 'svn',
+            'parallel_workers': self.workers_input.value(),
+            'index_path': default_index_path() if self.index_checkbox.isChecked() else None,
+            'log_level': logging.DEBUG if self.verbose_log_checkbox.isChecked() else logging.INFO,
+            'write_metrics': self.metrics_checkbox.isChecked(),
+            'extended_metadata': self.extended_checkbox.isChecked(),
+            'properties': [name.strip() for name in self.properties_input.text().split(';') if name.strip()],
+            'summary_sheets': self.summary_checkbox.isChecked(),
+            'sort_by': self.sort_input.currentData() or None,
+            'command_timeout': self.timeout_input.value() or None,
+            'checkpoint': self.resume_checkbox.isChecked()
+        }
+        
+    def start_batch_export(self):
+        """Export all repositories in the URL history, one workbook each"""
+        username = self.username_input.text().strip()
+        password = self.password_input.text().strip()
+        file_filters = self.filter_input.text().strip()
+        urls = [self.url_input.currentText().strip()] + [self.url_input.itemText(i) for i in range(self.url_input.count())]
+        urls = list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+        
+        if not all([urls, username, password]):
+            QMessageBox.warning(self, self.tr('warning'), self.tr('fill_required'))
+            return
+            
+        if not self.svn_available():
+            QMessageBox.critical(self, self.tr('error'), self.tr('svn_not_found'))
+            return
+            
+        last_path = self.settings.value('batch_output_dir', '') or os.path.dirname(self.settings.value('excel_path', ''))
+        output_dir = QFileDialog.getExistingDirectory(self, self.tr('export_all_folder'), last_path)
+        if not output_dir:
+            return
+        self.settings.setValue('batch_output_dir', output_dir)
+        self.saveSettings()
+        self.log_text.clear()
+        self.log_svn_client()
+        
+        self.start_button.setEnabled(False)
+        self.batch_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        
+        filter_patterns = [pattern.strip() for pattern in file_filters.split(';') if pattern.strip()]
+        self.worker = BatchWorker(urls, username, password, output_dir, filter_patterns,
+                                  output_format=format_for_path(self.excel_path_input.text().strip(), 'xlsx'),
+                                  engine_options=self.engine_options(),
+                                  translations=self.translations[self.current_language])
+        self.worker.finished.connect(self.export_finished)
+        self.worker.log_message.connect(self.append_log)
         self.worker.start()
         
     def update_progress(self, value):
         self.progress_bar.setValue(value)
         
+    def export_running(self):
+        return getattr(self, 'worker', None) is not None and self.worker.isRunning()
+        
+    def cancel_export(self):
+        """Stop the running export; export_finished() follows once its svn processes have been killed"""
+        if self.export_running():
+            self.cancel_button.setEnabled(False)
+            self.cancel_requested = True
+            self.log(self.tr('log_cancelling'))
+            self.worker.cancel()
+            
+    def closeEvent(self, event):
+        # Closing the window must not leave svn running in the background
+        if self.export_running():
+            self.worker.finished.disconnect(self.export_finished)
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
+        
     def export_finished(self, success, message):
         self.start_button.setEnabled(True)
-        if success:
+        self.batch_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        cancelled, self.cancel_requested = self.cancel_requested, False
+        metrics = getattr(getattr(self.worker, 'engine', None), 'metrics_report', None)
+        if metrics:
+            message += '\n\n' + self.metrics_summary(metrics)
+        results = getattr(getattr(self.worker, 'engine', None), 'result_store', None)
+        if success and results is not None:
+            self.results_pane.set_store(results)
+            self.lower_tabs.setCurrentWidget(self.results_pane)
+        if success or cancelled:
             QMessageBox.information(self, self.tr('window_title'), message)
         else:
             QMessageBox.critical(self, self.tr('error'), message)
+            
+    def metrics_summary(self, metrics):
+        """Format the stage timings of a finished export for the completion dialog"""
+        stages = metrics['stages']
+        return self.tr('metrics_summary').format(
+            total=f"{metrics['seconds']:.1f}",
+            svn=f"{stages['svn']:.1f}",
+            parse=f"{stages['parse']:.1f}",
+            filter=f"{stages['filter']:.1f}",
+            write=f"{stages['write']:.1f}",
+            save=f"{stages['save']:.1f}",
+            rate=f"{metrics['rows_per_second']:,.0f}",
+            memory=f"{metrics['peak_memory_bytes'] / (1024 * 1024):,.0f}"
+        )
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,34 @@
+import os
+import signal
+import subprocess
+
+
+def new_group_options():
+    """Return Popen arguments that start a command in its own process group
+
+    svn may start processes of its own, such as the ssh tunnel of svn+ssh://
+    URLs, that killing svn alone would leave running; a process group lets
+    kill_process_tree() stop svn and everything it started.
+    """
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def kill_process_tree(process):
+    """Kill a process started with new_group_options() and all of its children"""
+    if process.returncode is not None:
+        # Already reaped; its group id may belong to another process by now
+        return
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    try:
+        process.kill()
+    except OSError:
+        pass
@@ -0,0 +1,151 @@
+from array import array
+from bisect import bisect_left
+from itertools import compress
+
+RESULT_HEADERS = ['File Name', 'Directory', 'Revision', 'Author', 'Commit Date']
+NAME, DIRECTORY, REVISION, AUTHOR, DATE = range(5)
+# Filters keeping less than 1/SORT_MATCHES_RATIO of the rows sort the matches directly
+SORT_MATCHES_RATIO = 8
+
+
+class ValueTable:
+    """Stores each distinct value of a column once, with the rows that hold it"""
+
+    def __init__(self):
+        self.values = []  # id -> value
+        self.ids = {}  # value -> id
+        self.rows = []  # id -> array of row numbers
+
+    def add(self, value, row):
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self.ids[value] = value_id
+            self.rows.append(array('I'))
+        self.rows[value_id].append(row)
+        return value_id
+
+    def sorted_rows(self):
+        """Return every row number ordered by value, keeping listing order within a value"""
+        order = array('I')
+        for value_id in sorted(range(len(self.values)), key=lambda value_id: self.values[value_id].casefold()):
+            order.extend(self.rows[value_id])
+        return order
+
+    def matching_rows(self, text):
+        """Yield the row arrays of the values that contain text, compared case-insensitively"""
+        for value, rows in zip(self.values, self.rows):
+            if text in value.casefold():
+                yield rows
+
+
+class ResultStore:
+    """The rows of a finished export, kept compactly for the results browser
+
+    File names are kept as one list; directories, authors and dates repeat
+    across many rows and are stored once in a ValueTable each, with the
+    rows holding small integer ids. Sorting never moves rows: every sort
+    order is an array of row numbers, built once per column and shared by
+    all filters. File names are searched by prefix with a binary search over
+    their casefolded forms in name order, and directories and authors by
+    substring over their distinct values only. Only the first five export columns are kept.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.revisions = array('L')
+        self.directories = ValueTable()
+        self.authors = ValueTable()
+        self.dates = ValueTable()
+        self.column_ids = (None, array('I'), None, array('I'), array('I'))
+        self.orders = {}  # column -> array of row numbers in ascending order
+        self.folded_names = None  # Casefolded file names in name order, for searching
+
+    def __len__(self):
+        return len(self.names)
+
+    def append(self, row):
+        """Add one export row; called from the export thread before the store is shown"""
+        number = len(self.names)
+        self.names.append(row[NAME])
+        self.column_ids[DIRECTORY].append(self.directories.add(row[DIRECTORY], number))
+        revision = row[REVISION]
+        self.revisions.append(int(revision) if revision.isdigit() else 0)
+        self.column_ids[AUTHOR].append(self.authors.add(row[AUTHOR], number))
+        self.column_ids[DATE].append(self.dates.add(row[DATE], number))
+
+    def finish(self):
+        """Build the name and revision orders, which searching needs, off the GUI thread"""
+        self.order(NAME)
+        self.order(REVISION)
+
+    def value(self, number, column):
+        if column == NAME:
+            return self.names[number]
+        if column == REVISION:
+            return self.revisions[number]
+        table = (None, self.directories, None, self.authors, self.dates)[column]
+        return table.values[self.column_ids[column][number]]
+
+    def order(self, column):
+        """Return all row numbers sorted ascending by column"""
+        order = self.orders.get(column)
+        if order is None:
+            if column == NAME:
+                folded = [name.casefold() for name in self.names]
+                order = array('I', sorted(range(len(folded)), key=folded.__getitem__))
+                self.folded_names = [folded[number] for number in order]
+            elif column in (REVISION, DATE):
+                # Revisions are committed in date order, so both columns sort alike
+                order = self.orders.get(REVISION) or array('I', sorted(range(len(self)), key=self.revisions.__getitem__))
+            else:
+                order = (self.directories if column == DIRECTORY else self.authors).sorted_rows()
+            self.orders[column] = order
+        return order
+
+    def search(self, text):
+        """Return a bytearray marking the rows whose file name starts with text or whose
+        directory or author contains it, or None when text is empty"""
+        text = text.strip().casefold()
+        if not text:
+            return None
+        matched = bytearray(len(self))
+        by_name = self.order(NAME)
+        first = bisect_left(self.folded_names, text)
+        last = bisect_left(self.folded_names, text + '\U0010ffff', lo=first)
+        for number in by_name[first:last]:
+            matched[number] = 1
+        for table in (self.directories, self.authors):
+            for rows in table.matching_rows(text):
+                for number in rows:
+                    matched[number] = 1
+        return matched
+
+    def sort_key(self, column):
+        """Return the key that orders row numbers like order(column)"""
+        if column == NAME:
+            names = self.names
+            return lambda number: names[number].casefold()
+        if column in (REVISION, DATE):
+            return self.revisions.__getitem__
+        table = self.directories if column == DIRECTORY else self.authors
+        ranks = {value_id: rank for rank, value_id in
+                 enumerate(sorted(range(len(table.values)), key=lambda value_id: table.values[value_id].casefold()))}
+        ids = self.column_ids[column]
+        return lambda number: ranks[ids[number]]
+
+    def view(self, column, matched=None):
+        """Return the row numbers in ascending column order, only those marked in matched
+
+        Without a filter the shared order itself is returned, not a copy. A
+        filter that keeps few rows sorts just those rows; one that keeps
+        many picks them out of the shared order instead.
+        """
+        order = self.order(column)
+        if matched is None:
+            return order
+        if matched.count(1) * SORT_MATCHES_RATIO < len(matched):
+            # Row numbers are ascending, so ties keep listing order as in the shared order
+            return array('I', sorted(compress(range(len(matched)), matched), key=self.sort_key(column)))
+        return array('I', compress(order, map(matched.__getitem__, order)))
@@ -0,0 +1,130 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PySide6.QtWidgets import QHeaderView, QHBoxLayout, QLabel, QLineEdit, QTableView, QVBoxLayout, QWidget
+
+from result_store import NAME, RESULT_HEADERS
+
+# Delay between the last keystroke and filtering, so typing a word filters once
+SEARCH_DELAY_MS = 120
+
+
+class ResultsModel(QAbstractTableModel):
+    """Table model over a ResultStore that only reads the rows the view draws
+
+    The model holds the current view, an array of row numbers, and maps
+    the table row to it, reading it backwards for a descending sort.
+    """
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.column = NAME
+        self.descending = False
+        self.matched = None
+        self.rows = store.view(NAME) if store is not None else []
+
+    def set_store(self, store):
+        self.beginResetModel()
+        self.store = store
+        self.matched = None
+        self.rows = store.view(self.column) if store is not None else []
+        self.endResetModel()
+
+    def set_filter(self, text):
+        if self.store is None:
+            return
+        self.beginResetModel()
+        self.matched = self.store.search(text)
+        self.rows = self.store.view(self.column, self.matched)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(RESULT_HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        number = self.rows[len(self.rows) - 1 - row if self.descending else row]
+        return self.store.value(number, index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return RESULT_HEADERS[section]
+        return section + 1
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self.store is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self.column = column
+        self.descending = order == Qt.DescendingOrder
+        self.rows = self.store.view(column, self.matched)
+        self.layoutChanged.emit()
+
+
+class ResultsPane(QWidget):
+    """Search box and table showing the files of the last export"""
+
+    def __init__(self, tr, parent=None):
+        super().__init__(parent)
+        self.tr = tr
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 0, 10, 10)
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(self.tr('results_search_placeholder'))
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setMinimumHeight(30)
+        self.count_label = QLabel()
+        search_layout.addWidget(self.search_input)
+        search_layout.addWidget(self.count_label)
+        layout.addLayout(search_layout)
+
+        self.model = ResultsModel(parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(NAME, Qt.AscendingOrder)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        # Fixed row heights and column widths keep the view from measuring every row
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(self.table.fontMetrics().height() + 6)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.update_count()
+
+    def set_store(self, store):
+        self.search_input.clear()
+        self.search_timer.stop()
+        self.model.set_store(store)
+        self.table.sortByColumn(self.model.column,
+                                Qt.DescendingOrder if self.model.descending else Qt.AscendingOrder)
+        self.table.resizeColumnToContents(NAME)
+        self.update_count()
+
+    def apply_filter(self):
+        self.model.set_filter(self.search_input.text())
+        self.update_count()
+
+    def update_count(self):
+        store = self.model.store
+        total = len(store) if store is not None else 0
+        self.count_label.setText(self.tr('results_count').format(shown=f"{len(self.model.rows):,}",
+                                                                  total=f"{total:,}"))
+
+    def retranslate(self):
+        self.search_input.setPlaceholderText(self.tr('results_search_placeholder'))
+        self.update_count()
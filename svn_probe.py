@@ -0,0 +1,34 @@
+import os
+import shutil
+import subprocess
+
+
+def binary_signature(path):
+    """Return a string that changes when the file at path is replaced or updated"""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def probe_svn(cached=None):
+    """Find the svn client on PATH and return {'path', 'signature', 'version'}
+
+    `cached` is the result of an earlier probe. While the same binary is
+    still found, unchanged in size and modification time, it is returned
+    as it is and svn is not run. path and version are None when no svn
+    client is installed.
+    """
+    path = shutil.which('svn')
+    if path is None:
+        return {'path': None, 'signature': None, 'version': None}
+    try:
+        signature = binary_signature(path)
+    except OSError:
+        signature = None
+    if cached and cached.get('path') == path and signature and cached.get('signature') == signature:
+        return cached
+    try:
+        result = subprocess.run([path, '--version', '--quiet'], capture_output=True, text=True, timeout=30)
+        version = result.stdout.strip() or 'unknown'
+    except (OSError, subprocess.SubprocessError):
+        return {'path': None, 'signature': None, 'version': None}
+    return {'path': path, 'signature': signature, 'version': version}
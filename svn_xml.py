@@ -0,0 +1,160 @@
+import base64
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote
+
+from listing_entry import ListingEntry
+
+
+def entry_from_element(elem):
+    """Convert an <entry> element of `svn list --xml` into a ListingEntry"""
+    kind = elem.get('kind', 'file')
+    path = elem.findtext('name', '')
+    if kind == 'dir':
+        # Match the trailing slash used by the plain text listing
+        path += '/'
+    
+    commit = elem.find('commit')
+    if commit is not None:
+        revision = commit.get('revision', '')
+        author = commit.findtext('author', '')
+        date = commit.findtext('date', '')
+    else:
+        revision = author = date = ''
+    
+    # The ISO-8601 date already contains the time
+    return ListingEntry(path, revision, author, elem.findtext('size', ''), date, kind=kind,
+                        lock_owner=elem.findtext('lock/owner', ''))
+
+
+def iter_list_xml(chunks):
+    """Incrementally parse `svn list --xml` output fed as text chunks
+    
+    Entries are yielded as soon as their closing tag arrives and are then
+    removed from the tree, so memory does not grow with the listing size.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    parent = None
+    
+    def drain():
+        nonlocal parent
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if elem.tag == 'list':
+                    parent = elem
+                continue
+            if elem.tag != 'entry':
+                continue
+            yield entry_from_element(elem)
+            elem.clear()
+            if parent is not None:
+                parent.remove(elem)
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def parse_info(text):
+    """Return the last changed revision and repository path of an `svn info --xml` target"""
+    root = ET.fromstring(text)
+    entry = root.find('entry')
+    commit = root.find('entry/commit')
+    if entry is None or commit is None or not commit.get('revision'):
+        raise ValueError('svn info output has no commit revision')
+    
+    url = entry.findtext('url', '')
+    repository_root = entry.findtext('repository/root', '')
+    if repository_root and url.startswith(repository_root):
+        path = unquote(url[len(repository_root):]) or '/'
+    else:
+        path = None
+    return {
+        'revision': int(commit.get('revision')),
+        'path': path
+    }
+
+
+def iter_log_xml(chunks):
+    """Incrementally parse `svn log -v --xml` output fed as text chunks
+    
+    Yields one dict per revision with its author, date and changed paths.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    parent = None
+    
+    def drain():
+        nonlocal parent
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if elem.tag == 'log':
+                    parent = elem
+                continue
+            if elem.tag != 'logentry':
+                continue
+            yield {
+                'revision': elem.get('revision', ''),
+                'author': elem.findtext('author', ''),
+                'date': elem.findtext('date', ''),
+                'paths': [
+                    {
+                        'action': path.get('action', ''),
+                        'kind': path.get('kind', ''),
+                        'path': path.text or '',
+                        'copyfrom_path': path.get('copyfrom-path'),
+                        'copyfrom_rev': path.get('copyfrom-rev')
+                    }
+                    for path in elem.iterfind('paths/path')
+                ]
+            }
+            elem.clear()
+            if parent is not None:
+                parent.remove(elem)
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def iter_properties_xml(chunks, names=None):
+    """Incrementally parse `svn proplist -v --xml` output fed as text chunks
+    
+    Yields (target path, {property name: value}) for every target that has
+    at least one of the wanted property names (all properties when names is
+    None). Base64-encoded values are decoded as UTF-8.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    parent = None
+    
+    def drain():
+        nonlocal parent
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if elem.tag == 'properties':
+                    parent = elem
+                continue
+            if elem.tag != 'target':
+                continue
+            properties = {}
+            for prop in elem.iterfind('property'):
+                name = prop.get('name', '')
+                if names is not None and name not in names:
+                    continue
+                value = prop.text or ''
+                if prop.get('encoding') == 'base64':
+                    value = base64.b64decode(value).decode('utf-8', errors='replace')
+                properties[name] = value
+            if properties:
+                yield elem.get('path', ''), properties
+            elem.clear()
+            if parent is not None:
+                parent.remove(elem)
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
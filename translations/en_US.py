@@ -3,25 +3,60 @@ translations = {
     "svn_url": "SVN URL:",
     "username": "Username:",
     "password": "Password:",
+    "parallel_workers": "Parallel Listings:",
+    "parallel_workers_tooltip": "Number of top-level directories listed at the same time (1 lists the whole repository in one call)",
     "file_format_filter": "File Format Filter",
-    "file_format_placeholder": "Enter file formats, separated by semicolons (e.g., *.dwg;*.dxf;*.xlsx)",
-    "excel_save_location": "Excel Save Location",
+    "file_format_placeholder": "Enter file formats, separated by semicolons (e.g., *.dwg;*.dxf;trunk/design/**/*.xlsx;!tags/)",
+    "excel_save_location": "Output File Location",
     "choose_path": "Choose Path",
     "export_progress": "Export Progress",
     "progress_format": "Files processed: %v",
     "start_export": "Start Export",
+    "export_all": "Export All Repositories",
+    "export_all_tooltip": "Export every repository in the URL history into one folder, one file each in the format of the output location",
+    "export_all_folder": "Choose Output Folder",
+    "cancel_export": "Cancel",
+    "log_cancelling": "Cancelling export, stopping svn...",
     "log_info": "Log Information:",
+    "write_metrics": "Save run metrics",
+    "write_metrics_tooltip": "Append the timings and counters of each export to a _metrics.jsonl file next to the output",
+    "metrics_summary": "Total {total}s: svn {svn}s, parse {parse}s, filter {filter}s, write {write}s, save {save}s\n{rate} rows/s, peak memory {memory} MB",
+    "extended_metadata": "Extended metadata",
+    "extended_metadata_tooltip": "Add size, lock owner, MIME type and custom property columns, gathered with two recursive svn calls (the listing cache is not used)",
+    "summary_sheets": "Summary sheets",
+    "summary_sheets_tooltip": "Add files and sizes per author, top-level directory and extension, and the most recently changed directories, as extra sheets (or extra files for other formats)",
+    "sort_rows_by": "Sort rows by:",
+    "sort_listing_order": "Listing order",
+    "sort_by_path": "Directory and name",
+    "sort_by_revision": "Revision",
+    "sort_by_author": "Author",
+    "sort_by_date": "Commit date",
+    "custom_properties_placeholder": "Custom properties, separated by semicolons (e.g., drawing:status;drawing:checker)",
+    "use_listing_index": "Reuse cached listing when the repository has not changed",
+    "resume_exports": "Resume interrupted exports",
+    "resume_exports_tooltip": "Record the listing next to the output while it runs; a failed or cancelled export continues from where it stopped instead of listing the repository again",
+    "verbose_log": "Show per-file details",
+    "log_tab": "Log",
+    "results_tab": "Results",
+    "results_search_placeholder": "Filter by file name prefix, directory or author",
+    "results_count": "{shown} of {total} files",
     "validation_title": "Input Validation",
     "validation_message": "The following information is incomplete:\n",
     "warning": "Warning",
     "error": "Error",
     "fill_required": "Please fill in all required information!",
+    "use_dav": "Built-in HTTP client",
+    "use_dav_tooltip": "List http(s):// repositories over WebDAV directly, without the svn command line client",
+    "command_timeout": "Timeout:",
+    "command_timeout_none": "None",
+    "command_timeout_tooltip": "Stop an svn command that has printed nothing for this many seconds",
     "svn_not_found": "SVN command line tool not detected. Please install TortoiseSVN and ensure the command line tool is added to system PATH.",
+    "log_svn_client": "Using svn {version} at {path}",
     "missing_fields": {
         "svn_url": "SVN URL",
         "username": "Username",
         "password": "Password",
-        "excel_path": "Excel save location"
+        "excel_path": "Output file location"
     },
     # Log messages
     "log_parse_result": "Parse result - Revision: {revision}, Author: {author}, Size: {size}, DateTime: {date_time}, Path: {path}",
@@ -31,24 +66,74 @@ translations = {
     "log_error_message": "Error message: {error}",
     "log_command_no_output": "Command executed successfully but no output",
     "log_command_success": "Command executed successfully",
-    "log_encoding_error": "Encoding error, trying with different encoding...",
-    "log_encoding_retry_failed": "Retry with GBK encoding failed: {error}",
+    "log_decode_fallbacks": "Decoded {count} output lines with a fallback encoding ({encodings})",
     "log_error_occurred": "Error occurred: {error}",
+    "log_parallel_listing": "Listing {count} top-level directories with {workers} parallel workers",
+    "log_subtree_retry": "Listing {path} failed (attempt {attempt}), retrying: {error}",
+    "log_checkpoint_resumed": "Resuming the listing of revision {revision} from checkpoint {path}: {count} entries already listed",
+    "log_checkpoint_retry": "Listing failed after {path}, listing the rest again (attempt {attempt}): {error}",
+    "log_checkpoint_unavailable": "Cannot write the checkpoint, listing without it: {error}",
     "log_starting_export": "Starting SVN information export...",
     "log_file_list_success": "Successfully retrieved SVN file list",
     "log_files_found": "Found {count} files",
-    "log_creating_excel": "Starting to create Excel file...",
-    "log_saving_excel": "Saving Excel file to: {path}",
-    "log_excel_saved": "Excel file saved successfully",
-    "log_export_success": "Successfully exported {count} file information to Excel",
+    "log_sorting": "Sorting {count} rows by {column}, {runs} sorted run(s) on disk",
+    "log_checking_revision": "Checking latest revision of {url}...",
+    "log_index_skipped_extended": "Lock owners are not cached, listing repository",
+    "log_extended_metadata": "Reading properties for extended metadata...",
+    "log_properties_fetched": "Read properties of {count} paths",
+    "log_dav_listing": "Listing over HTTP without the svn client, {connections} connections",
+    "log_dav_stats": "Sent {requests} HTTP requests over {connections} connections",
+    "log_locks_fetched": "Read {count} locks",
+    "log_index_hit": "Repository unchanged since revision {revision}, using cached listing",
+    "log_index_newer": "Cached listing is of the newer revision {cached_revision}, listing revision {revision}",
+    "log_pruned_listing": "Path filters exclude whole directories, listing level by level to skip them",
+    "log_pruned_directories": "Skipped {count} directories excluded by the path filters",
+    "log_index_not_recorded_pruned": "Listing without the excluded directories, so it is not cached",
+    "log_index_miss": "No cached listing for revision {revision}, listing repository",
+    "log_index_unavailable": "Listing cache unavailable, listing repository: {error}",
+    "log_incremental_refresh": "Updating cached listing from revision {from_revision} to {to_revision} using svn log",
+    "log_incremental_relists": "Relisting {count} changed directories",
+    "log_incremental_too_many": "{count} changed directories",
+    "log_incremental_unavailable": "Incremental update not possible ({reason}), listing repository",
+    "log_incremental_verified": "Incremental listing matches the full listing ({count} entries)",
+    "log_incremental_mismatch": "Incremental listing differs from the full listing in {count} paths (e.g. {paths}), using the full listing",
+    "log_batch_start": "Exporting {count} repositories ({concurrency} at a time, at most {per_host} per server)",
+    "log_batch_job_done": "{url} finished in {seconds}s: {message}",
+    "log_batch_summary": "Batch export finished: {succeeded} succeeded, {failed} failed in {seconds}s, summary written to {path}",
+    "log_diff_start": "Comparing {old} with {new}",
+    "log_diff_written": "Differences written to: {path}",
+    "log_diff_summary": "{added} added, {removed} removed, {modified} modified, {unchanged} unchanged files in {seconds}s",
+    "log_watch_start": "Watching {count} URL(s), checking for new revisions every {interval}s",
+    "log_watch_changed": "{url}: revision {old} -> {new}, exporting",
+    "log_watch_check_failed": "{url}: checking the revision failed: {error}",
+    "log_watch_retry": "{url}: next attempt in {seconds}s",
+    "log_watch_state_failed": "Could not save the watch state: {error}",
+    "log_watch_stopped": "Watch stopped",
+    "error_diff_unsorted": "Listing is not in svn order at {path}, cannot compare",
+    "log_creating_excel": "Starting to create {format} file...",
+    "log_saving_excel": "Saving {format} file to: {path}",
+    "log_excel_saved": "{format} file saved successfully",
+    "log_excel_stats": "Wrote {rows} rows to {sheets} sheet(s) at {rate} rows/s, peak memory {memory} MB",
+    "log_export_stats": "Wrote {rows} rows at {rate} rows/s, peak memory {memory} MB",
+    "log_metrics_stages": "Timing: first byte {first_byte}s, svn {svn}s, parse {parse}s, filter {filter}s, write {write}s, save {save}s, total {total}s",
+    "log_metrics_counts": "Read {lines} lines ({lines_rate} lines/s), parsed {entries} entries, filtered out {filtered}, wrote {rows} rows, peak memory {memory} MB",
+    "log_metrics_written": "Run metrics appended to: {path}",
+    "log_summary_written": "Summary written: {tables}",
+    "log_metrics_write_failed": "Could not write the metrics file: {error}",
+    "log_export_success": "Successfully exported {count} file information to {format}",
+    "export_cancelled": "Export cancelled",
     "log_svn_failed": "SVN operation failed: {error}",
     "log_program_failed": "Program execution failed: {error}",
     # Error messages
     "error_no_output": "SVN command executed successfully but returned no output, please check if URL is correct",
-    "error_encoding": "Unable to properly handle Chinese encoding in SVN output",
     "error_invalid_url": "Invalid SVN URL format, must start with http://, https://, svn:// or file:///",
+    "error_dav_url": "The built-in HTTP client only supports http:// and https:// URLs",
     "error_no_output_check": "SVN command returned no output, please check if URL is correct",
     "error_no_files": "No matching files found",
+    "error_xml_parse": "Unable to parse SVN XML output: {error}",
+    "error_subtree_failed": "Listing {path} failed: {error}",
+    "error_command_timeout": "svn printed nothing for {seconds} seconds and was stopped",
+    "error_missing_package": "{format} output requires the optional package '{package}'",
     "error_svn": "SVN error: {error}",
     "error_general": "Error: {error}"
 } 
\ No newline at end of file
@@ -3,25 +3,60 @@ translations = {
     "svn_url": "SVN地址:",
     "username": "用户名:",
     "password": "密码:",
+    "parallel_workers": "并行列出数:",
+    "parallel_workers_tooltip": "同时列出的顶层目录数量（1 表示一次性列出整个仓库）",
     "file_format_filter": "文件格式过滤",
-    "file_format_placeholder": "输入文件格式，用分号分隔（例如：*.dwg;*.dxf;*.xlsx）",
-    "excel_save_location": "Excel保存位置",
+    "file_format_placeholder": "输入文件格式，用分号分隔（例如：*.dwg;*.dxf;trunk/design/**/*.xlsx;!tags/）",
+    "excel_save_location": "输出文件位置",
     "choose_path": "选择路径",
     "export_progress": "导出进度",
     "progress_format": "已处理文件进度：%v",
     "start_export": "开始导出",
+    "export_all": "导出全部仓库",
+    "export_all_tooltip": "将SVN地址历史中的所有仓库导出到同一文件夹，每个仓库一个文件，格式与输出文件位置相同",
+    "export_all_folder": "选择输出文件夹",
+    "cancel_export": "取消",
+    "log_cancelling": "正在取消导出，停止svn...",
     "log_info": "日志信息：",
+    "write_metrics": "保存运行指标",
+    "write_metrics_tooltip": "将每次导出的耗时和计数追加到输出文件旁的 _metrics.jsonl 文件中",
+    "metrics_summary": "总耗时 {total} 秒: svn {svn} 秒, 解析 {parse} 秒, 过滤 {filter} 秒, 写入 {write} 秒, 保存 {save} 秒\n{rate} 行/秒，峰值内存 {memory} MB",
+    "extended_metadata": "扩展元数据",
+    "extended_metadata_tooltip": "添加文件大小、锁定者、MIME 类型和自定义属性列，通过两次递归 svn 调用获取（不使用文件列表缓存）",
+    "summary_sheets": "汇总工作表",
+    "summary_sheets_tooltip": "按作者、顶级目录和扩展名统计文件数和大小，并列出最近修改的目录，作为额外的工作表（其他格式则为额外的文件）",
+    "sort_rows_by": "行排序方式：",
+    "sort_listing_order": "列表顺序",
+    "sort_by_path": "目录和文件名",
+    "sort_by_revision": "修订版本",
+    "sort_by_author": "作者",
+    "sort_by_date": "提交日期",
+    "custom_properties_placeholder": "自定义属性，用分号分隔（例如：drawing:status;drawing:checker）",
+    "use_listing_index": "仓库未变化时复用缓存的文件列表",
+    "resume_exports": "断点续传中断的导出",
+    "resume_exports_tooltip": "列出时将结果记录在输出文件旁；失败或取消的导出从中断处继续，而不必重新列出整个仓库",
+    "verbose_log": "显示每个文件的详细信息",
+    "log_tab": "日志",
+    "results_tab": "导出结果",
+    "results_search_placeholder": "按文件名前缀、目录或作者筛选",
+    "results_count": "显示 {shown} / 共 {total} 个文件",
     "validation_title": "输入验证",
     "validation_message": "以下信息未填写完整：\n",
     "warning": "警告",
     "error": "错误",
     "fill_required": "请填写所有必要信息！",
+    "use_dav": "内置 HTTP 客户端",
+    "use_dav_tooltip": "直接通过 WebDAV 列出 http(s):// 仓库，无需 svn 命令行客户端",
+    "command_timeout": "超时：",
+    "command_timeout_none": "不限",
+    "command_timeout_tooltip": "svn命令在这么多秒内没有任何输出时将其停止",
     "svn_not_found": "未检测到SVN命令行工具，请先安装TortoiseSVN并确保将命令行工具添加到系统PATH中。",
+    "log_svn_client": "使用 svn {version}：{path}",
     "missing_fields": {
         "svn_url": "SVN地址",
         "username": "用户名",
         "password": "密码",
-        "excel_path": "Excel保存位置"
+        "excel_path": "输出文件位置"
     },
     # Log messages
     "log_parse_result": "解析结果 - 版本: {revision}, 作者: {author}, 大小: {size}, 日期时间: {date_time}, 路径: {path}",
@@ -31,24 +66,74 @@ translations = {
     "log_error_message": "错误信息: {error}",
     "log_command_no_output": "命令执行成功但没有输出",
     "log_command_success": "命令执行成功",
-    "log_encoding_error": "编码错误，尝试使用不同的编码重新执行...",
-    "log_encoding_retry_failed": "使用GBK编码重试失败: {error}",
+    "log_decode_fallbacks": "{count} 行输出使用了备用编码解码（{encodings}）",
     "log_error_occurred": "发生错误: {error}",
+    "log_parallel_listing": "使用 {workers} 个并行任务列出 {count} 个顶层目录",
+    "log_subtree_retry": "列出 {path} 失败（第 {attempt} 次），正在重试: {error}",
+    "log_checkpoint_resumed": "从断点文件 {path} 继续列出版本 {revision}：已列出 {count} 个条目",
+    "log_checkpoint_retry": "在 {path} 之后列出失败，重新列出剩余部分（第 {attempt} 次）：{error}",
+    "log_checkpoint_unavailable": "无法写入断点文件，不使用断点继续列出：{error}",
     "log_starting_export": "开始导出SVN信息...",
     "log_file_list_success": "成功获取SVN文件列表",
     "log_files_found": "共找到 {count} 个文件",
-    "log_creating_excel": "开始创建Excel文件...",
-    "log_saving_excel": "正在保存Excel文件到: {path}",
-    "log_excel_saved": "Excel文件保存成功",
-    "log_export_success": "成功导出 {count} 个文件信息到Excel",
+    "log_sorting": "正在按 {column} 排序 {count} 行，磁盘上有 {runs} 个已排序分段",
+    "log_checking_revision": "正在检查 {url} 的最新版本...",
+    "log_index_skipped_extended": "锁定信息不会被缓存，直接列出仓库",
+    "log_extended_metadata": "正在读取扩展元数据所需的属性...",
+    "log_properties_fetched": "已读取 {count} 个路径的属性",
+    "log_dav_listing": "不使用 svn 客户端，通过 HTTP 列出文件，{connections} 个连接",
+    "log_dav_stats": "共发送 {requests} 个 HTTP 请求，使用 {connections} 个连接",
+    "log_locks_fetched": "已读取 {count} 个锁定",
+    "log_index_hit": "仓库自版本 {revision} 以来未变化，使用缓存的文件列表",
+    "log_index_newer": "缓存的文件列表为较新的版本 {cached_revision}，直接列出版本 {revision}",
+    "log_pruned_listing": "路径过滤规则排除了整个目录，逐层列出以跳过这些目录",
+    "log_pruned_directories": "已跳过 {count} 个被路径过滤规则排除的目录",
+    "log_index_not_recorded_pruned": "列表不包含被排除的目录，因此不写入缓存",
+    "log_index_miss": "没有版本 {revision} 的缓存列表，正在列出仓库",
+    "log_index_unavailable": "文件列表缓存不可用，正在列出仓库: {error}",
+    "log_incremental_refresh": "正在通过svn log将缓存列表从版本 {from_revision} 更新到 {to_revision}",
+    "log_incremental_relists": "正在重新列出 {count} 个有变化的目录",
+    "log_incremental_too_many": "{count} 个有变化的目录",
+    "log_incremental_unavailable": "无法增量更新（{reason}），正在列出仓库",
+    "log_incremental_verified": "增量列表与完整列表一致（{count} 个条目）",
+    "log_incremental_mismatch": "增量列表与完整列表有 {count} 个路径不一致（例如 {paths}），使用完整列表",
+    "log_batch_start": "正在导出 {count} 个仓库（同时 {concurrency} 个，每个服务器最多 {per_host} 个）",
+    "log_batch_job_done": "{url} 用时 {seconds} 秒完成: {message}",
+    "log_batch_summary": "批量导出完成: {succeeded} 个成功，{failed} 个失败，用时 {seconds} 秒，汇总已写入 {path}",
+    "log_diff_start": "正在比较 {old} 和 {new}",
+    "log_diff_written": "差异已写入: {path}",
+    "log_diff_summary": "新增 {added} 个、删除 {removed} 个、修改 {modified} 个、未变化 {unchanged} 个文件，耗时 {seconds} 秒",
+    "log_watch_start": "正在监视 {count} 个 URL，每 {interval} 秒检查一次新修订版本",
+    "log_watch_changed": "{url}: 修订版本 {old} -> {new}，开始导出",
+    "log_watch_check_failed": "{url}: 检查修订版本失败: {error}",
+    "log_watch_retry": "{url}: {seconds} 秒后重试",
+    "log_watch_state_failed": "无法保存监视状态: {error}",
+    "log_watch_stopped": "监视已停止",
+    "error_diff_unsorted": "文件列表在 {path} 处不符合 svn 排序，无法比较",
+    "log_creating_excel": "开始创建{format}文件...",
+    "log_saving_excel": "正在保存{format}文件到: {path}",
+    "log_excel_saved": "{format}文件保存成功",
+    "log_excel_stats": "已写入 {rows} 行到 {sheets} 个工作表，速度 {rate} 行/秒，峰值内存 {memory} MB",
+    "log_export_stats": "已写入 {rows} 行，速度 {rate} 行/秒，峰值内存 {memory} MB",
+    "log_metrics_stages": "耗时: 首字节 {first_byte} 秒, svn {svn} 秒, 解析 {parse} 秒, 过滤 {filter} 秒, 写入 {write} 秒, 保存 {save} 秒, 总计 {total} 秒",
+    "log_metrics_counts": "读取 {lines} 行（{lines_rate} 行/秒），解析 {entries} 个条目，过滤掉 {filtered} 个，写入 {rows} 行，峰值内存 {memory} MB",
+    "log_metrics_written": "运行指标已追加到: {path}",
+    "log_summary_written": "汇总已写入: {tables}",
+    "log_metrics_write_failed": "无法写入指标文件: {error}",
+    "log_export_success": "成功导出 {count} 个文件信息到{format}",
+    "export_cancelled": "导出已取消",
     "log_svn_failed": "SVN操作失败: {error}",
     "log_program_failed": "程序执行失败: {error}",
     # Error messages
     "error_no_output": "SVN命令执行成功但没有返回任何输出，请检查URL是否正确",
-    "error_encoding": "无法正确处理SVN输出的中文编码",
     "error_invalid_url": "SVN URL格式不正确，必须以 http://, https://, svn:// 或 file:/// 开头",
+    "error_dav_url": "内置 HTTP 客户端仅支持 http:// 和 https:// 地址",
     "error_no_output_check": "SVN命令没有返回任何输出，请检查URL是否正确",
     "error_no_files": "未找到任何匹配的文件",
+    "error_xml_parse": "无法解析SVN XML输出: {error}",
+    "error_subtree_failed": "列出 {path} 失败: {error}",
+    "error_command_timeout": "svn在 {seconds} 秒内没有任何输出，已被停止",
+    "error_missing_package": "{format}输出需要安装可选依赖包 {package}",
     "error_svn": "SVN错误: {error}",
     "error_general": "错误: {error}"
 } 
\ No newline at end of file
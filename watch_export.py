@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from batch_export import url_label
+from export_engine import ExportEngine
+
+
+def watch_state_path(output, directory_output):
+    """Return the file that remembers the exported revisions, kept next to the output"""
+    if directory_output:
+        return os.path.join(output, 'watch_state.json')
+    return os.path.splitext(output)[0] + '_watch.json'
+
+
+class WatchExport:
+    """Keep exports up to date by re-exporting a URL only when its last changed revision advances
+
+    Each URL of `outputs` ({url: output path}) is checked every `interval`
+    seconds with a single `svn info` call; a full listing only runs when
+    the revision is newer than the one last exported. The export is pinned
+    to that revision, so the output matches exactly the revision recorded
+    for it. Outputs are replaced atomically by the writers. Failed checks
+    and exports are retried after twice the previous delay, up to
+    `max_interval`. The exported revisions are kept in `state_path`, so a
+    restarted watch does not export again what is already current.
+    """
+
+    def __init__(self, outputs, username, password, state_path, filter_patterns=None, interval=300,
+                 max_interval=3600, output_format=None, engine_options=None, emit_logs=None, translations=None):
+        self.outputs = dict(outputs)
+        self.username = username
+        self.password = password
+        self.state_path = state_path
+        self.filter_patterns = filter_patterns or []
+        self.interval = max(1.0, interval)
+        self.max_interval = max(self.interval, max_interval)
+        self.output_format = output_format
+        self.engine_options = engine_options or {}
+        self.emit_logs = emit_logs or (lambda text: None)
+        self.translations = translations or {}
+        self.log_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.engine = None  # The engine of the check or export that is running
+        self.state = self.load_state()
+        self.delays = {url: self.interval for url in self.outputs}
+        self.next_check = {url: 0.0 for url in self.outputs}
+
+    def tr(self, key, **kwargs):
+        text = self.translations.get(key, key)
+        return text.format(**kwargs) if kwargs else text
+
+    def log(self, message):
+        self.emit_logs(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+
+    def engine_log(self, url):
+        prefix = f"[{url_label(url)}] " if len(self.outputs) > 1 else ''
+
+        def emit_logs(text):
+            with self.log_lock:
+                self.emit_logs('\n'.join(prefix + line for line in text.split('\n')))
+        return emit_logs
+
+    def load_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self):
+        temp_path = self.state_path + '.part'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    def exported_revision(self, url):
+        """Return the revision the current output holds, or None when it has to be exported"""
+        entry = self.state.get(url)
+        if not entry or entry.get('output') != self.outputs[url] or not os.path.exists(self.outputs[url]):
+            return None
+        return entry.get('revision')
+
+    def create_engine(self, url, revision=None, quiet=False):
+        options = dict(self.engine_options)
+        if quiet:
+            # Checks run every interval; only their failures are reported
+            options['log_level'] = logging.WARNING
+        engine = ExportEngine(url, self.username, self.password, self.outputs[url], self.filter_patterns,
+                              emit_logs=self.engine_log(url), output_format=self.output_format,
+                              revision=revision, **options)
+        engine.set_translations(self.translations)
+        self.engine = engine
+        if self.stopped.is_set():
+            engine.cancel()
+        return engine
+
+    def check(self, url):
+        """Check one URL and export it when it changed; return whether the check and export succeeded"""
+        try:
+            revision = self.create_engine(url, quiet=True).current_revision()
+        except Exception as e:
+            self.log(self.tr('log_watch_check_failed', url=url, error=str(e).strip()))
+            return False
+        exported = self.exported_revision(url)
+        if exported is not None and revision <= exported:
+            return True
+        self.log(self.tr('log_watch_changed', url=url, old=exported if exported is not None else '-', new=revision))
+        success, message = self.create_engine(url, revision).run()
+        if not success:
+            return False
+        self.state[url] = {
+            'revision': revision,
+            'output': self.outputs[url],
+            'exported': datetime.now().isoformat(timespec='seconds')
+        }
+        try:
+            self.save_state()
+        except OSError as e:
+            self.log(self.tr('log_watch_state_failed', error=str(e).strip()))
+        return True
+
+    def check_due(self):
+        """Check every URL whose next check is due and schedule the following one"""
+        for url in self.outputs:
+            if self.stopped.is_set():
+                return
+            if time.monotonic() < self.next_check[url]:
+                continue
+            succeeded = self.check(url)
+            if self.stopped.is_set():
+                # A check cut short by stop() is not a failure to retry
+                return
+            if succeeded:
+                self.delays[url] = self.interval
+            else:
+                self.delays[url] = min(self.delays[url] * 2, self.max_interval)
+                self.log(self.tr('log_watch_retry', url=url, seconds=f"{self.delays[url]:.0f}"))
+            self.next_check[url] = time.monotonic() + self.delays[url]
+
+    def run(self):
+        """Check and export until stop() is called; returns (True, message)"""
+        self.log(self.tr('log_watch_start', count=len(self.outputs), interval=f"{self.interval:.0f}"))
+        while not self.stopped.is_set():
+            self.check_due()
+            # Sleep until the next check is due; nothing runs in between
+            self.stopped.wait(max(0.0, min(self.next_check.values()) - time.monotonic()))
+        message = self.tr('log_watch_stopped')
+        self.log(message)
+        return True, message
+
+    def stop(self):
+        """Stop watching, cancelling a check or export that is running; safe to call from any thread"""
+        self.stopped.set()
+        engine = self.engine
+        if engine is not None:
+            engine.cancel()